@@ -0,0 +1,174 @@
+/*
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+/*
+ * ClassifierHelper.java
+ * Copyright (C) 2016 Fracpete (fracpete at gmail dot com)
+ */
+
+package weka.classifiers;
+
+import weka.core.BatchPredictor;
+import weka.core.Instance;
+import weka.core.Instances;
+import weka.core.Utils;
+
+/**
+ * Helper class for classifiers, performing loops over the data inside the
+ * JVM rather than one call per row.
+ *
+ * @author FracPete (fracpete at gmail dot com)
+ */
+public class ClassifierHelper {
+
+  /**
+   * Returns whether the classifier implements its own classifyInstance method,
+   * i.e., whether the classification cannot be derived from the class
+   * distribution like AbstractClassifier.classifyInstance does.
+   *
+   * @param cls the classifier to check
+   * @return true if classifyInstance is not the one of AbstractClassifier
+   */
+  public static boolean overridesClassifyInstance(Classifier cls) {
+    try {
+      return (cls.getClass().getMethod("classifyInstance", Instance.class).getDeclaringClass() != AbstractClassifier.class);
+    }
+    catch (NoSuchMethodException e) {
+      return true;
+    }
+  }
+
+  /**
+   * Derives the classification from the class distribution like
+   * AbstractClassifier.classifyInstance: the index of the label with the
+   * highest probability (or missing if all are 0) for nominal classes and
+   * the predicted value for numeric ones.
+   *
+   * @param dist the class distribution
+   * @param nominal whether the class attribute is nominal
+   * @return the classification
+   */
+  public static double classify(double[] dist, boolean nominal) {
+    if (!nominal)
+      return dist[0];
+    else if (Utils.sum(dist) == 0)
+      return Utils.missingValue();
+    else
+      return Utils.maxIndex(dist);
+  }
+
+  /**
+   * Returns the class distributions for all rows. Uses distributionsForInstances
+   * if the classifier is a batch predictor, otherwise distributionForInstance
+   * for each row.
+   *
+   * @param cls the trained classifier to use
+   * @param data the data to make predictions for
+   * @return the class distributions
+   * @throws Exception if predictions fail
+   */
+  public static double[][] distributions(Classifier cls, Instances data) throws Exception {
+    double[][]	result;
+    int		i;
+
+    if (cls instanceof BatchPredictor) {
+      result = ((BatchPredictor) cls).distributionsForInstances(data);
+    }
+    else {
+      result = new double[data.numInstances()][];
+      for (i = 0; i < data.numInstances(); i++)
+	result[i] = cls.distributionForInstance(data.instance(i));
+    }
+
+    return result;
+  }
+
+  /**
+   * Returns the class distributions for all rows, stored row after row.
+   * For numeric classes, the distribution consists of the predicted value.
+   *
+   * @param cls the trained classifier to use
+   * @param data the data to make predictions for
+   * @return the class distributions (numInstances * numClasses)
+   * @throws Exception if predictions fail
+   * @see #distributions(Classifier, Instances)
+   */
+  public static double[] distributionsForInstances(Classifier cls, Instances data) throws Exception {
+    double[]	result;
+    double[][]	dists;
+    int		numClasses;
+    int		i;
+
+    dists      = distributions(cls, data);
+    numClasses = data.numClasses();
+    result     = new double[data.numInstances() * numClasses];
+    for (i = 0; i < dists.length; i++)
+      System.arraycopy(dists[i], 0, result, i * numClasses, numClasses);
+
+    return result;
+  }
+
+  /**
+   * Returns the classifications for all rows. Batch predictors that don't
+   * override classifyInstance use the distributions for determining the
+   * classification (see classify(double[],boolean)), all other classifiers
+   * get classifyInstance called for each row.
+   *
+   * @param cls the trained classifier to use
+   * @param data the data to make predictions for
+   * @return the classifications
+   * @throws Exception if predictions fail
+   */
+  public static double[] classifyInstances(Classifier cls, Instances data) throws Exception {
+    double[]	result;
+    double[][]	dists;
+    boolean	nominal;
+    int		i;
+
+    result = new double[data.numInstances()];
+
+    if ((cls instanceof BatchPredictor) && !overridesClassifyInstance(cls)) {
+      dists   = distributions(cls, data);
+      nominal = data.classAttribute().isNominal();
+      for (i = 0; i < dists.length; i++)
+	result[i] = classify(dists[i], nominal);
+    }
+    else {
+      for (i = 0; i < data.numInstances(); i++)
+	result[i] = cls.classifyInstance(data.instance(i));
+    }
+
+    return result;
+  }
+
+  /**
+   * Updates the classifier with all the rows of the dataset.
+   *
+   * @param cls the classifier to update, must implement UpdateableClassifier
+   * @param data the data to update the classifier with
+   * @throws Exception if the classifier is not updateable or the update fails
+   */
+  public static void updateClassifier(Classifier cls, Instances data) throws Exception {
+    UpdateableClassifier	updateable;
+    int				i;
+
+    if (!(cls instanceof UpdateableClassifier))
+      throw new IllegalArgumentException(cls.getClass().getName() + " is not updateable!");
+
+    updateable = (UpdateableClassifier) cls;
+    for (i = 0; i < data.numInstances(); i++)
+      updateable.updateClassifier(data.instance(i));
+  }
+}
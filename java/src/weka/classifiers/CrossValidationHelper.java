@@ -0,0 +1,143 @@
+/*
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+/*
+ * CrossValidationHelper.java
+ * Copyright (C) 2016 Fracpete (fracpete at gmail dot com)
+ */
+
+package weka.classifiers;
+
+import weka.core.Instances;
+import weka.core.SerializedObject;
+
+import java.lang.reflect.Field;
+import java.util.ArrayList;
+import java.util.List;
+import java.util.Random;
+import java.util.concurrent.Callable;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
+
+/**
+ * Helper class for performing cross-validation with the folds being
+ * evaluated in parallel, using multiple threads.
+ *
+ * @author FracPete (fracpete at gmail dot com)
+ */
+public class CrossValidationHelper {
+
+  /**
+   * Creates a deep copy of the evaluation, so that setting the priors does
+   * not affect the evaluation it was created from (the copy constructor of
+   * AggregateableEvaluation shares the priors).
+   *
+   * @param eval the evaluation to copy
+   * @return the copy
+   * @throws Exception if copying fails
+   */
+  protected static weka.classifiers.evaluation.AggregateableEvaluation copy(weka.classifiers.evaluation.AggregateableEvaluation eval) throws Exception {
+    return (weka.classifiers.evaluation.AggregateableEvaluation) new SerializedObject(eval).getObject();
+  }
+
+  /**
+   * Cross-validates the classifier using the specified number of threads.
+   * The folds get generated the same way as Evaluation.crossValidateModel
+   * does, each fold gets evaluated with its own copy of the classifier and
+   * the evaluations of the folds get aggregated into the provided evaluation
+   * (in addition to any statistics it already holds). Like
+   * Evaluation.crossValidateModel, the evaluation keeps the priors of the
+   * last training fold and the number of folds.
+   *
+   * @param eval the evaluation to add the statistics to
+   * @param classifier the classifier to cross-validate
+   * @param data the data to use
+   * @param numFolds the number of folds
+   * @param random the random number generator to use
+   * @param numThreads the number of threads to use, less than 1 for number of CPUs
+   * @throws Exception if cross-validation fails
+   */
+  public static void crossValidateModel(Evaluation eval, Classifier classifier, Instances data, int numFolds, Random random, int numThreads) throws Exception {
+    weka.classifiers.evaluation.Evaluation		template;
+    weka.classifiers.evaluation.AggregateableEvaluation	blank;
+    weka.classifiers.evaluation.AggregateableEvaluation	result;
+    Classifier[]					copies;
+    ExecutorService					executor;
+    List<Future<weka.classifiers.evaluation.Evaluation>>	futures;
+    Instances						lastTrain;
+    Field						numFoldsField;
+    int							i;
+
+    if (numThreads < 1)
+      numThreads = Runtime.getRuntime().availableProcessors();
+    numThreads = Math.min(numThreads, numFolds);
+
+    data = new Instances(data);
+    data.randomize(random);
+    if (data.classAttribute().isNominal())
+      data.stratify(numFolds);
+
+    template = eval.m_delegate;
+    blank    = new weka.classifiers.evaluation.AggregateableEvaluation(template);
+    blank.setDiscardPredictions(template.getDiscardPredictions());
+    copies   = AbstractClassifier.makeCopies(classifier, numFolds);
+    futures  = new ArrayList<Future<weka.classifiers.evaluation.Evaluation>>();
+    executor = Executors.newFixedThreadPool(numThreads);
+    lastTrain = null;
+    try {
+      for (i = 0; i < numFolds; i++) {
+	final Instances train = data.trainCV(numFolds, i, random);
+	lastTrain = train;
+	final Instances test = data.testCV(numFolds, i);
+	final Classifier cls = copies[i];
+	final weka.classifiers.evaluation.Evaluation fold = copy(blank);
+	futures.add(executor.submit(new Callable<weka.classifiers.evaluation.Evaluation>() {
+	  public weka.classifiers.evaluation.Evaluation call() throws Exception {
+	    fold.setPriors(train);
+	    cls.buildClassifier(train);
+	    fold.evaluateModel(cls, test);
+	    return fold;
+	  }
+	}));
+      }
+
+      result = copy(blank);
+      result.aggregate(template);
+      for (Future<weka.classifiers.evaluation.Evaluation> future: futures) {
+	try {
+	  result.aggregate(future.get());
+	}
+	catch (ExecutionException e) {
+	  if (e.getCause() instanceof Exception)
+	    throw (Exception) e.getCause();
+	  throw e;
+	}
+      }
+    }
+    finally {
+      executor.shutdownNow();
+    }
+
+    // like the sequential cross-validation
+    result.setPriors(lastTrain);
+    numFoldsField = weka.classifiers.evaluation.Evaluation.class.getDeclaredField("m_NumFolds");
+    numFoldsField.setAccessible(true);
+    numFoldsField.setInt(result, numFolds);
+
+    eval.m_delegate = result;
+  }
+}
@@ -0,0 +1,136 @@
+/*
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+/*
+ * EvaluationHelper.java
+ * Copyright (C) 2016 Fracpete (fracpete at gmail dot com)
+ */
+
+package weka.classifiers;
+
+import weka.classifiers.evaluation.NominalPrediction;
+import weka.classifiers.evaluation.Prediction;
+import weka.core.Utils;
+
+import java.lang.reflect.Method;
+import java.util.ArrayList;
+
+/**
+ * Helper class for evaluations, transferring data with a single call
+ * rather than one call per prediction or metric.
+ *
+ * @author FracPete (fracpete at gmail dot com)
+ */
+public class EvaluationHelper {
+
+  /**
+   * Returns the predictions as a single array, stored prediction after
+   * prediction: actual, predicted, weight and, for nominal classes, the
+   * class distribution. Missing values are represented by NaN.
+   *
+   * @param eval the evaluation to get the predictions from
+   * @return the values (numPredictions * (3 + numClasses)), null if predictions were discarded
+   */
+  public static double[] predictionsToArray(Evaluation eval) {
+    double[]			result;
+    ArrayList<Prediction>	preds;
+    Prediction			pred;
+    double[]			dist;
+    int				numClasses;
+    int				numCols;
+    int				i;
+
+    preds = eval.predictions();
+    if (preds == null)
+      return null;
+
+    if (eval.getHeader().classAttribute().isNominal())
+      numClasses = eval.getHeader().classAttribute().numValues();
+    else
+      numClasses = 0;
+    numCols = 3 + numClasses;
+    result  = new double[preds.size() * numCols];
+    for (i = 0; i < preds.size(); i++) {
+      pred = preds.get(i);
+      result[i * numCols]     = pred.actual();
+      result[i * numCols + 1] = pred.predicted();
+      result[i * numCols + 2] = pred.weight();
+      if ((numClasses > 0) && (pred instanceof NominalPrediction)) {
+	dist = ((NominalPrediction) pred).distribution();
+	System.arraycopy(dist, 0, result, i * numCols + 3, Math.min(numClasses, dist.length));
+      }
+    }
+
+    return result;
+  }
+
+  /**
+   * Calls the specified metric method via reflection, returning NaN if the
+   * method fails (eg a metric that is not available for the class type).
+   *
+   * @param eval the evaluation to call the method on
+   * @param method the method to call
+   * @param args the arguments for the method
+   * @return the value of the metric
+   */
+  protected static double invoke(Evaluation eval, Method method, Object... args) {
+    try {
+      return ((Number) method.invoke(eval, args)).doubleValue();
+    }
+    catch (Exception e) {
+      return Utils.missingValue();
+    }
+  }
+
+  /**
+   * Returns the values of the specified metrics as a single array: first the
+   * scalar metrics, followed by the values of each per-class metric for all
+   * the class labels (numClasses values per metric, none for numeric classes).
+   * Metrics that fail to compute are represented by NaN.
+   *
+   * @param eval the evaluation to get the metrics from
+   * @param scalar the names of the methods for the scalar metrics, eg "pctCorrect"
+   * @param perClass the names of the methods for the per-class metrics, eg "precision"
+   * @return the values
+   * @throws Exception if a method is not available
+   */
+  public static double[] metrics(Evaluation eval, String[] scalar, String[] perClass) throws Exception {
+    double[]	result;
+    Method	method;
+    int		numClasses;
+    int		offset;
+    int		i;
+    int		n;
+
+    if (eval.getHeader().classAttribute().isNominal())
+      numClasses = eval.getHeader().classAttribute().numValues();
+    else
+      numClasses = 0;
+
+    result = new double[scalar.length + perClass.length * numClasses];
+    for (i = 0; i < scalar.length; i++) {
+      method    = Evaluation.class.getMethod(scalar[i]);
+      result[i] = invoke(eval, method);
+    }
+    offset = scalar.length;
+    for (i = 0; i < perClass.length; i++) {
+      method = Evaluation.class.getMethod(perClass[i], Integer.TYPE);
+      for (n = 0; n < numClasses; n++)
+	result[offset + i * numClasses + n] = invoke(eval, method, n);
+    }
+
+    return result;
+  }
+}
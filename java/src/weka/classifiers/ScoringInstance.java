@@ -0,0 +1,113 @@
+/*
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+/*
+ * ScoringInstance.java
+ * Copyright (C) 2016 Fracpete (fracpete at gmail dot com)
+ */
+
+package weka.classifiers;
+
+import weka.core.DenseInstance;
+import weka.core.Instances;
+import weka.core.Utils;
+
+/**
+ * Pre-allocated instance for scoring single rows with low latency: the
+ * values get overwritten in place (rather than creating a new instance per
+ * row) and the classification is derived from the class distribution, i.e.,
+ * only a single model evaluation takes place (unless the classifier
+ * implements its own classifyInstance method).
+ *
+ * @author FracPete (fracpete at gmail dot com)
+ */
+public class ScoringInstance
+  extends DenseInstance {
+
+  /** for serialization. */
+  private static final long serialVersionUID = -3467383936151472215L;
+
+  /** the buffer for the class distribution. */
+  protected double[] m_Distribution;
+
+  /** the classifier that was used last. */
+  protected Classifier m_Classifier;
+
+  /** whether the last classifier implements its own classifyInstance. */
+  protected boolean m_OverridesClassifyInstance;
+
+  /**
+   * Initializes the instance with all values missing.
+   *
+   * @param header the dataset structure to use, must have a class attribute
+   */
+  public ScoringInstance(Instances header) {
+    super(1.0, new double[header.numAttributes()]);
+    setDataset(new Instances(header, 0));
+    for (int i = 0; i < m_AttValues.length; i++)
+      m_AttValues[i] = Utils.missingValue();
+    m_Distribution = new double[classAttribute().isNominal() ? classAttribute().numValues() : 1];
+  }
+
+  /**
+   * Returns the buffer that score(Classifier,double[]) stores the class
+   * distribution in. The same array gets returned and overwritten each time.
+   *
+   * @return the buffer
+   */
+  public double[] getDistribution() {
+    return m_Distribution;
+  }
+
+  /**
+   * Overwrites the values in place.
+   *
+   * @param values the new values (internal format), one per attribute
+   */
+  public void setValues(double[] values) {
+    if (values.length != m_AttValues.length)
+      throw new IllegalArgumentException(
+	"Expected " + m_AttValues.length + " values, but received " + values.length + "!");
+    System.arraycopy(values, 0, m_AttValues, 0, m_AttValues.length);
+  }
+
+  /**
+   * Overwrites the values and scores the row, storing the class distribution
+   * in the buffer (see getDistribution()). The classification gets derived
+   * from the distribution like AbstractClassifier.classifyInstance does,
+   * classifiers that implement their own classifyInstance method get it
+   * called in addition.
+   *
+   * @param cls the trained classifier to use
+   * @param values the new values (internal format), one per attribute
+   * @return the classification
+   * @throws Exception if the prediction fails
+   */
+  public double score(Classifier cls, double[] values) throws Exception {
+    double[]	dist;
+
+    if (cls != m_Classifier) {
+      m_Classifier                = cls;
+      m_OverridesClassifyInstance = ClassifierHelper.overridesClassifyInstance(cls);
+    }
+    setValues(values);
+    dist = cls.distributionForInstance(this);
+    System.arraycopy(dist, 0, m_Distribution, 0, m_Distribution.length);
+    if (m_OverridesClassifyInstance)
+      return cls.classifyInstance(this);
+    else
+      return ClassifierHelper.classify(dist, classAttribute().isNominal());
+  }
+}
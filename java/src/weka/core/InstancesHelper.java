@@ -0,0 +1,260 @@
+/*
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+/*
+ * InstancesHelper.java
+ * Copyright (C) 2016 Fracpete (fracpete at gmail dot com)
+ */
+
+package weka.core;
+
+import java.util.Random;
+
+/**
+ * Helper class for transferring data from/to Instances objects in bulk,
+ * i.e., with a single call rather than one call per row or cell.
+ *
+ * @author FracPete (fracpete at gmail dot com)
+ */
+public class InstancesHelper {
+
+  /**
+   * Returns the internal values of the specified columns as a single array,
+   * stored row after row.
+   *
+   * @param data the dataset to get the values from
+   * @param cols the 0-based indices of the columns, null for all
+   * @return the values (numInstances * cols.length)
+   */
+  public static double[] toDoubleArray(Instances data, int[] cols) {
+    double[]	result;
+    Instance	inst;
+    int		numCols;
+    int		i;
+    int		n;
+
+    if (cols == null) {
+      cols = new int[data.numAttributes()];
+      for (i = 0; i < cols.length; i++)
+	cols[i] = i;
+    }
+
+    numCols = cols.length;
+    result  = new double[data.numInstances() * numCols];
+    for (i = 0; i < data.numInstances(); i++) {
+      inst = data.instance(i);
+      for (n = 0; n < numCols; n++)
+	result[i * numCols + n] = inst.value(cols[n]);
+    }
+
+    return result;
+  }
+
+  /**
+   * Returns the weights of all the rows.
+   *
+   * @param data the dataset to get the weights from
+   * @return the weights
+   */
+  public static double[] weightsToDoubleArray(Instances data) {
+    double[]	result;
+    int		i;
+
+    result = new double[data.numInstances()];
+    for (i = 0; i < data.numInstances(); i++)
+      result[i] = data.instance(i).weight();
+
+    return result;
+  }
+
+  /**
+   * Adds the internal values, stored row after row, as DenseInstance objects
+   * to the dataset. Missing values are represented by NaN. The instances get
+   * added directly, i.e., without creating an additional copy.
+   *
+   * @param data the dataset to add the rows to
+   * @param values the internal values (numRows * data.numAttributes())
+   * @param weights the weights of the rows, null to use 1.0
+   */
+  public static void addDoubleArray(Instances data, double[] values, double[] weights) {
+    Instance	inst;
+    double[]	row;
+    int		numCols;
+    int		numRows;
+    int		i;
+
+    numCols = data.numAttributes();
+    numRows = (numCols == 0) ? 0 : values.length / numCols;
+    data.m_Instances.ensureCapacity(data.numInstances() + numRows);
+    for (i = 0; i < numRows; i++) {
+      row = new double[numCols];
+      System.arraycopy(values, i * numCols, row, 0, numCols);
+      inst = new DenseInstance((weights == null) ? 1.0 : weights[i], row);
+      inst.setDataset(data);
+      data.m_Instances.add(inst);
+    }
+  }
+
+  /**
+   * Adds the rows stored in compressed sparse row (CSR) format as
+   * SparseInstance objects to the dataset. The indices within a row must be
+   * sorted in ascending order. The instances get added directly, i.e.,
+   * without creating an additional copy.
+   *
+   * @param data the dataset to add the rows to
+   * @param values the non-zero values of all rows
+   * @param indices the 0-based attribute indices of the values
+   * @param indptr the offsets of the rows in values/indices (numRows + 1)
+   * @param weights the weights of the rows, null to use 1.0
+   */
+  public static void addSparseArrays(Instances data, double[] values, int[] indices, int[] indptr, double[] weights) {
+    Instance	inst;
+    double[]	rowValues;
+    int[]	rowIndices;
+    int		numRows;
+    int		num;
+    int		i;
+
+    numRows = indptr.length - 1;
+    data.m_Instances.ensureCapacity(data.numInstances() + numRows);
+    for (i = 0; i < numRows; i++) {
+      num        = indptr[i + 1] - indptr[i];
+      rowValues  = new double[num];
+      rowIndices = new int[num];
+      System.arraycopy(values, indptr[i], rowValues, 0, num);
+      System.arraycopy(indices, indptr[i], rowIndices, 0, num);
+      inst = new SparseInstance((weights == null) ? 1.0 : weights[i], rowValues, rowIndices, data.numAttributes());
+      inst.setDataset(data);
+      data.m_Instances.add(inst);
+    }
+  }
+
+  /**
+   * Returns the non-zero values of the dataset in compressed sparse row (CSR)
+   * format: an array with the values (double[]), one with the 0-based
+   * attribute indices (int[]) and one with the offsets of the rows (int[],
+   * numInstances + 1). Missing values are stored as NaN.
+   *
+   * @param data the dataset to get the values from
+   * @return the values, indices and row offsets
+   */
+  public static Object[] toSparseArrays(Instances data) {
+    Instance	inst;
+    double[]	values;
+    int[]	indices;
+    int[]	indptr;
+    double	value;
+    int		nnz;
+    int		i;
+    int		n;
+
+    // count non-zero values
+    nnz = 0;
+    for (i = 0; i < data.numInstances(); i++) {
+      inst = data.instance(i);
+      for (n = 0; n < inst.numValues(); n++) {
+	if (inst.valueSparse(n) != 0)
+	  nnz++;
+      }
+    }
+
+    values  = new double[nnz];
+    indices = new int[nnz];
+    indptr  = new int[data.numInstances() + 1];
+    nnz     = 0;
+    for (i = 0; i < data.numInstances(); i++) {
+      inst = data.instance(i);
+      for (n = 0; n < inst.numValues(); n++) {
+	value = inst.valueSparse(n);
+	if (value != 0) {
+	  values[nnz]  = value;
+	  indices[nnz] = inst.index(n);
+	  nnz++;
+	}
+      }
+      indptr[i + 1] = nnz;
+    }
+
+    return new Object[]{values, indices, indptr};
+  }
+
+  /**
+   * Appends the rows of the other dataset to the dataset, after checking
+   * that the headers are compatible. The capacity of the dataset gets
+   * increased beforehand to accommodate all the rows.
+   *
+   * @param data the dataset to append the rows to
+   * @param other the dataset with the rows to append
+   * @throws IllegalArgumentException if the headers are not compatible
+   */
+  public static void append(Instances data, Instances other) {
+    String	msg;
+    int		i;
+
+    msg = data.equalHeadersMsg(other);
+    if (msg != null)
+      throw new IllegalArgumentException("Cannot append instances: " + msg);
+
+    data.m_Instances.ensureCapacity(data.numInstances() + other.numInstances());
+    for (i = 0; i < other.numInstances(); i++)
+      data.add(other.instance(i));
+  }
+
+  /**
+   * Returns a new dataset containing copies of the specified rows, in the
+   * order of the indices.
+   *
+   * @param data the dataset to get the rows from
+   * @param indices the 0-based indices of the rows
+   * @return the subset
+   */
+  public static Instances subset(Instances data, int[] indices) {
+    Instances	result;
+    int		i;
+
+    result = new Instances(data, indices.length);
+    for (i = 0; i < indices.length; i++)
+      result.add(data.instance(indices[i]));
+
+    return result;
+  }
+
+  /**
+   * Returns the order of the rows that Instances.randomize(Random) generates
+   * with the random number generator, without modifying a dataset.
+   *
+   * @param numRows the number of rows
+   * @param random the random number generator to use
+   * @return the 0-based row indices
+   */
+  public static int[] randomOrder(int numRows, Random random) {
+    int[]	result;
+    int		i;
+    int		n;
+    int		tmp;
+
+    result = new int[numRows];
+    for (i = 0; i < numRows; i++)
+      result[i] = i;
+    for (i = numRows - 1; i > 0; i--) {
+      n         = random.nextInt(i + 1);
+      tmp       = result[i];
+      result[i] = result[n];
+      result[n] = tmp;
+    }
+
+    return result;
+  }
+}
@@ -0,0 +1,119 @@
+/*
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+/*
+ * LoaderHelper.java
+ * Copyright (C) 2016 Fracpete (fracpete at gmail dot com)
+ */
+
+package weka.core.converters;
+
+import weka.core.Attribute;
+import weka.core.Instance;
+import weka.core.Instances;
+
+import java.util.Arrays;
+
+/**
+ * Helper class for reading data incrementally in batches, i.e., with a
+ * single call per batch rather than one call per row.
+ *
+ * @author FracPete (fracpete at gmail dot com)
+ */
+public class LoaderHelper {
+
+  /**
+   * Reads the next batch of rows from the loader. The values of string and
+   * relational attributes get stored in the batch's own header, as the
+   * loader's structure only holds the value(s) of the current row.
+   *
+   * @param loader the loader to read from, must be in incremental mode
+   * @param structure the structure of the data, as returned by the loader
+   * @param size the maximum number of rows to read
+   * @return the rows, null if no more rows available
+   * @throws Exception if reading fails
+   */
+  public static Instances nextBatch(Loader loader, Instances structure, int size) throws Exception {
+    Instances	result;
+    Instance	inst;
+    Attribute	att;
+    boolean	copy;
+    int		i;
+
+    result = structure.stringFreeStructure();
+    copy   = result.checkForStringAttributes() || result.checkForAttributeType(Attribute.RELATIONAL);
+    while (result.numInstances() < size) {
+      inst = loader.getNextInstance(structure);
+      if (inst == null)
+	break;
+      if (copy) {
+	inst = (Instance) inst.copy();
+	for (i = 0; i < result.numAttributes(); i++) {
+	  att = result.attribute(i);
+	  if (inst.isMissing(i))
+	    continue;
+	  if (att.isString())
+	    inst.setValue(i, att.addStringValue(inst.stringValue(i)));
+	  else if (att.isRelationValued())
+	    inst.setValue(i, att.addRelation(inst.relationalValue(i)));
+	}
+      }
+      result.add(inst);
+    }
+
+    if (result.numInstances() == 0)
+      return null;
+
+    return result;
+  }
+
+  /**
+   * Reads the next batch of rows from the loader and returns the internal
+   * values as a single array, stored row after row. Missing values are
+   * represented by NaN. The values of string and relational attributes are
+   * indices into the loader's structure, i.e., only of use for the
+   * current row.
+   *
+   * @param loader the loader to read from, must be in incremental mode
+   * @param structure the structure of the data, as returned by the loader
+   * @param size the maximum number of rows to read
+   * @return the values (numRows * structure.numAttributes()), empty if no more rows available
+   * @throws Exception if reading fails
+   */
+  public static double[] nextBatchArray(Loader loader, Instances structure, int size) throws Exception {
+    double[]	result;
+    Instance	inst;
+    int		numCols;
+    int		numRows;
+    int		n;
+
+    numCols = structure.numAttributes();
+    result  = new double[size * numCols];
+    numRows = 0;
+    while (numRows < size) {
+      inst = loader.getNextInstance(structure);
+      if (inst == null)
+	break;
+      for (n = 0; n < numCols; n++)
+	result[numRows * numCols + n] = inst.value(n);
+      numRows++;
+    }
+
+    if (numRows < size)
+      result = Arrays.copyOf(result, numRows * numCols);
+
+    return result;
+  }
+}
@@ -0,0 +1,59 @@
+/*
+ * This program is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * This program is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU General Public License for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program.  If not, see <http://www.gnu.org/licenses/>.
+ */
+
+/*
+ * DataGeneratorHelper.java
+ * Copyright (C) 2016 Fracpete (fracpete at gmail dot com)
+ */
+
+package weka.datagenerators;
+
+import weka.core.Instance;
+import weka.core.Instances;
+
+/**
+ * Helper class for data generators, generating batches of examples with a
+ * single call rather than one call per example.
+ *
+ * @author FracPete (fracpete at gmail dot com)
+ */
+public class DataGeneratorHelper {
+
+  /**
+   * Generates the specified number of examples, one at a time. The data
+   * format must have been defined already and the generator must be in
+   * single mode.
+   *
+   * @param generator the generator to use
+   * @param size the number of examples to generate
+   * @return the generated examples
+   * @throws Exception if generation fails
+   */
+  public static Instances generateBatch(DataGenerator generator, int size) throws Exception {
+    Instances	result;
+    Instance	inst;
+    int		i;
+
+    result = new Instances(generator.getDatasetFormat(), size);
+    for (i = 0; i < size; i++) {
+      inst = generator.generateExample();
+      if (inst == null)
+	break;
+      result.add(inst);
+    }
+
+    return result;
+  }
+}
@@ -0,0 +1,378 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# aio.py
+# Copyright (C) 2016 Fracpete (pythonwekawrapper at gmail dot com)
+
+"""
+Non-blocking execution of JVM calls: the calls get dispatched to threads that are attached to the JVM
+and Future objects get returned. The futures offer the same methods as concurrent.futures.Future
+(result, exception, done, add_done_callback), so event loops can be notified via callbacks
+instead of blocking on the JVM work.
+"""
+
+import sys
+import logging
+import threading
+import multiprocessing
+import Queue
+import javabridge
+import weka.core.jvm as jvm
+
+# logging setup
+logger = logging.getLogger(__name__)
+
+
+class Future(object):
+    """
+    The result of a call submitted to a JVMExecutor.
+    """
+
+    def __init__(self):
+        """
+        Initializes the future.
+        """
+        self._condition = threading.Condition()
+        self._done = False
+        self._result = None
+        self._exc_info = None
+        self._callbacks = []
+
+    def _finish(self, result=None, exc_info=None):
+        """
+        Stores the result or the exception, signals the waiting threads and runs the callbacks.
+
+        :param result: the result of the call
+        :param exc_info: the exception info (see sys.exc_info), None if successful
+        :type exc_info: tuple
+        """
+        with self._condition:
+            self._result = result
+            self._exc_info = exc_info
+            self._done = True
+            callbacks = self._callbacks
+            self._callbacks = []
+            self._condition.notify_all()
+        for callback in callbacks:
+            self._run_callback(callback)
+
+    def _run_callback(self, callback):
+        """
+        Runs the callback with this future, logging any errors.
+
+        :param callback: the function to call
+        :type callback: function
+        """
+        try:
+            callback(self)
+        except Exception:
+            logger.exception("Callback failed")
+
+    def _wait(self, timeout):
+        """
+        Waits for the call to finish.
+
+        :param timeout: the maximum number of seconds to wait, None for no limit
+        :type timeout: float
+        """
+        with self._condition:
+            if not self._done:
+                self._condition.wait(timeout)
+            if not self._done:
+                raise Exception("Timed out after " + str(timeout) + " seconds!")
+
+    def done(self):
+        """
+        Returns whether the call has finished.
+
+        :return: True if finished
+        :rtype: bool
+        """
+        return self._done
+
+    def result(self, timeout=None):
+        """
+        Waits for the call to finish and returns the result, re-raising the exception of the call if it failed.
+
+        :param timeout: the maximum number of seconds to wait, None for no limit
+        :type timeout: float
+        :return: the result
+        """
+        self._wait(timeout)
+        if self._exc_info is not None:
+            raise self._exc_info[0], self._exc_info[1], self._exc_info[2]
+        return self._result
+
+    def exception(self, timeout=None):
+        """
+        Waits for the call to finish and returns the exception it raised.
+
+        :param timeout: the maximum number of seconds to wait, None for no limit
+        :type timeout: float
+        :return: the exception, None if successful
+        :rtype: Exception
+        """
+        self._wait(timeout)
+        if self._exc_info is None:
+            return None
+        return self._exc_info[1]
+
+    def add_done_callback(self, callback):
+        """
+        Adds the function to call (with the future as argument) once the call has finished. The
+        function gets called in the executor's thread (or immediately if already finished).
+
+        :param callback: the function to call
+        :type callback: function
+        """
+        with self._condition:
+            if not self._done:
+                self._callbacks.append(callback)
+                return
+        self._run_callback(callback)
+
+
+class JVMExecutor(object):
+    """
+    Executes calls in threads that are attached to the JVM (once per thread, detached when shut down).
+    The JVM must have been started.
+    """
+
+    def __init__(self, num_threads=None):
+        """
+        Initializes the executor.
+
+        :param num_threads: the number of threads to use, None for number of CPUs
+        :type num_threads: int
+        """
+        if num_threads is None:
+            num_threads = multiprocessing.cpu_count()
+        self._queue = Queue.Queue()
+        self._lock = threading.Lock()
+        self._threads = []
+        for i in xrange(max(1, num_threads)):
+            thread = threading.Thread(target=self._work)
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self):
+        """
+        Processes the submitted calls until shut down.
+        """
+        javabridge.attach()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                future, func, args, kwargs = item
+                try:
+                    result = func(*args, **kwargs)
+                except Exception:
+                    future._finish(exc_info=sys.exc_info())
+                else:
+                    future._finish(result=result)
+        finally:
+            javabridge.detach()
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Submits the call.
+
+        :param func: the function to call
+        :type func: function
+        :param args: the arguments for the function
+        :param kwargs: the keyword arguments for the function
+        :return: the future for the result
+        :rtype: Future
+        """
+        future = Future()
+        with self._lock:
+            if self._threads is None:
+                raise Exception("Executor has been shut down!")
+            self._queue.put((future, func, args, kwargs))
+        return future
+
+    def shutdown(self, wait=True):
+        """
+        Stops the threads once the submitted calls have been processed.
+
+        :param wait: whether to wait for the threads to finish
+        :type wait: bool
+        """
+        with self._lock:
+            threads = self._threads
+            if threads is None:
+                return
+            self._threads = None
+            for thread in threads:
+                self._queue.put(None)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Returns the shared executor, creating it if necessary. The executor gets shut down automatically
+    when the JVM is stopped.
+
+    :return: the executor
+    :rtype: JVMExecutor
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = JVMExecutor()
+            jvm.add_shutdown_hook(shutdown)
+        return _executor
+
+
+def shutdown():
+    """
+    Shuts down the shared executor, if any.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
+        jvm.remove_shutdown_hook(shutdown)
+
+
+def _build(classifier, data):
+    """
+    Builds the classifier and returns it.
+
+    :param classifier: the classifier to build
+    :type classifier: Classifier
+    :param data: the training data
+    :type data: Instances
+    :return: the classifier
+    :rtype: Classifier
+    """
+    classifier.build_classifier(data)
+    return classifier
+
+
+def _crossvalidate(evaluation, classifier, data, num_folds, rnd, output, num_threads):
+    """
+    Cross-validates the classifier and returns the evaluation.
+
+    :param evaluation: the evaluation to use
+    :type evaluation: Evaluation
+    :param classifier: the classifier to cross-validate
+    :type classifier: Classifier
+    :param data: the data to evaluate on
+    :type data: Instances
+    :param num_folds: the number of folds
+    :type num_folds: int
+    :param rnd: the random number generator to use
+    :type rnd: Random
+    :param output: the output generator to use
+    :type output: PredictionOutput
+    :param num_threads: the number of threads to use within the JVM, None for sequential
+    :type num_threads: int
+    :return: the evaluation
+    :rtype: Evaluation
+    """
+    evaluation.crossvalidate_model(classifier, data, num_folds, rnd, output=output, num_threads=num_threads)
+    return evaluation
+
+
+def abuild(classifier, data, executor=None):
+    """
+    Builds the classifier in the background. The future's result is the classifier.
+
+    :param classifier: the classifier to build
+    :type classifier: Classifier
+    :param data: the training data
+    :type data: Instances
+    :param executor: the executor to use, None for the shared one
+    :type executor: JVMExecutor
+    :return: the future
+    :rtype: Future
+    """
+    if executor is None:
+        executor = get_executor()
+    return executor.submit(_build, classifier, data)
+
+
+def apredict_batch(classifier, data, executor=None):
+    """
+    Performs predictions for all rows in the background (see Classifier.predict_batch).
+
+    :param classifier: the trained classifier
+    :type classifier: Classifier
+    :param data: the data to get the classifications for
+    :type data: Instances
+    :param executor: the executor to use, None for the shared one
+    :type executor: JVMExecutor
+    :return: the future
+    :rtype: Future
+    """
+    if executor is None:
+        executor = get_executor()
+    return executor.submit(classifier.predict_batch, data)
+
+
+def adistributions_batch(classifier, data, executor=None):
+    """
+    Computes the class distributions for all rows in the background (see Classifier.distributions_batch).
+
+    :param classifier: the trained classifier
+    :type classifier: Classifier
+    :param data: the data to get the class distributions for
+    :type data: Instances
+    :param executor: the executor to use, None for the shared one
+    :type executor: JVMExecutor
+    :return: the future
+    :rtype: Future
+    """
+    if executor is None:
+        executor = get_executor()
+    return executor.submit(classifier.distributions_batch, data)
+
+
+def acrossvalidate(evaluation, classifier, data, num_folds, rnd, output=None, num_threads=None, executor=None):
+    """
+    Cross-validates the classifier in the background (see Evaluation.crossvalidate_model). The future's
+    result is the evaluation.
+
+    :param evaluation: the evaluation to use
+    :type evaluation: Evaluation
+    :param classifier: the classifier to cross-validate
+    :type classifier: Classifier
+    :param data: the data to evaluate on
+    :type data: Instances
+    :param num_folds: the number of folds
+    :type num_folds: int
+    :param rnd: the random number generator to use
+    :type rnd: Random
+    :param output: the output generator to use
+    :type output: PredictionOutput
+    :param num_threads: the number of threads to use within the JVM, None for sequential
+    :type num_threads: int
+    :param executor: the executor to use, None for the shared one
+    :type executor: JVMExecutor
+    :return: the future
+    :rtype: Future
+    """
+    if executor is None:
+        executor = get_executor()
+    return executor.submit(_crossvalidate, evaluation, classifier, data, num_folds, rnd, output, num_threads)
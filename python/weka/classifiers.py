@@ -24,7 +24,7 @@ import weka.core.types as arrays
 import weka.core.classes as classes
 from numpy import *
 from weka.core.classes import JavaObject, join_options, OptionHandler, Random, SelectedTag, Tags, Tag, JavaArray
-from weka.core.classes import AbstractParameter
+from weka.core.classes import AbstractParameter, get_method_handle
 from weka.core.capabilities import Capabilities
 from weka.core.dataset import Instances, Instance, Attribute
 from weka.filters import Filter
@@ -38,6 +38,18 @@ class Classifier(OptionHandler):
     Wrapper class for classifiers.
     """
 
+    _classify_instance = get_method_handle("weka/classifiers/Classifier", "classifyInstance", "(Lweka/core/Instance;)D")
+    _distribution_for_instance = get_method_handle("weka/classifiers/Classifier", "distributionForInstance", "(Lweka/core/Instance;)[D")
+    _distributions_for_instances = get_method_handle("weka/core/BatchPredictor", "distributionsForInstances", "(Lweka/core/Instances;)[[D")
+    _get_capabilities = get_method_handle("weka/classifiers/Classifier", "getCapabilities", "()Lweka/core/Capabilities;")
+    _build_classifier = get_method_handle("weka/classifiers/Classifier", "buildClassifier", "(Lweka/core/Instances;)V")
+    _update_classifier = get_method_handle("weka/classifiers/UpdateableClassifier", "updateClassifier", "(Lweka/core/Instance;)V")
+    _get_batch_size = get_method_handle("weka/core/BatchPredictor", "getBatchSize", "()Ljava/lang/String;")
+    _set_batch_size = get_method_handle("weka/core/BatchPredictor", "setBatchSize", "(Ljava/lang/String;)V")
+    _implements_more_efficient_batch_prediction = get_method_handle("weka/core/BatchPredictor", "implementsMoreEfficientBatchPrediction", "()Z")
+    _graph_type = get_method_handle("weka/core/Drawable", "graphType", "()I")
+    _graph = get_method_handle("weka/core/Drawable", "graph", "()Ljava/lang/String;")
+
     def __init__(self, classname="weka.classifiers.rules.ZeroR", jobject=None, options=None):
         """
         Initializes the specified classifier using either the classname or the supplied JB_Object.
@@ -56,11 +68,6 @@ class Classifier(OptionHandler):
         self.is_drawable = self.check_type(jobject, "weka.core.Drawable")
         self.is_batchpredictor = self.check_type(jobject, "weka.core.BatchPredictor")
         super(Classifier, self).__init__(jobject=jobject, options=options)
-        self.__classify = javabridge.make_call(self.jobject, "classifyInstance", "(Lweka/core/Instance;)D")
-        self.__distribution = javabridge.make_call(self.jobject, "distributionForInstance", "(Lweka/core/Instance;)[D")
-        if self.is_batchpredictor:
-            self.__distributions = javabridge.make_call(
-                self.jobject, "distributionsForInstances", "(Lweka/core/Instances;)[[D")
 
     @property
     def capabilities(self):
@@ -70,7 +77,7 @@ class Classifier(OptionHandler):
         :return: the capabilities
         :rtype: Capabilities
         """
-        return Capabilities(javabridge.call(self.jobject, "getCapabilities", "()Lweka/core/Capabilities;"))
+        return Capabilities(self._get_capabilities(self.jobject))
 
     def build_classifier(self, data):
         """
@@ -79,7 +86,7 @@ class Classifier(OptionHandler):
         :param data: the data to train the classifier with
         :type data: Instances
         """
-        javabridge.call(self.jobject, "buildClassifier", "(Lweka/core/Instances;)V", data.jobject)
+        self._build_classifier(self.jobject, data.jobject)
 
     def update_classifier(self, inst):
         """
@@ -89,10 +96,96 @@ class Classifier(OptionHandler):
         :type inst: Instance
         """
         if self.is_updateable:
-            javabridge.call(self.jobject, "updateClassifier", "(Lweka/core/Instance;)V", inst.jobject)
+            self._update_classifier(self.jobject, inst.jobject)
         else:
             logger.critical(classes.get_classname(self.jobject) + " is not updateable!")
 
+    def train_incremental(self, source, batch_size=1000, header=None, initialize=True, callback=None,
+                          checkpoint=None, checkpoint_interval=10):
+        """
+        Trains the updateable classifier incrementally, transferring the data in batches and updating
+        the classifier with all the rows of a batch inside the JVM.
+        The source can be a Loader in incremental mode (class attribute set on its structure), a
+        DataGenerator (last attribute is used as class if none set), a dataset or an iterable of Instances
+        objects or numpy matrices (internal format, one column per attribute; requires the header).
+
+        :param source: the source of the data
+        :type source: Loader or DataGenerator or Instances or iterable
+        :param batch_size: the maximum number of rows per batch (not used for iterables)
+        :type batch_size: int
+        :param header: the dataset structure with the class attribute set, uses the structure of the
+                       source if None
+        :type header: Instances
+        :param initialize: whether to initialize the classifier with the header via build_classifier first
+        :type initialize: bool
+        :param callback: the function to call after each batch, with the classifier and the number of
+                         rows processed so far as arguments
+        :type callback: function
+        :param checkpoint: the file to serialize the classifier to periodically and at the end, None to skip
+        :type checkpoint: str
+        :param checkpoint_interval: the number of batches after which to write the checkpoint
+        :type checkpoint_interval: int
+        :return: the number of rows processed
+        :rtype: int
+        """
+        import weka.core.serialization as serialization
+        from weka.core.converters import Loader
+        from weka.datagenerators import DataGenerator
+
+        if not self.is_updateable:
+            raise Exception(classes.get_classname(self.jobject) + " is not updateable!")
+
+        if isinstance(source, Loader):
+            if not source.incremental:
+                raise Exception("Loader not in incremental mode!")
+            if header is None:
+                header = source.structure
+            batches = source.iter_batches(batch_size=batch_size)
+        elif isinstance(source, DataGenerator):
+            fmt = source.define_data_format()
+            if not fmt.has_class():
+                fmt.class_is_last()
+            source.dataset_format = fmt
+            if header is None:
+                header = fmt
+            batches = _generator_batches(source, batch_size)
+        elif isinstance(source, Instances):
+            if header is None:
+                header = Instances.template_instances(source, 0)
+            batches = (Instances.copy_instances(source, start, min(batch_size, source.num_instances - start))
+                       for start in xrange(0, source.num_instances, batch_size))
+        else:
+            batches = iter(source)
+
+        initialized = not initialize
+        if not initialized and (header is not None):
+            self.build_classifier(header)
+            initialized = True
+        count = 0
+        num_batches = 0
+        for batch in batches:
+            if not isinstance(batch, Instances):
+                if header is None:
+                    raise Exception("Header required for numpy matrices!")
+                data = Instances.template_instances(header, len(batch))
+                data.add_ndarray(batch)
+                batch = data
+            if not initialized:
+                self.build_classifier(Instances.template_instances(batch, 0))
+                initialized = True
+            javabridge.static_call(
+                "weka/classifiers/ClassifierHelper", "updateClassifier",
+                "(Lweka/classifiers/Classifier;Lweka/core/Instances;)V", self.jobject, batch.jobject)
+            count += batch.num_instances
+            num_batches += 1
+            if callback is not None:
+                callback(self, count)
+            if (checkpoint is not None) and (num_batches % checkpoint_interval == 0):
+                serialization.write(checkpoint, self)
+        if checkpoint is not None:
+            serialization.write(checkpoint, self)
+        return count
+
     def classify_instance(self, inst):
         """
         Peforms a prediction.
@@ -102,7 +195,7 @@ class Classifier(OptionHandler):
         :return: the classification (either regression value or 0-based label index)
         :rtype: float
         """
-        return self.__classify(inst.jobject)
+        return self._classify_instance(self.jobject, inst.jobject)
 
     def distribution_for_instance(self, inst):
         """
@@ -113,7 +206,7 @@ class Classifier(OptionHandler):
         :return: the class distribution array
         :rtype: ndarray
         """
-        pred = self.__distribution(inst.jobject)
+        pred = self._distribution_for_instance(self.jobject, inst.jobject)
         return javabridge.get_env().get_double_array_elements(pred)
 
     def distributions_for_instances(self, data):
@@ -126,10 +219,77 @@ class Classifier(OptionHandler):
         :rtype: ndarray
         """
         if self.is_batchpredictor:
-            return arrays.double_matrix_to_ndarray(self.__distributions(data.jobject))
+            return arrays.double_matrix_to_ndarray(self._distributions_for_instances(self.jobject, data.jobject))
         else:
             return None
 
+    def distributions_batch(self, data):
+        """
+        Peforms predictions for all rows with a single call, returning the class distributions.
+        Batch predictors use distributionsForInstances, for all other classifiers the rows
+        get processed inside the JVM. For numeric classes, the predicted value is returned.
+
+        :param data: the Instances to get the class distributions for
+        :type data: Instances
+        :return: the class distribution matrix (rows x classes)
+        :rtype: ndarray
+        """
+        dists = javabridge.get_env().get_double_array_elements(
+            javabridge.static_call(
+                "weka/classifiers/ClassifierHelper", "distributionsForInstances",
+                "(Lweka/classifiers/Classifier;Lweka/core/Instances;)[D",
+                self.jobject, data.jobject))
+        if data.class_attribute.is_nominal:
+            num_classes = data.class_attribute.num_values
+        else:
+            num_classes = 1
+        return dists.reshape((data.num_instances, num_classes))
+
+    def predict_batch(self, data):
+        """
+        Peforms predictions for all rows with a single call, returning the classifications. Batch predictors
+        derive the classifications from the class distributions, unless they implement their own
+        classifyInstance method, which then gets called for each row.
+
+        :param data: the Instances to get the classifications for
+        :type data: Instances
+        :return: the classifications (either regression values or 0-based label indices)
+        :rtype: ndarray
+        """
+        return javabridge.get_env().get_double_array_elements(
+            javabridge.static_call(
+                "weka/classifiers/ClassifierHelper", "classifyInstances",
+                "(Lweka/classifiers/Classifier;Lweka/core/Instances;)[D",
+                self.jobject, data.jobject))
+
+    def abuild(self, data, executor=None):
+        """
+        Builds the classifier with the data in a thread attached to the JVM, without blocking.
+
+        :param data: the data to train the classifier with
+        :type data: Instances
+        :param executor: the executor to use, None for the shared one
+        :type executor: aio.JVMExecutor
+        :return: the future, with this classifier as result
+        :rtype: aio.Future
+        """
+        import weka.aio as aio
+        return aio.abuild(self, data, executor=executor)
+
+    def apredict_batch(self, data, executor=None):
+        """
+        Peforms predictions for all rows in a thread attached to the JVM, without blocking.
+
+        :param data: the Instances to get the classifications for
+        :type data: Instances
+        :param executor: the executor to use, None for the shared one
+        :type executor: aio.JVMExecutor
+        :return: the future, with the classifications as result
+        :rtype: aio.Future
+        """
+        import weka.aio as aio
+        return aio.apredict_batch(self, data, executor=executor)
+
     @property
     def batch_size(self):
         """
@@ -139,7 +299,7 @@ class Classifier(OptionHandler):
         :rtype: str
         """
         if self.is_batchpredictor:
-            return javabridge.call(self.jobject, "getBatchSize", "()Ljava/lang/String;")
+            return self._get_batch_size(self.jobject)
         else:
             return None
 
@@ -152,7 +312,7 @@ class Classifier(OptionHandler):
         :type size: str
         """
         if self.is_batchpredictor:
-            javabridge.call(self.jobject, "setBatchSize", "(Ljava/lang/String;)V", size)
+            self._set_batch_size(self.jobject, size)
 
     def has_efficient_batch_prediction(self):
         """
@@ -162,7 +322,7 @@ class Classifier(OptionHandler):
         :rtype: bool
         """
         if self.is_batchpredictor:
-            return javabridge.call(self.jobject, "implementsMoreEfficientBatchPrediction", "()Z")
+            return self._implements_more_efficient_batch_prediction(self.jobject)
         else:
             return False
 
@@ -175,7 +335,7 @@ class Classifier(OptionHandler):
         :rtype: int
         """
         if self.is_drawable:
-            return javabridge.call(self.jobject, "graphType", "()I")
+            return self._graph_type(self.jobject)
         else:
             return -1
 
@@ -188,7 +348,7 @@ class Classifier(OptionHandler):
         :rtype: str
         """
         if self.is_drawable:
-            return javabridge.call(self.jobject, "graph", "()Ljava/lang/String;")
+            return self._graph(self.jobject)
         else:
             return None
 
@@ -208,6 +368,91 @@ class Classifier(OptionHandler):
                 "(Lweka/classifiers/Classifier;)Lweka/classifiers/Classifier;", classifier.jobject))
 
 
+def _generator_batches(generator, batch_size):
+    """
+    Generates the examples of the data generator in batches. In single mode, each batch gets
+    generated with a single call, otherwise the complete dataset is returned as the only batch.
+    The data format must have been defined already. Calls generate_start before and generate_finish
+    after generating the examples, like DataGenerator.makeData does.
+
+    :param generator: the data generator to use
+    :type generator: DataGenerator
+    :param batch_size: the maximum number of examples per batch
+    :type batch_size: int
+    :return: the batches
+    :rtype: iterator
+    """
+    generator.generate_start()
+    if generator.single_mode_flag:
+        remaining = generator.num_examples_act
+        while remaining > 0:
+            batch = Instances(javabridge.static_call(
+                "weka/datagenerators/DataGeneratorHelper", "generateBatch",
+                "(Lweka/datagenerators/DataGenerator;I)Lweka/core/Instances;",
+                generator.jobject, min(batch_size, remaining)))
+            if batch.num_instances == 0:
+                break
+            remaining -= batch.num_instances
+            yield batch
+    else:
+        yield generator.generate_examples()
+    generator.generate_finish()
+
+
+class Scorer(object):
+    """
+    Scores single rows with low latency, using a trained classifier and a pre-allocated Java instance
+    whose values get overwritten in place. Classification and class distribution are obtained from a
+    single call into the JVM and a single model evaluation (unless the classifier implements its own
+    classifyInstance method), the distribution gets copied once from a pre-allocated Java array.
+    The values still get transferred as a new Java array per row, as javabridge cannot write into an
+    existing one. Not thread-safe, use one scorer per thread.
+    """
+
+    _score = get_method_handle("weka/classifiers/ScoringInstance", "score", "(Lweka/classifiers/Classifier;[D)D")
+
+    def __init__(self, classifier, header):
+        """
+        Initializes the scorer.
+
+        :param classifier: the trained classifier to use
+        :type classifier: Classifier
+        :param header: the dataset structure the classifier was trained on (class attribute must be set)
+        :type header: Instances
+        """
+        if header.class_index < 0:
+            raise Exception("No class attribute set!")
+        self.classifier = classifier
+        self.instance = Instance(javabridge.make_instance(
+            "weka/classifiers/ScoringInstance", "(Lweka/core/Instances;)V", header.jobject))
+        self.header = self.instance.dataset
+        self.values = empty(header.num_attributes, dtype=float64)
+        self.values.fill(nan)
+        self.attributes = array([i for i in xrange(header.num_attributes) if i != header.class_index], dtype=int32)
+        self._distribution = javabridge.call(self.instance.jobject, "getDistribution", "()[D")
+
+    def score(self, values=None):
+        """
+        Scores the row. The values are either provided for all attributes or for all attributes apart from
+        the class attribute, in internal format (ie label indices for nominal attributes, NaN for missing).
+        If no values are provided, the ones of the `values` buffer are used, which can be updated in place.
+
+        :param values: the values of the row, None to use the buffer
+        :type values: ndarray or list
+        :return: tuple of classification (regression value or 0-based label index, NaN if unclassified)
+                 and class distribution
+        :rtype: tuple
+        """
+        if values is not None:
+            if len(values) == len(self.attributes):
+                self.values[self.attributes] = values
+            else:
+                self.values[:] = values
+        env = javabridge.get_env()
+        classification = self._score(self.instance.jobject, self.classifier.jobject, env.make_double_array(self.values))
+        return classification, env.get_double_array_elements(self._distribution)
+
+
 class SingleClassifierEnhancer(Classifier):
     """
     Wrapper class for classifiers that use a single base classifier.
@@ -738,6 +983,12 @@ class Prediction(JavaObject):
     Wrapper class for a prediction.
     """
 
+    __slots__ = ()
+
+    _actual = get_method_handle("weka/classifiers/evaluation/Prediction", "actual", "()D")
+    _predicted = get_method_handle("weka/classifiers/evaluation/Prediction", "predicted", "()D")
+    _weight = get_method_handle("weka/classifiers/evaluation/Prediction", "weight", "()D")
+
     def __init__(self, jobject):
         """
         Initializes the wrapper.
@@ -756,7 +1007,7 @@ class Prediction(JavaObject):
         :return: the actual value (internal representation)
         :rtype: float
         """
-        return javabridge.call(self.jobject, "actual", "()D")
+        return self._actual(self.jobject)
 
     @property
     def predicted(self):
@@ -766,7 +1017,7 @@ class Prediction(JavaObject):
         :return: the predicted value (internal representation)
         :rtype: float
         """
-        return javabridge.call(self.jobject, "predicted", "()D")
+        return self._predicted(self.jobject)
 
     @property
     def weight(self):
@@ -776,7 +1027,7 @@ class Prediction(JavaObject):
         :return: the weight of the Instance that was used
         :rtype: float
         """
-        return javabridge.call(self.jobject, "weight", "()D")
+        return self._weight(self.jobject)
 
 
 class NominalPrediction(Prediction):
@@ -784,6 +1035,11 @@ class NominalPrediction(Prediction):
     Wrapper class for a nominal prediction.
     """
 
+    __slots__ = ()
+
+    _distribution = get_method_handle("weka/classifiers/evaluation/NominalPrediction", "distribution", "()[D")
+    _margin = get_method_handle("weka/classifiers/evaluation/NominalPrediction", "margin", "()D")
+
     def __init__(self, jobject):
         """
         Initializes the wrapper.
@@ -802,7 +1058,7 @@ class NominalPrediction(Prediction):
         :return: the class distribution list
         :rtype: ndarray
         """
-        return javabridge.get_env().get_double_array_elements(javabridge.call(self.jobject, "distribution", "()[D"))
+        return javabridge.get_env().get_double_array_elements(self._distribution(self.jobject))
 
     @property
     def margin(self):
@@ -812,7 +1068,7 @@ class NominalPrediction(Prediction):
         :return: the margin
         :rtype: float
         """
-        return javabridge.call(self.jobject, "margin", "()D")
+        return self._margin(self.jobject)
 
 
 class NumericPrediction(Prediction):
@@ -820,6 +1076,11 @@ class NumericPrediction(Prediction):
     Wrapper class for a numeric prediction.
     """
 
+    __slots__ = ()
+
+    _error = get_method_handle("weka/classifiers/evaluation/NumericPrediction", "error", "()D")
+    _prediction_intervals = get_method_handle("weka/classifiers/evaluation/NumericPrediction", "predictionIntervals", "()[[D")
+
     def __init__(self, jobject):
         """
         Initializes the wrapper.
@@ -838,7 +1099,7 @@ class NumericPrediction(Prediction):
         :return: the error
         :rtype: float
         """
-        return javabridge.call(self.jobject, "error", "()D")
+        return self._error(self.jobject)
 
     @property
     def prediction_intervals(self):
@@ -848,7 +1109,7 @@ class NumericPrediction(Prediction):
         :return: the intervals
         :rtype: ndarray
         """
-        return arrays.double_matrix_to_ndarray(javabridge.call(self.jobject, "predictionIntervals", "()[[D"))
+        return arrays.double_matrix_to_ndarray(self._prediction_intervals(self.jobject))
 
 
 class CostMatrix(JavaObject):
@@ -1081,20 +1342,159 @@ class CostMatrix(JavaObject):
                 "(Ljava/lang/String;)Lweka/classifiers/CostMatrix;", matlab))
 
 
+EVALUATION_METRICS = {
+    "avg_cost": "avgCost",
+    "correct": "correct",
+    "correlation_coefficient": "correlationCoefficient",
+    "coverage_of_test_cases_by_predicted_regions": "coverageOfTestCasesByPredictedRegions",
+    "error_rate": "errorRate",
+    "incorrect": "incorrect",
+    "kappa": "kappa",
+    "kb_information": "KBInformation",
+    "kb_mean_information": "KBMeanInformation",
+    "kb_relative_information": "KBRelativeInformation",
+    "mean_absolute_error": "meanAbsoluteError",
+    "mean_prior_absolute_error": "meanPriorAbsoluteError",
+    "num_instances": "numInstances",
+    "percent_correct": "pctCorrect",
+    "percent_incorrect": "pctIncorrect",
+    "percent_unclassified": "pctUnclassified",
+    "relative_absolute_error": "relativeAbsoluteError",
+    "root_mean_prior_squared_error": "rootMeanPriorSquaredError",
+    "root_mean_squared_error": "rootMeanSquaredError",
+    "root_relative_squared_error": "rootRelativeSquaredError",
+    "sf_entropy_gain": "SFEntropyGain",
+    "sf_mean_entropy_gain": "SFMeanEntropyGain",
+    "sf_mean_prior_entropy": "SFMeanPriorEntropy",
+    "sf_mean_scheme_entropy": "SFMeanSchemeEntropy",
+    "size_of_predicted_regions": "sizeOfPredictedRegions",
+    "total_cost": "totalCost",
+    "unclassified": "unclassified",
+    "unweighted_macro_f_measure": "unweightedMacroFmeasure",
+    "unweighted_micro_f_measure": "unweightedMicroFmeasure",
+    "weighted_area_under_prc": "weightedAreaUnderPRC",
+    "weighted_area_under_roc": "weightedAreaUnderROC",
+    "weighted_f_measure": "weightedFMeasure",
+    "weighted_false_negative_rate": "weightedFalseNegativeRate",
+    "weighted_false_positive_rate": "weightedFalsePositiveRate",
+    "weighted_matthews_correlation": "weightedMatthewsCorrelation",
+    "weighted_precision": "weightedPrecision",
+    "weighted_recall": "weightedRecall",
+    "weighted_true_negative_rate": "weightedTrueNegativeRate",
+    "weighted_true_positive_rate": "weightedTruePositiveRate",
+}
+"""the scalar metrics of Evaluation (property name -> Java method)"""
+
+EVALUATION_CLASS_METRICS = {
+    "area_under_prc": "areaUnderPRC",
+    "area_under_roc": "areaUnderROC",
+    "f_measure": "fMeasure",
+    "false_negative_rate": "falseNegativeRate",
+    "false_positive_rate": "falsePositiveRate",
+    "matthews_correlation_coefficient": "matthewsCorrelationCoefficient",
+    "num_false_negatives": "numFalseNegatives",
+    "num_false_positives": "numFalsePositives",
+    "num_true_negatives": "numTrueNegatives",
+    "num_true_positives": "numTruePositives",
+    "precision": "precision",
+    "recall": "recall",
+    "true_negative_rate": "trueNegativeRate",
+    "true_positive_rate": "truePositiveRate",
+}
+"""the per-class metrics of Evaluation (property name -> Java method)"""
+
+
 class Evaluation(JavaObject):
     """
     Evaluation class for classifiers.
     """
 
-    def __init__(self, data, cost_matrix=None):
-        """
-        Initializes an Evaluation object.
+    _cross_validate_model = get_method_handle("weka/classifiers/Evaluation", "crossValidateModel", "(Lweka/classifiers/Classifier;Lweka/core/Instances;ILjava/util/Random;[Ljava/lang/Object;)V")
+    _evaluate_model = get_method_handle("weka/classifiers/Evaluation", "evaluateModel", "(Lweka/classifiers/Classifier;Lweka/core/Instances;[Ljava/lang/Object;)[D")
+    _evaluate_model_once = get_method_handle("weka/classifiers/Evaluation", "evaluateModelOnce", "(Lweka/classifiers/Classifier;Lweka/core/Instance;)D")
+    _to_summary_string = get_method_handle("weka/classifiers/Evaluation", "toSummaryString", "()Ljava/lang/String;")
+    _to_summary_string_title = get_method_handle("weka/classifiers/Evaluation", "toSummaryString", "(Ljava/lang/String;Z)Ljava/lang/String;")
+    _to_class_details_string = get_method_handle("weka/classifiers/Evaluation", "toClassDetailsString", "()Ljava/lang/String;")
+    _to_class_details_string_title = get_method_handle("weka/classifiers/Evaluation", "toClassDetailsString", "(Ljava/lang/String;)Ljava/lang/String;")
+    _to_matrix_string = get_method_handle("weka/classifiers/Evaluation", "toMatrixString", "()Ljava/lang/String;")
+    _to_matrix_string_title = get_method_handle("weka/classifiers/Evaluation", "toMatrixString", "(Ljava/lang/String;)Ljava/lang/String;")
+    _area_under_prc = get_method_handle("weka/classifiers/Evaluation", "areaUnderPRC", "(I)D")
+    _weighted_area_under_prc = get_method_handle("weka/classifiers/Evaluation", "weightedAreaUnderPRC", "()D")
+    _area_under_roc = get_method_handle("weka/classifiers/Evaluation", "areaUnderROC", "(I)D")
+    _weighted_area_under_roc = get_method_handle("weka/classifiers/Evaluation", "weightedAreaUnderROC", "()D")
+    _avg_cost = get_method_handle("weka/classifiers/Evaluation", "avgCost", "()D")
+    _total_cost = get_method_handle("weka/classifiers/Evaluation", "totalCost", "()D")
+    _confusion_matrix = get_method_handle("weka/classifiers/Evaluation", "confusionMatrix", "()[[D")
+    _correct = get_method_handle("weka/classifiers/Evaluation", "correct", "()D")
+    _incorrect = get_method_handle("weka/classifiers/Evaluation", "incorrect", "()D")
+    _unclassified = get_method_handle("weka/classifiers/Evaluation", "unclassified", "()D")
+    _num_instances = get_method_handle("weka/classifiers/Evaluation", "numInstances", "()D")
+    _pct_correct = get_method_handle("weka/classifiers/Evaluation", "pctCorrect", "()D")
+    _pct_incorrect = get_method_handle("weka/classifiers/Evaluation", "pctIncorrect", "()D")
+    _pct_unclassified = get_method_handle("weka/classifiers/Evaluation", "pctUnclassified", "()D")
+    _correlation_coefficient = get_method_handle("weka/classifiers/Evaluation", "correlationCoefficient", "()D")
+    _matthews_correlation_coefficient = get_method_handle("weka/classifiers/Evaluation", "matthewsCorrelationCoefficient", "(I)D")
+    _weighted_matthews_correlation = get_method_handle("weka/classifiers/Evaluation", "weightedMatthewsCorrelation", "()D")
+    _coverage_of_test_cases_by_predicted_regions = get_method_handle("weka/classifiers/Evaluation", "coverageOfTestCasesByPredictedRegions", "()D")
+    _size_of_predicted_regions = get_method_handle("weka/classifiers/Evaluation", "sizeOfPredictedRegions", "()D")
+    _error_rate = get_method_handle("weka/classifiers/Evaluation", "errorRate", "()D")
+    _mean_absolute_error = get_method_handle("weka/classifiers/Evaluation", "meanAbsoluteError", "()D")
+    _relative_absolute_error = get_method_handle("weka/classifiers/Evaluation", "relativeAbsoluteError", "()D")
+    _root_mean_squared_error = get_method_handle("weka/classifiers/Evaluation", "rootMeanSquaredError", "()D")
+    _root_relative_squared_error = get_method_handle("weka/classifiers/Evaluation", "rootRelativeSquaredError", "()D")
+    _root_mean_prior_squared_error = get_method_handle("weka/classifiers/Evaluation", "rootMeanPriorSquaredError", "()D")
+    _mean_prior_absolute_error = get_method_handle("weka/classifiers/Evaluation", "meanPriorAbsoluteError", "()D")
+    _false_negative_rate = get_method_handle("weka/classifiers/Evaluation", "falseNegativeRate", "(I)D")
+    _weighted_false_negative_rate = get_method_handle("weka/classifiers/Evaluation", "weightedFalseNegativeRate", "()D")
+    _false_positive_rate = get_method_handle("weka/classifiers/Evaluation", "falsePositiveRate", "(I)D")
+    _weighted_false_positive_rate = get_method_handle("weka/classifiers/Evaluation", "weightedFalsePositiveRate", "()D")
+    _num_false_negatives = get_method_handle("weka/classifiers/Evaluation", "numFalseNegatives", "(I)D")
+    _true_negative_rate = get_method_handle("weka/classifiers/Evaluation", "trueNegativeRate", "(I)D")
+    _weighted_true_negative_rate = get_method_handle("weka/classifiers/Evaluation", "weightedTrueNegativeRate", "()D")
+    _num_true_negatives = get_method_handle("weka/classifiers/Evaluation", "numTrueNegatives", "(I)D")
+    _num_false_positives = get_method_handle("weka/classifiers/Evaluation", "numFalsePositives", "(I)D")
+    _true_positive_rate = get_method_handle("weka/classifiers/Evaluation", "truePositiveRate", "(I)D")
+    _weighted_true_positive_rate = get_method_handle("weka/classifiers/Evaluation", "weightedTruePositiveRate", "()D")
+    _num_true_positives = get_method_handle("weka/classifiers/Evaluation", "numTruePositives", "(I)D")
+    _f_measure = get_method_handle("weka/classifiers/Evaluation", "fMeasure", "(I)D")
+    _weighted_f_measure = get_method_handle("weka/classifiers/Evaluation", "weightedFMeasure", "()D")
+    _unweighted_macro_fmeasure = get_method_handle("weka/classifiers/Evaluation", "unweightedMacroFmeasure", "()D")
+    _unweighted_micro_fmeasure = get_method_handle("weka/classifiers/Evaluation", "unweightedMicroFmeasure", "()D")
+    _precision = get_method_handle("weka/classifiers/Evaluation", "precision", "(I)D")
+    _weighted_precision = get_method_handle("weka/classifiers/Evaluation", "weightedPrecision", "()D")
+    _recall = get_method_handle("weka/classifiers/Evaluation", "recall", "(I)D")
+    _weighted_recall = get_method_handle("weka/classifiers/Evaluation", "weightedRecall", "()D")
+    _kappa = get_method_handle("weka/classifiers/Evaluation", "kappa", "()D")
+    _kb_information = get_method_handle("weka/classifiers/Evaluation", "KBInformation", "()D")
+    _kb_mean_information = get_method_handle("weka/classifiers/Evaluation", "KBMeanInformation", "()D")
+    _kb_relative_information = get_method_handle("weka/classifiers/Evaluation", "KBRelativeInformation", "()D")
+    _sf_entropy_gain = get_method_handle("weka/classifiers/Evaluation", "SFEntropyGain", "()D")
+    _sf_mean_entropy_gain = get_method_handle("weka/classifiers/Evaluation", "SFMeanEntropyGain", "()D")
+    _sf_mean_prior_entropy = get_method_handle("weka/classifiers/Evaluation", "SFMeanPriorEntropy", "()D")
+    _sf_mean_scheme_entropy = get_method_handle("weka/classifiers/Evaluation", "SFMeanSchemeEntropy", "()D")
+    _get_class_priors = get_method_handle("weka/classifiers/Evaluation", "getClassPriors", "()[D")
+    _set_class_priors = get_method_handle("weka/classifiers/Evaluation", "setClassPriors", "(Lweka/core/Instances;)V")
+    _get_header = get_method_handle("weka/classifiers/Evaluation", "getHeader", "()Lweka/core/Instances;")
+    _get_discard_predictions = get_method_handle("weka/classifiers/Evaluation", "getDiscardPredictions", "()Z")
+    _set_discard_predictions = get_method_handle("weka/classifiers/Evaluation", "setDiscardPredictions", "(Z)V")
+    _predictions = get_method_handle("weka/classifiers/Evaluation", "predictions", "()Ljava/util/ArrayList;")
+
+    def __init__(self, data=None, cost_matrix=None, jobject=None):
+        """
+        Initializes an Evaluation object, either from the data or by wrapping a weka.classifiers.Evaluation object.
 
         :param data: the data to use to initialize the priors with
         :type data: Instances
         :param cost_matrix: the cost matrix to use for initializing
         :type cost_matrix: CostMatrix
+        :param jobject: the weka.classifiers.Evaluation JB_Object to wrap
+        :type jobject: JB_Object
         """
+        if jobject is not None:
+            self.enforce_type(jobject, "weka.classifiers.Evaluation")
+            self.wrapper = None
+            super(Evaluation, self).__init__(jobject)
+            return
         if cost_matrix is None:
             jobject = javabridge.make_instance(
                 "weka/classifiers/EvaluationWrapper", "(Lweka/core/Instances;)V",
@@ -1107,9 +1507,12 @@ class Evaluation(JavaObject):
         jobject = javabridge.call(jobject, "getEvaluation", "()Lweka/classifiers/Evaluation;")
         super(Evaluation, self).__init__(jobject)
 
-    def crossvalidate_model(self, classifier, data, num_folds, rnd, output=None):
+    def crossvalidate_model(self, classifier, data, num_folds, rnd, output=None, num_threads=None):
         """
         Crossvalidates the model using the specified data, number of folds and random number generator wrapper.
+        If a number of threads is specified, the folds get evaluated in parallel within the JVM, using a
+        separate copy of the classifier per fold, and the fold evaluations get merged into this evaluation
+        at the end (prediction output is not supported in that case).
 
         :param classifier: the classifier to cross-validate
         :type classifier: Classifier
@@ -1121,15 +1524,47 @@ class Evaluation(JavaObject):
         :type rnd: Random
         :param output: the output generator to use
         :type output: PredictionOutput
-        """
+        :param num_threads: the number of threads to use (less than 1 for number of CPUs), None for sequential
+        :type num_threads: int
+        """
+        if num_threads is not None:
+            if output is not None:
+                raise Exception("Prediction output is not supported when using multiple threads!")
+            javabridge.static_call(
+                "weka/classifiers/CrossValidationHelper", "crossValidateModel",
+                "(Lweka/classifiers/Evaluation;Lweka/classifiers/Classifier;Lweka/core/Instances;ILjava/util/Random;I)V",
+                self.jobject, classifier.jobject, data.jobject, num_folds, rnd.jobject, num_threads)
+            return
         if output is None:
             generator = []
         else:
             generator = [output.jobject]
-        javabridge.call(
-            self.jobject, "crossValidateModel",
-            "(Lweka/classifiers/Classifier;Lweka/core/Instances;ILjava/util/Random;[Ljava/lang/Object;)V",
-            classifier.jobject, data.jobject, num_folds, rnd.jobject, generator)
+        self._cross_validate_model(self.jobject, classifier.jobject, data.jobject, num_folds, rnd.jobject, generator)
+
+    def acrossvalidate(self, classifier, data, num_folds, rnd, output=None, num_threads=None, executor=None):
+        """
+        Crossvalidates the model (see crossvalidate_model) in a thread attached to the JVM, without blocking.
+
+        :param classifier: the classifier to cross-validate
+        :type classifier: Classifier
+        :param data: the data to evaluate on
+        :type data: Instances
+        :param num_folds: the number of folds
+        :type num_folds: int
+        :param rnd: the random number generator to use
+        :type rnd: Random
+        :param output: the output generator to use
+        :type output: PredictionOutput
+        :param num_threads: the number of threads to use within the JVM, None for sequential
+        :type num_threads: int
+        :param executor: the executor to use, None for the shared one
+        :type executor: aio.JVMExecutor
+        :return: the future, with this evaluation as result
+        :rtype: aio.Future
+        """
+        import weka.aio as aio
+        return aio.acrossvalidate(
+            self, classifier, data, num_folds, rnd, output=output, num_threads=num_threads, executor=executor)
 
     def evaluate_train_test_split(self, classifier, data, percentage, rnd=None, output=None):
         """
@@ -1170,10 +1605,7 @@ class Evaluation(JavaObject):
         else:
             output.header = data
             generator = [output.jobject]
-        cls = javabridge.call(
-            self.jobject, "evaluateModel",
-            "(Lweka/classifiers/Classifier;Lweka/core/Instances;[Ljava/lang/Object;)[D",
-            classifier.jobject, data.jobject, generator)
+        cls = self._evaluate_model(self.jobject, classifier.jobject, data.jobject, generator)
         if cls is None:
             return None
         else:
@@ -1190,10 +1622,7 @@ class Evaluation(JavaObject):
         :return: the classification
         :rtype: float
         """
-        return javabridge.call(
-            self.jobject, "evaluateModelOnce",
-            "(Lweka/classifiers/Classifier;Lweka/core/Instance;)D",
-            classifier.jobject, inst.jobject)
+        return self._evaluate_model_once(self.jobject, classifier.jobject, inst.jobject)
 
     def summary(self, title=None, complexity=False):
         """
@@ -1207,11 +1636,9 @@ class Evaluation(JavaObject):
         :rtype: str
         """
         if title is None:
-            return javabridge.call(
-                self.jobject, "toSummaryString", "()Ljava/lang/String;")
+            return self._to_summary_string(self.jobject)
         else:
-            return javabridge.call(
-                self.jobject, "toSummaryString", "(Ljava/lang/String;Z)Ljava/lang/String;", title, complexity)
+            return self._to_summary_string_title(self.jobject, title, complexity)
 
     def class_details(self, title=None):
         """
@@ -1223,11 +1650,9 @@ class Evaluation(JavaObject):
         :rtype: str
         """
         if title is None:
-            return javabridge.call(
-                self.jobject, "toClassDetailsString", "()Ljava/lang/String;")
+            return self._to_class_details_string(self.jobject)
         else:
-            return javabridge.call(
-                self.jobject, "toClassDetailsString", "(Ljava/lang/String;)Ljava/lang/String;", title)
+            return self._to_class_details_string_title(self.jobject, title)
 
     def matrix(self, title=None):
         """
@@ -1239,9 +1664,9 @@ class Evaluation(JavaObject):
         :rtype: str
         """
         if title is None:
-            return javabridge.call(self.jobject, "toMatrixString", "()Ljava/lang/String;")
+            return self._to_matrix_string(self.jobject)
         else:
-            return javabridge.call(self.jobject, "toMatrixString", "(Ljava/lang/String;)Ljava/lang/String;", title)
+            return self._to_matrix_string_title(self.jobject, title)
 
     def area_under_prc(self, class_index):
         """
@@ -1252,7 +1677,7 @@ class Evaluation(JavaObject):
         :return: the area
         :rtype: float
         """
-        return javabridge.call(self.jobject, "areaUnderPRC", "(I)D", class_index)
+        return self._area_under_prc(self.jobject, class_index)
 
     @property
     def weighted_area_under_prc(self):
@@ -1262,7 +1687,7 @@ class Evaluation(JavaObject):
         :return: the weighted area
         :rtype: float
         """
-        return javabridge.call(self.jobject, "weightedAreaUnderPRC", "()D")
+        return self._weighted_area_under_prc(self.jobject)
 
     def area_under_roc(self, class_index):
         """
@@ -1273,7 +1698,7 @@ class Evaluation(JavaObject):
         :return: the area
         :rtype: float
         """
-        return javabridge.call(self.jobject, "areaUnderROC", "(I)D", class_index)
+        return self._area_under_roc(self.jobject, class_index)
 
     @property
     def weighted_area_under_roc(self):
@@ -1283,7 +1708,7 @@ class Evaluation(JavaObject):
         :return: the weighted area
         :rtype: float
         """
-        return javabridge.call(self.jobject, "weightedAreaUnderROC", "()D")
+        return self._weighted_area_under_roc(self.jobject)
 
     @property
     def avg_cost(self):
@@ -1293,7 +1718,7 @@ class Evaluation(JavaObject):
         :return: the cost
         :rtype: float
         """
-        return javabridge.call(self.jobject, "avgCost", "()D")
+        return self._avg_cost(self.jobject)
 
     @property
     def total_cost(self):
@@ -1303,7 +1728,7 @@ class Evaluation(JavaObject):
         :return: the cost
         :rtype: float
         """
-        return javabridge.call(self.jobject, "totalCost", "()D")
+        return self._total_cost(self.jobject)
 
     @property
     def confusion_matrix(self):
@@ -1313,7 +1738,7 @@ class Evaluation(JavaObject):
         :return: the matrix
         :rtype: ndarray
         """
-        return arrays.double_matrix_to_ndarray(javabridge.call(self.jobject, "confusionMatrix", "()[[D"))
+        return arrays.double_matrix_to_ndarray(self._confusion_matrix(self.jobject))
 
     @property
     def correct(self):
@@ -1323,7 +1748,7 @@ class Evaluation(JavaObject):
         :return: the count
         :rtype: float
         """
-        return javabridge.call(self.jobject, "correct", "()D")
+        return self._correct(self.jobject)
 
     @property
     def incorrect(self):
@@ -1333,7 +1758,7 @@ class Evaluation(JavaObject):
         :return: the count
         :rtype: float
         """
-        return javabridge.call(self.jobject, "incorrect", "()D")
+        return self._incorrect(self.jobject)
 
     @property
     def unclassified(self):
@@ -1343,7 +1768,7 @@ class Evaluation(JavaObject):
         :return: the count
         :rtype: float
         """
-        return javabridge.call(self.jobject, "unclassified", "()D")
+        return self._unclassified(self.jobject)
 
     @property
     def num_instances(self):
@@ -1353,7 +1778,7 @@ class Evaluation(JavaObject):
         :return: the number of instances
         :rtype: float
         """
-        return javabridge.call(self.jobject, "numInstances", "()D")
+        return self._num_instances(self.jobject)
 
     @property
     def percent_correct(self):
@@ -1363,7 +1788,7 @@ class Evaluation(JavaObject):
         :return: the percentage
         :rtype: float
         """
-        return javabridge.call(self.jobject, "pctCorrect", "()D")
+        return self._pct_correct(self.jobject)
 
     @property
     def percent_incorrect(self):
@@ -1373,7 +1798,7 @@ class Evaluation(JavaObject):
         :return: the percentage
         :rtype: float
         """
-        return javabridge.call(self.jobject, "pctIncorrect", "()D")
+        return self._pct_incorrect(self.jobject)
 
     @property
     def percent_unclassified(self):
@@ -1383,7 +1808,7 @@ class Evaluation(JavaObject):
         :return: the percentage
         :rtype: float
         """
-        return javabridge.call(self.jobject, "pctUnclassified", "()D")
+        return self._pct_unclassified(self.jobject)
 
     @property
     def correlation_coefficient(self):
@@ -1393,7 +1818,7 @@ class Evaluation(JavaObject):
         :return: the coefficient
         :rtype: float
         """
-        return javabridge.call(self.jobject, "correlationCoefficient", "()D")
+        return self._correlation_coefficient(self.jobject)
 
     def matthews_correlation_coefficient(self, class_index):
         """
@@ -1404,7 +1829,7 @@ class Evaluation(JavaObject):
         :return: the coefficient
         :rtype: float
         """
-        return javabridge.call(self.jobject, "matthewsCorrelationCoefficient", "(I)D", class_index)
+        return self._matthews_correlation_coefficient(self.jobject, class_index)
 
     @property
     def weighted_matthews_correlation(self):
@@ -1414,7 +1839,7 @@ class Evaluation(JavaObject):
         :return: the correlation
         :rtype: float
         """
-        return javabridge.call(self.jobject, "weightedMatthewsCorrelation", "()D")
+        return self._weighted_matthews_correlation(self.jobject)
 
     @property
     def coverage_of_test_cases_by_predicted_regions(self):
@@ -1425,7 +1850,7 @@ class Evaluation(JavaObject):
         :return: the coverage
         :rtype: float
         """
-        return javabridge.call(self.jobject, "coverageOfTestCasesByPredictedRegions", "()D")
+        return self._coverage_of_test_cases_by_predicted_regions(self.jobject)
 
     @property
     def size_of_predicted_regions(self):
@@ -1436,7 +1861,7 @@ class Evaluation(JavaObject):
         :return:the size of the regions
         :rtype: float
         """
-        return javabridge.call(self.jobject, "sizeOfPredictedRegions", "()D")
+        return self._size_of_predicted_regions(self.jobject)
 
     @property
     def error_rate(self):
@@ -1446,7 +1871,7 @@ class Evaluation(JavaObject):
         :return: the rate
         :rtype: float
         """
-        return javabridge.call(self.jobject, "errorRate", "()D")
+        return self._error_rate(self.jobject)
 
     @property
     def mean_absolute_error(self):
@@ -1456,7 +1881,7 @@ class Evaluation(JavaObject):
         :return: the error
         :rtype: float
         """
-        return javabridge.call(self.jobject, "meanAbsoluteError", "()D")
+        return self._mean_absolute_error(self.jobject)
 
     @property
     def relative_absolute_error(self):
@@ -1466,7 +1891,7 @@ class Evaluation(JavaObject):
         :return: the error
         :rtype: float
         """
-        return javabridge.call(self.jobject, "relativeAbsoluteError", "()D")
+        return self._relative_absolute_error(self.jobject)
 
     @property
     def root_mean_squared_error(self):
@@ -1476,7 +1901,7 @@ class Evaluation(JavaObject):
         :return: the error
         :rtype: float
         """
-        return javabridge.call(self.jobject, "rootMeanSquaredError", "()D")
+        return self._root_mean_squared_error(self.jobject)
 
     @property
     def root_relative_squared_error(self):
@@ -1486,7 +1911,7 @@ class Evaluation(JavaObject):
         :return: the error
         :rtype: float
         """
-        return javabridge.call(self.jobject, "rootRelativeSquaredError", "()D")
+        return self._root_relative_squared_error(self.jobject)
 
     @property
     def root_mean_prior_squared_error(self):
@@ -1496,7 +1921,7 @@ class Evaluation(JavaObject):
         :return: the error
         :rtype: float
         """
-        return javabridge.call(self.jobject, "rootMeanPriorSquaredError", "()D")
+        return self._root_mean_prior_squared_error(self.jobject)
 
     @property
     def mean_prior_absolute_error(self):
@@ -1506,7 +1931,7 @@ class Evaluation(JavaObject):
         :return: the error
         :rtype: float
         """
-        return javabridge.call(self.jobject, "meanPriorAbsoluteError", "()D")
+        return self._mean_prior_absolute_error(self.jobject)
 
     def false_negative_rate(self, class_index):
         """
@@ -1517,7 +1942,7 @@ class Evaluation(JavaObject):
         :return: the rate
         :rtype: float
         """
-        return javabridge.call(self.jobject, "falseNegativeRate", "(I)D", class_index)
+        return self._false_negative_rate(self.jobject, class_index)
 
     @property
     def weighted_false_negative_rate(self):
@@ -1527,7 +1952,7 @@ class Evaluation(JavaObject):
         :return: the rate
         :rtype: float
         """
-        return javabridge.call(self.jobject, "weightedFalseNegativeRate", "()D")
+        return self._weighted_false_negative_rate(self.jobject)
 
     def false_positive_rate(self, class_index):
         """
@@ -1538,7 +1963,7 @@ class Evaluation(JavaObject):
         :return: the rate
         :rtype: float
         """
-        return javabridge.call(self.jobject, "falsePositiveRate", "(I)D", class_index)
+        return self._false_positive_rate(self.jobject, class_index)
 
     @property
     def weighted_false_positive_rate(self):
@@ -1548,7 +1973,7 @@ class Evaluation(JavaObject):
         :return: the rate
         :rtype: float
         """
-        return javabridge.call(self.jobject, "weightedFalsePositiveRate", "()D")
+        return self._weighted_false_positive_rate(self.jobject)
 
     def num_false_negatives(self, class_index):
         """
@@ -1559,7 +1984,7 @@ class Evaluation(JavaObject):
         :return: the count
         :rtype: float
         """
-        return javabridge.call(self.jobject, "numFalseNegatives", "(I)D", class_index)
+        return self._num_false_negatives(self.jobject, class_index)
 
     def true_negative_rate(self, class_index):
         """
@@ -1570,7 +1995,7 @@ class Evaluation(JavaObject):
         :return: the rate
         :rtype: float
         """
-        return javabridge.call(self.jobject, "trueNegativeRate", "(I)D", class_index)
+        return self._true_negative_rate(self.jobject, class_index)
 
     @property
     def weighted_true_negative_rate(self):
@@ -1580,7 +2005,7 @@ class Evaluation(JavaObject):
         :return: the rate
         :rtype: float
         """
-        return javabridge.call(self.jobject, "weightedTrueNegativeRate", "()D")
+        return self._weighted_true_negative_rate(self.jobject)
 
     def num_true_negatives(self, class_index):
         """
@@ -1591,7 +2016,7 @@ class Evaluation(JavaObject):
         :return: the count
         :rtype: float
         """
-        return javabridge.call(self.jobject, "numTrueNegatives", "(I)D", class_index)
+        return self._num_true_negatives(self.jobject, class_index)
 
     def num_false_positives(self, class_index):
         """
@@ -1602,7 +2027,7 @@ class Evaluation(JavaObject):
         :return: the count
         :rtype: float
         """
-        return javabridge.call(self.jobject, "numFalsePositives", "(I)D", class_index)
+        return self._num_false_positives(self.jobject, class_index)
 
     def true_positive_rate(self, class_index):
         """
@@ -1613,7 +2038,7 @@ class Evaluation(JavaObject):
         :return: the rate
         :rtype: float
         """
-        return javabridge.call(self.jobject, "truePositiveRate", "(I)D", class_index)
+        return self._true_positive_rate(self.jobject, class_index)
 
     @property
     def weighted_true_positive_rate(self):
@@ -1623,7 +2048,7 @@ class Evaluation(JavaObject):
         :return: the rate
         :rtype: float
         """
-        return javabridge.call(self.jobject, "weightedTruePositiveRate", "()D")
+        return self._weighted_true_positive_rate(self.jobject)
 
     def num_true_positives(self, class_index):
         """
@@ -1634,7 +2059,7 @@ class Evaluation(JavaObject):
         :return: the count
         :rtype: float
         """
-        return javabridge.call(self.jobject, "numTruePositives", "(I)D", class_index)
+        return self._num_true_positives(self.jobject, class_index)
 
     def f_measure(self, class_index):
         """
@@ -1645,7 +2070,7 @@ class Evaluation(JavaObject):
         :return: the measure
         :rtype: float
         """
-        return javabridge.call(self.jobject, "fMeasure", "(I)D", class_index)
+        return self._f_measure(self.jobject, class_index)
 
     @property
     def weighted_f_measure(self):
@@ -1655,7 +2080,7 @@ class Evaluation(JavaObject):
         :return: the measure
         :rtype: float
         """
-        return javabridge.call(self.jobject, "weightedFMeasure", "()D")
+        return self._weighted_f_measure(self.jobject)
 
     @property
     def unweighted_macro_f_measure(self):
@@ -1665,7 +2090,7 @@ class Evaluation(JavaObject):
         :return: the measure
         :rtype: float
         """
-        return javabridge.call(self.jobject, "unweightedMacroFmeasure", "()D")
+        return self._unweighted_macro_fmeasure(self.jobject)
 
     @property
     def unweighted_micro_f_measure(self):
@@ -1675,7 +2100,7 @@ class Evaluation(JavaObject):
         :return: the measure
         :rtype: float
         """
-        return javabridge.call(self.jobject, "unweightedMicroFmeasure", "()D")
+        return self._unweighted_micro_fmeasure(self.jobject)
 
     def precision(self, class_index):
         """
@@ -1686,7 +2111,7 @@ class Evaluation(JavaObject):
         :return: the precision
         :rtype: float
         """
-        return javabridge.call(self.jobject, "precision", "(I)D", class_index)
+        return self._precision(self.jobject, class_index)
 
     @property
     def weighted_precision(self):
@@ -1696,7 +2121,7 @@ class Evaluation(JavaObject):
         :return: the precision
         :rtype: float
         """
-        return javabridge.call(self.jobject, "weightedPrecision", "()D")
+        return self._weighted_precision(self.jobject)
 
     def recall(self, class_index):
         """
@@ -1707,7 +2132,7 @@ class Evaluation(JavaObject):
         :return: the recall
         :rtype: float
         """
-        return javabridge.call(self.jobject, "recall", "(I)D", class_index)
+        return self._recall(self.jobject, class_index)
 
     @property
     def weighted_recall(self):
@@ -1717,7 +2142,7 @@ class Evaluation(JavaObject):
         :return: the recall
         :rtype: float
         """
-        return javabridge.call(self.jobject, "weightedRecall", "()D")
+        return self._weighted_recall(self.jobject)
 
     @property
     def kappa(self):
@@ -1727,7 +2152,7 @@ class Evaluation(JavaObject):
         :return: kappa
         :rtype: float
         """
-        return javabridge.call(self.jobject, "kappa", "()D")
+        return self._kappa(self.jobject)
 
     @property
     def kb_information(self):
@@ -1737,7 +2162,7 @@ class Evaluation(JavaObject):
         :return: the information
         :rtype: float
         """
-        return javabridge.call(self.jobject, "KBInformation", "()D")
+        return self._kb_information(self.jobject)
 
     @property
     def kb_mean_information(self):
@@ -1747,7 +2172,7 @@ class Evaluation(JavaObject):
         :return: the information
         :rtype: float
         """
-        return javabridge.call(self.jobject, "KBMeanInformation", "()D")
+        return self._kb_mean_information(self.jobject)
 
     @property
     def kb_relative_information(self):
@@ -1757,7 +2182,7 @@ class Evaluation(JavaObject):
         :return: the information
         :rtype: float
         """
-        return javabridge.call(self.jobject, "KBRelativeInformation", "()D")
+        return self._kb_relative_information(self.jobject)
 
     @property
     def sf_entropy_gain(self):
@@ -1767,7 +2192,7 @@ class Evaluation(JavaObject):
         :return: the gain
         :rtype: float
         """
-        return javabridge.call(self.jobject, "SFEntropyGain", "()D")
+        return self._sf_entropy_gain(self.jobject)
 
     @property
     def sf_mean_entropy_gain(self):
@@ -1777,7 +2202,7 @@ class Evaluation(JavaObject):
         :return: the gain
         :rtype: float
         """
-        return javabridge.call(self.jobject, "SFMeanEntropyGain", "()D")
+        return self._sf_mean_entropy_gain(self.jobject)
 
     @property
     def sf_mean_prior_entropy(self):
@@ -1787,7 +2212,7 @@ class Evaluation(JavaObject):
         :return: the entropy
         :rtype: float
         """
-        return javabridge.call(self.jobject, "SFMeanPriorEntropy", "()D")
+        return self._sf_mean_prior_entropy(self.jobject)
 
     @property
     def sf_mean_scheme_entropy(self):
@@ -1797,7 +2222,7 @@ class Evaluation(JavaObject):
         :return: the entropy
         :rtype: float
         """
-        return javabridge.call(self.jobject, "SFMeanSchemeEntropy", "()D")
+        return self._sf_mean_scheme_entropy(self.jobject)
 
     @property
     def class_priors(self):
@@ -1807,7 +2232,7 @@ class Evaluation(JavaObject):
         :return: the priors
         :rtype: ndarray
         """
-        return javabridge.get_env().get_double_array_elements(javabridge.call(self.jobject, "getClassPriors", "()[D"))
+        return javabridge.get_env().get_double_array_elements(self._get_class_priors(self.jobject))
 
     @class_priors.setter
     def class_priors(self, data):
@@ -1817,7 +2242,7 @@ class Evaluation(JavaObject):
         :param data: the dataset to derive the priors from
         :type data: Instances
         """
-        javabridge.call(self.jobject, "setClassPriors", "(Lweka/core/Instances;)V", data)
+        self._set_class_priors(self.jobject, data)
 
     @property
     def header(self):
@@ -1827,7 +2252,7 @@ class Evaluation(JavaObject):
         :return: the header format
         :rtype: Instances
         """
-        return Instances(javabridge.call(self.jobject, "getHeader", "()Lweka/core/Instances;"))
+        return Instances(self._get_header(self.jobject))
 
     @property
     def discard_predictions(self):
@@ -1837,7 +2262,7 @@ class Evaluation(JavaObject):
         :return: True if to discard
         :rtype: bool
         """
-        return javabridge.call(self.jobject, "getDiscardPredictions", "()Z")
+        return self._get_discard_predictions(self.jobject)
 
     @discard_predictions.setter
     def discard_predictions(self, discard):
@@ -1847,7 +2272,7 @@ class Evaluation(JavaObject):
         :param discard: True if to discard predictions
         :type discard: bool
         """
-        javabridge.call(self.jobject, "setDiscardPredictions", "(Z)V", discard)
+        self._set_discard_predictions(self.jobject, discard)
 
     @property
     def predictions(self):
@@ -1858,7 +2283,7 @@ class Evaluation(JavaObject):
         :rtype: list
         """
         preds = javabridge.get_collection_wrapper(
-            javabridge.call(self.jobject, "predictions", "()Ljava/util/ArrayList;"))
+            self._predictions(self.jobject))
         if self.discard_predictions:
             result = None
         else:
@@ -1872,6 +2297,68 @@ class Evaluation(JavaObject):
                     result.append(Prediction(pred))
         return result
 
+    def metrics(self, names=None):
+        """
+        Returns the values of the specified metrics, retrieved with a single call. Scalar metrics (see
+        EVALUATION_METRICS) are returned as float, per-class metrics (see EVALUATION_CLASS_METRICS) as
+        numpy array with one value per class label (empty for numeric classes). Metrics that cannot be
+        computed are NaN.
+
+        :param names: the names of the metrics (ie the names of the properties/methods), None for all
+        :type names: list
+        :return: the dictionary of metric name and value(s)
+        :rtype: dict
+        """
+        if names is None:
+            names = sorted(EVALUATION_METRICS.keys()) + sorted(EVALUATION_CLASS_METRICS.keys())
+        unknown = [name for name in names if (name not in EVALUATION_METRICS) and (name not in EVALUATION_CLASS_METRICS)]
+        if len(unknown) > 0:
+            raise Exception("Unknown metric(s): " + ", ".join(unknown))
+        scalar = [name for name in names if name in EVALUATION_METRICS]
+        per_class = [name for name in names if name in EVALUATION_CLASS_METRICS]
+        values = javabridge.get_env().get_double_array_elements(
+            javabridge.static_call(
+                "weka/classifiers/EvaluationHelper", "metrics",
+                "(Lweka/classifiers/Evaluation;[Ljava/lang/String;[Ljava/lang/String;)[D",
+                self.jobject,
+                arrays.string_list_to_array([EVALUATION_METRICS[name] for name in scalar]),
+                arrays.string_list_to_array([EVALUATION_CLASS_METRICS[name] for name in per_class])))
+        result = {}
+        for i, name in enumerate(scalar):
+            result[name] = float(values[i])
+        num_classes = (len(values) - len(scalar)) // max(1, len(per_class))
+        for i, name in enumerate(per_class):
+            offset = len(scalar) + i * num_classes
+            result[name] = values[offset:offset + num_classes]
+        return result
+
+    def predictions_array(self):
+        """
+        Returns the predictions as numpy arrays, transferred with a single call: actual values, predicted
+        values, weights and, for nominal classes, the class distributions (rows x classes; None for numeric
+        classes). Missing values are represented by NaN.
+
+        :return: tuple of actual, predicted, weights and distributions, None if predictions were discarded
+        :rtype: tuple
+        """
+        values = javabridge.static_call(
+            "weka/classifiers/EvaluationHelper", "predictionsToArray", "(Lweka/classifiers/Evaluation;)[D",
+            self.jobject)
+        if values is None:
+            return None
+        header = self.header
+        if header.class_attribute.is_nominal:
+            num_cols = 3 + header.class_attribute.num_values
+        else:
+            num_cols = 3
+        values = javabridge.get_env().get_double_array_elements(values)
+        values = values.reshape((len(values) // num_cols, num_cols))
+        if num_cols > 3:
+            dists = values[:, 3:]
+        else:
+            dists = None
+        return values[:, 0], values[:, 1], values[:, 2], dists
+
     @classmethod
     def evaluate_model(cls, classifier, args):
         """
@@ -1890,6 +2377,40 @@ class Evaluation(JavaObject):
             classifier.jobject, args)
 
 
+class AggregateableEvaluation(Evaluation):
+    """
+    Evaluation that can aggregate the statistics of other Evaluation objects, e.g., the ones
+    generated for the separate folds of a cross-validation.
+    """
+
+    def __init__(self, evaluation):
+        """
+        Initializes the aggregateable evaluation using the settings (header, priors, cost matrix)
+        of the provided evaluation.
+
+        :param evaluation: the evaluation to initialize with
+        :type evaluation: Evaluation
+        """
+        if isinstance(evaluation, JavaObject):
+            evaluation = evaluation.jobject
+        self.wrapper = None
+        jobject = javabridge.make_instance(
+            "weka/classifiers/AggregateableEvaluation", "(Lweka/classifiers/Evaluation;)V",
+            evaluation)
+        super(Evaluation, self).__init__(jobject)
+
+    def aggregate(self, evaluation):
+        """
+        Adds the statistics of the evaluation to the ones of this evaluation.
+
+        :param evaluation: the evaluation to aggregate (Evaluation or JB_Object)
+        :type evaluation: Evaluation
+        """
+        if isinstance(evaluation, JavaObject):
+            evaluation = evaluation.jobject
+        javabridge.call(self.jobject, "aggregate", "(Lweka/classifiers/Evaluation;)V", evaluation)
+
+
 class PredictionOutput(OptionHandler):
     """
     For collecting predictions and generating output from.
@@ -2008,20 +2529,37 @@ class PredictionOutput(OptionHandler):
 
 def predictions_to_instances(data, preds):
     """
-    Turns the predictions turned into an Instances object.
+    Turns the predictions turned into an Instances object. In case of an Evaluation object, the
+    predictions get retrieved with a single call (see Evaluation.predictions_array). The dataset
+    gets populated in bulk.
 
     :param data: the original dataset format
     :type data: Instances
-    :param preds: the predictions to convert
-    :type preds: list
+    :param preds: the predictions to convert or the Evaluation object to obtain them from
+    :type preds: list or Evaluation
     :return: the predictions, None if no predictions present
     :rtype: Instances
     """
-    if len(preds) == 0:
+    if isinstance(preds, Evaluation):
+        arrays = preds.predictions_array()
+        if arrays is None:
+            return None
+        actual, predicted, weight, dists = arrays
+        is_numeric = dists is None
+    else:
+        if (preds is None) or (len(preds) == 0):
+            return None
+        is_numeric = isinstance(preds[0], NumericPrediction)
+        actual = array([pred.actual for pred in preds])
+        predicted = array([pred.predicted for pred in preds])
+        weight = array([pred.weight for pred in preds])
+        if is_numeric:
+            dists = None
+        else:
+            dists = array([pred.distribution for pred in preds])
+    if len(actual) == 0:
         return None
 
-    is_numeric = isinstance(preds[0], NumericPrediction)
-
     # create header
     atts = []
     if is_numeric:
@@ -2040,24 +2578,15 @@ def predictions_to_instances(data, preds):
         for i in xrange(data.class_attribute.num_values):
             atts.append(Attribute.create_numeric("distribution-" + data.class_attribute.value(i)))
 
-    result = Instances.create_instances("Predictions", atts, len(preds))
+    result = Instances.create_instances("Predictions", atts, len(actual))
 
-    count = 0
-    for pred in preds:
-        count += 1
-        if is_numeric:
-            values = array([count, pred.weight, pred.actual, pred.predicted, pred.error])
-        else:
-            if pred.actual == pred.predicted:
-                error = 0.0
-            else:
-                error = 1.0
-            l = [count, pred.weight, pred.actual, pred.predicted, error, max(pred.distribution)]
-            for i in xrange(data.class_attribute.num_values):
-                l.append(pred.distribution[i])
-            values = array(l)
-        inst = Instance.create_instance(values)
-        result.add_instance(inst)
+    index = arange(1, len(actual) + 1, dtype=float64)
+    if is_numeric:
+        values = column_stack((index, weight, actual, predicted, predicted - actual))
+    else:
+        error = where(actual == predicted, 0.0, 1.0)
+        values = column_stack((index, weight, actual, predicted, error, dists.max(axis=1), dists))
+    result.add_ndarray(values)
 
     return result
 
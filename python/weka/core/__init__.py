@@ -21,3 +21,19 @@ try:
     scipy_available = True
 except ImportError:
     pass
+
+# check whether pyarrow is there
+pyarrow_available = False
+try:
+    import pyarrow
+    pyarrow_available = True
+except ImportError:
+    pass
+
+# check whether pandas is there
+pandas_available = False
+try:
+    import pandas
+    pandas_available = True
+except ImportError:
+    pass
@@ -23,7 +23,7 @@ import re
 import types
 import javabridge
 from javabridge import JWrapper, JClassWrapper
-from javabridge.jutil import JavaException
+from javabridge.jutil import JavaException, get_nice_arg, get_nice_result
 from weka.core import types as arrays
 import weka.core.jvm as jvm
 
@@ -159,6 +159,8 @@ class JSONObject(object):
     Ancestor for classes that can be represented as JSON and restored from JSON.
     """
 
+    __slots__ = ()
+
     def to_dict(self):
         """
         Returns a dictionary that represents this object, to be used for JSONification.
@@ -228,8 +230,6 @@ class Configurable(JSONObject):
         self._config = self.fix_config({})
         if config is not None:
             self.config = config
-        if not has_dict_handler("Configurable"):
-            register_dict_handler("Configurable", Configurable.from_dict)
 
     def __repr__(self):
         """
@@ -382,11 +382,121 @@ class Configurable(JSONObject):
         print(self.generate_help())
 
 
+register_dict_handler("Configurable", Configurable.from_dict)
+
+
+# the cache of method handles: (classname, name, signature) -> MethodHandle
+method_handles = {}
+
+
+class MethodHandle(object):
+    """
+    Lazily resolved (and then cached) JNI method ID of an instance method of a Java class or interface,
+    avoiding the GetMethodID lookup on every call that javabridge.call and javabridge.make_call perform.
+    Handles are meant to be created once (e.g., as class attributes of wrappers, see get_method_handle)
+    and can be used with any object of the class. Python objects (eg strings or lists) supplied for
+    object parameters get converted like javabridge.call does, Java strings get returned as Python strings.
+    """
+
+    def __init__(self, classname, name, signature):
+        """
+        Initializes the handle.
+
+        :param classname: the classname in JNI notation (eg weka/core/Instance)
+        :type classname: str
+        :param name: the name of the method
+        :type name: str
+        :param signature: the JNI signature of the method (eg "(I)D")
+        :type signature: str
+        """
+        self.classname = classname
+        self.name = name
+        self.signature = signature
+        self.method_id = None
+        args = split_signature(signature[1:signature.index(")")])
+        self.object_args = [(i, arg) for i, arg in enumerate(args) if arg[0] in "L["]
+        self.result = signature[signature.index(")") + 1:]
+
+    def __call__(self, jobject, *args):
+        """
+        Calls the method on the Java object.
+
+        :param jobject: the Java object to call the method on
+        :type jobject: JB_Object
+        :param args: the arguments for the method
+        :return: the result of the method call
+        """
+        env = javabridge.get_env()
+        if self.method_id is None:
+            self.method_id = env.get_method_id(env.find_class(self.classname), self.name, self.signature)
+            if self.method_id is None:
+                if env.exception_occurred() is not None:
+                    env.exception_clear()
+                raise Exception("Method not found: " + self.classname + "." + self.name + self.signature)
+        if len(self.object_args) > 0:
+            args = list(args)
+            for i, sig in self.object_args:
+                if (args[i] is not None) and not isinstance(args[i], javabridge.JB_Object):
+                    args[i] = get_nice_arg(args[i], sig)
+        result = env.call_method(jobject, self.method_id, *args)
+        x = env.exception_occurred()
+        if x is not None:
+            raise JavaException(x)
+        if (result is not None) and (self.result == "Ljava/lang/String;"):
+            return env.get_string_utf(result)
+        if self.result == "Ljava/lang/Object;":
+            return get_nice_result(result, self.result)
+        return result
+
+
+def split_signature(sig):
+    """
+    Splits the JNI signature of the arguments (without parentheses) into the individual types.
+
+    :param sig: the signature, eg "ILjava/lang/String;[D"
+    :type sig: str
+    :return: the list of types
+    :rtype: list
+    """
+    result = []
+    i = 0
+    while i < len(sig):
+        start = i
+        while sig[i] == "[":
+            i += 1
+        if sig[i] == "L":
+            i = sig.index(";", i)
+        i += 1
+        result.append(sig[start:i])
+    return result
+
+
+def get_method_handle(classname, name, signature):
+    """
+    Returns the cached handle for the method, creating it if necessary.
+
+    :param classname: the classname in JNI notation (eg weka/core/Instance)
+    :type classname: str
+    :param name: the name of the method
+    :type name: str
+    :param signature: the JNI signature of the method (eg "(I)D")
+    :type signature: str
+    :return: the handle
+    :rtype: MethodHandle
+    """
+    key = (classname, name, signature)
+    if key not in method_handles:
+        method_handles[key] = MethodHandle(classname, name, signature)
+    return method_handles[key]
+
+
 class JavaObject(JSONObject):
     """
     Basic Java object.
     """
-    
+
+    __slots__ = ("jobject",)
+
     def __init__(self, jobject):
         """
         Initializes the wrapper with the specified Java object.
@@ -397,8 +507,6 @@ class JavaObject(JSONObject):
         if jobject is None:
             raise Exception("No Java object supplied!")
         self.jobject = jobject
-        if not has_dict_handler("JavaObject"):
-            register_dict_handler("JavaObject", JavaObject.from_dict)
 
     def __str__(self):
         """
@@ -593,6 +701,9 @@ class JavaObject(JSONObject):
             return None
 
 
+register_dict_handler("JavaObject", JavaObject.from_dict)
+
+
 class JavaArrayIterator(object):
     """
     Iterator for elements in a Java array.
@@ -903,8 +1014,6 @@ class OptionHandler(JavaObject, Configurable):
         self._logger = None
         self._help = {}
         self._config = self.fix_config({})
-        if not has_dict_handler("OptionHandler"):
-            register_dict_handler("OptionHandler", OptionHandler.from_dict)
 
     def global_info(self):
         """
@@ -1024,6 +1133,9 @@ class OptionHandler(JavaObject, Configurable):
         return result
 
 
+register_dict_handler("OptionHandler", OptionHandler.from_dict)
+
+
 class SingleIndex(JavaObject):
     """
     Wrapper for a Weka SingleIndex object.
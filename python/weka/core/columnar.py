@@ -0,0 +1,514 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# columnar.py
+# Copyright (C) 2016 Fracpete (pythonwekawrapper at gmail dot com)
+
+import copy
+import json
+import numpy
+import os
+from weka.core.dataset import Instances, Attribute
+
+FORMAT_VERSION = 1
+"""the version of the columnar format"""
+
+HEADER_FILE = "header.arff"
+"""the file containing the ARFF header"""
+
+META_FILE = "meta.json"
+"""the file containing the meta-data (attribute types, dictionaries, etc)"""
+
+WEIGHTS_FILE = "weights.bin"
+"""the file containing the weights of the rows"""
+
+
+def column_file(index):
+    """
+    Returns the name of the file for the specified column.
+
+    :param index: the 0-based index of the column
+    :type index: int
+    :return: the filename
+    :rtype: str
+    """
+    return "col-" + str(index) + ".bin"
+
+
+def _batches(data, batch_size):
+    """
+    Returns an iterable over the batches of the data to save.
+
+    :param data: the dataset, the loader (in incremental mode) or iterable of datasets
+    :type data: Instances or Loader or iterable
+    :param batch_size: the maximum number of rows per batch when reading from a loader
+    :type batch_size: int
+    :return: the batches
+    :rtype: iterable
+    """
+    from weka.core.converters import Loader
+    if isinstance(data, Instances):
+        return [data]
+    if isinstance(data, Loader):
+        return data.iter_batches(batch_size=batch_size)
+    return data
+
+
+def save_columnar(data, directory, class_index=None, batch_size=1000):
+    """
+    Saves the data in the binary columnar format in the specified directory (gets created if
+    necessary). The directory contains the header as ARFF file, a JSON file with the meta-data
+    (number of rows, attribute types, class index, label and string dictionaries) and each column
+    as raw binary file: float64 for numeric and date attributes (missing values as NaN), int32 for
+    nominal and string attributes (indices in the dictionaries, missing values as -1). Relational
+    attributes are not supported.
+    The data can be a dataset, a loader in incremental mode (see Loader.load_file) or an iterable of
+    datasets with the same structure (eg Loader.iter_batches), i.e., the data does not have to fit
+    into the JVM's heap. Each batch gets appended to the column files, one column at a time.
+
+    :param data: the dataset, the loader or the iterable of datasets to save
+    :type data: Instances or Loader or iterable
+    :param directory: the directory to save the data in
+    :type directory: str
+    :param class_index: the 0-based class index to store, None to use the one of the first batch
+    :type class_index: int
+    :param batch_size: the maximum number of rows per batch when reading from a loader
+    :type batch_size: int
+    """
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+
+    meta = None
+    header = None
+    strings = None
+    files = []
+    try:
+        for batch in _batches(data, batch_size):
+            if meta is None:
+                header = Instances.template_instances(batch, 0)
+                if class_index is None:
+                    class_index = batch.class_index
+                meta = {
+                    "version": FORMAT_VERSION,
+                    "relation": batch.relationname,
+                    "num_instances": 0,
+                    "class_index": class_index,
+                    "columns": []}
+                strings = {}
+                for i in xrange(batch.num_attributes):
+                    att = batch.attribute(i)
+                    if att.is_relation_valued:
+                        raise Exception("Relational attributes are not supported: " + att.name)
+                    if att.is_nominal:
+                        typ = "nominal"
+                        dictionary = att.values
+                    elif att.is_string:
+                        typ = "string"
+                        dictionary = []
+                        strings[i] = {}
+                    elif att.is_date:
+                        typ = "date"
+                        dictionary = None
+                    else:
+                        typ = "numeric"
+                        dictionary = None
+                    if dictionary is None:
+                        dtype = numpy.float64
+                    else:
+                        dtype = numpy.int32
+                    meta["columns"].append({
+                        "name": att.name,
+                        "type": typ,
+                        "dtype": numpy.dtype(dtype).name,
+                        "file": column_file(i),
+                        "dictionary": dictionary})
+                    files.append(open(os.path.join(directory, column_file(i)), "wb"))
+                files.append(open(os.path.join(directory, WEIGHTS_FILE), "wb"))
+            elif batch.num_attributes != len(meta["columns"]):
+                raise Exception("Batch has different number of attributes: "
+                                + str(batch.num_attributes) + " != " + str(len(meta["columns"])))
+
+            for i, col in enumerate(meta["columns"]):
+                values = batch.column(i)
+                if col["dictionary"] is not None:
+                    if i in strings:
+                        # the indices refer to the strings of the batch's header
+                        lookup = strings[i]
+                        for s in batch.attribute(i).values or []:
+                            if s not in lookup:
+                                lookup[s] = len(col["dictionary"])
+                                col["dictionary"].append(s)
+                        mapping = numpy.array(
+                            [lookup[s] for s in batch.attribute(i).values or []], dtype=numpy.int32)
+                        present = ~numpy.isnan(values)
+                        values[present] = mapping[values[present].astype(numpy.int32)]
+                    values = numpy.where(numpy.isnan(values), -1, values)
+                values.astype(col["dtype"]).tofile(files[i])
+            batch.weights().astype(numpy.float64).tofile(files[-1])
+            meta["num_instances"] += batch.num_instances
+    finally:
+        for f in files:
+            f.close()
+
+    if meta is None:
+        raise Exception("No data to save!")
+    with open(os.path.join(directory, HEADER_FILE), "w") as f:
+        f.write(str(header))
+    with open(os.path.join(directory, META_FILE), "w") as f:
+        json.dump(meta, f, sort_keys=True, indent=2, separators=(',', ': '))
+
+
+def _map_file(filename, dtype, length, mmap_mode):
+    """
+    Memory-maps the raw binary file.
+
+    :param filename: the file to map
+    :type filename: str
+    :param dtype: the numpy type of the values
+    :type dtype: str
+    :param length: the number of values in the file
+    :type length: int
+    :param mmap_mode: the numpy mode for memory-mapping, eg "r" or "r+"
+    :type mmap_mode: str
+    :return: the memory-mapped array
+    :rtype: ndarray
+    """
+    if length == 0:
+        # empty files cannot be mapped
+        return numpy.zeros(0, dtype=dtype)
+    return numpy.memmap(filename, dtype=dtype, mode=mmap_mode, shape=(length,))
+
+
+class MappedInstances(object):
+    """
+    Lazy view on a dataset stored in the columnar format (see save_columnar). The columns are
+    memory-mapped and only the rows that are actually needed get materialized as Instances.
+    Slicing, randomizing and generating cross-validation folds create views that share the
+    memory-mapped columns.
+    """
+
+    def __init__(self, directory, mmap_mode="r"):
+        """
+        Opens the dataset stored in the directory.
+
+        :param directory: the directory with the columnar data
+        :type directory: str
+        :param mmap_mode: the numpy mode for memory-mapping the columns, eg "r" or "r+"
+        :type mmap_mode: str
+        """
+        from weka.core.converters import Loader
+        with open(os.path.join(directory, META_FILE), "r") as f:
+            meta = json.load(f)
+        if meta["version"] != FORMAT_VERSION:
+            raise Exception("Unsupported version of columnar format: " + str(meta["version"]))
+        self.directory = directory
+        self.meta = meta
+        loader = Loader(classname="weka.core.converters.ArffLoader")
+        self.header = loader.load_file(os.path.join(directory, HEADER_FILE))
+        self._class_index = meta["class_index"]
+        length = meta["num_instances"]
+        self._columns = []
+        for col in meta["columns"]:
+            self._columns.append(_map_file(os.path.join(directory, col["file"]), col["dtype"], length, mmap_mode))
+        self._weights = _map_file(os.path.join(directory, WEIGHTS_FILE), "float64", length, mmap_mode)
+        self._rows = None
+
+    def __len__(self):
+        """
+        Returns the number of rows in this view.
+
+        :return: the number of rows
+        :rtype: int
+        """
+        return self.num_instances
+
+    def __getitem__(self, key):
+        """
+        Returns a view for the specified rows (slice, list/array of indices or boolean mask) or, for a
+        single integer index, the internal values of the row.
+
+        :param key: the row(s) to return
+        :type key: int or slice or list or ndarray
+        :return: the view or the values of the row
+        :rtype: MappedInstances or ndarray
+        """
+        if isinstance(key, (int, long, numpy.integer)):
+            return self.to_numpy(rows=[key])[0]
+        return self.view(self.indices()[key])
+
+    def __str__(self):
+        """
+        Returns a short description of the view.
+
+        :return: the description
+        :rtype: str
+        """
+        return "MappedInstances(" + self.directory + ", relation=" + self.relationname \
+               + ", rows=" + str(self.num_instances) + ", attributes=" + str(self.num_attributes) + ")"
+
+    @property
+    def relationname(self):
+        """
+        Returns the name of the dataset.
+
+        :return: the name
+        :rtype: str
+        """
+        return self.meta["relation"]
+
+    @property
+    def num_attributes(self):
+        """
+        Returns the number of attributes.
+
+        :return: the number of attributes
+        :rtype: int
+        """
+        return len(self._columns)
+
+    @property
+    def num_instances(self):
+        """
+        Returns the number of rows in this view.
+
+        :return: the number of rows
+        :rtype: int
+        """
+        if self._rows is None:
+            return self.meta["num_instances"]
+        else:
+            return len(self._rows)
+
+    @property
+    def class_index(self):
+        """
+        Returns the currently set class index (0-based) of this view.
+
+        :return: the class index, -1 if not set
+        :rtype: int
+        """
+        return self._class_index
+
+    @class_index.setter
+    def class_index(self, index):
+        """
+        Sets the class index (0-based) of this view, other views are not affected.
+
+        :param index: the new index, use -1 to unset
+        :type index: int
+        """
+        self._class_index = index
+
+    def attribute(self, index):
+        """
+        Returns the specified attribute.
+
+        :param index: the 0-based index of the attribute
+        :type index: int
+        :return: the attribute
+        :rtype: Attribute
+        """
+        return self.header.attribute(index)
+
+    def dictionary(self, index):
+        """
+        Returns the labels/strings of a nominal/string column.
+
+        :param index: the 0-based index of the column
+        :type index: int
+        :return: the labels/strings, None if neither nominal nor string
+        :rtype: list
+        """
+        return self.meta["columns"][index]["dictionary"]
+
+    def indices(self):
+        """
+        Returns the indices of the rows of this view in the stored dataset.
+
+        :return: the row indices
+        :rtype: ndarray
+        """
+        if self._rows is None:
+            return numpy.arange(self.meta["num_instances"])
+        else:
+            return self._rows
+
+    def view(self, rows):
+        """
+        Returns a view for the specified rows of the stored dataset, sharing the memory-mapped columns.
+
+        :param rows: the 0-based indices of the rows in the stored dataset
+        :type rows: list or ndarray
+        :return: the view
+        :rtype: MappedInstances
+        """
+        result = copy.copy(self)
+        result._rows = numpy.asarray(rows, dtype=numpy.int64)
+        return result
+
+    def _select(self, array, rows=None):
+        """
+        Returns the selected rows from the memory-mapped array.
+
+        :param array: the memory-mapped array
+        :type array: ndarray
+        :param rows: the 0-based rows of the view to retrieve, None for all
+        :type rows: slice or list or ndarray
+        :return: the values
+        :rtype: ndarray
+        """
+        if rows is None:
+            if self._rows is None:
+                return numpy.array(array)
+            return array[self._rows]
+        return array[self.indices()[rows]]
+
+    def column(self, index, rows=None):
+        """
+        Returns the internal values of the column for this view as float64 values, missing values are NaN.
+
+        :param index: the 0-based index of the column
+        :type index: int
+        :param rows: the 0-based rows of the view to retrieve, None for all
+        :type rows: slice or list or ndarray
+        :return: the values
+        :rtype: ndarray
+        """
+        values = self._select(self._columns[index], rows)
+        if values.dtype == numpy.int32:
+            values = numpy.where(values < 0, numpy.nan, values)
+        return values.astype(numpy.float64)
+
+    def weights(self, rows=None):
+        """
+        Returns the weights of the rows of this view.
+
+        :param rows: the 0-based rows of the view to retrieve, None for all
+        :type rows: slice or list or ndarray
+        :return: the weights
+        :rtype: ndarray
+        """
+        return self._select(self._weights, rows)
+
+    def to_numpy(self, indices=None, rows=None):
+        """
+        Returns the internal values as numpy matrix (rows x columns).
+
+        :param indices: the 0-based indices of the attributes to return, None for all
+        :type indices: list or ndarray
+        :param rows: the 0-based rows of the view to retrieve, None for all
+        :type rows: slice or list or ndarray
+        :return: the matrix
+        :rtype: ndarray
+        """
+        if indices is None:
+            indices = range(self.num_attributes)
+        if len(indices) == 0:
+            return numpy.zeros((len(self._select(self._weights, rows)), 0))
+        return numpy.column_stack([self.column(i, rows) for i in indices])
+
+    def randomize(self, seed=1):
+        """
+        Returns a view with the rows in random order. Uses numpy's random number generator, i.e., the
+        order differs from Weka's randomize method.
+
+        :param seed: the seed value for the random number generator
+        :type seed: int
+        :return: the randomized view
+        :rtype: MappedInstances
+        """
+        return self.view(numpy.random.RandomState(seed).permutation(self.indices()))
+
+    def _fold_bounds(self, num_folds, fold):
+        """
+        Returns the start and end of the test fold, using the same fold sizes as Weka.
+
+        :param num_folds: the number of folds
+        :type num_folds: int
+        :param fold: the 0-based fold
+        :type fold: int
+        :return: tuple of start (incl) and end (excl)
+        :rtype: tuple
+        """
+        if num_folds < 2:
+            raise Exception("Number of folds must be at least 2!")
+        if num_folds > self.num_instances:
+            raise Exception("Can't have more folds than instances!")
+        num = self.num_instances // num_folds
+        rest = self.num_instances % num_folds
+        if fold < rest:
+            num += 1
+            offset = fold * num
+        else:
+            offset = fold * num + rest
+        return offset, offset + num
+
+    def train_cv(self, num_folds, fold):
+        """
+        Returns a view of the training fold for cross-validation (like Weka's trainCV, without randomization).
+
+        :param num_folds: the number of folds of cross-validation, eg 10
+        :type num_folds: int
+        :param fold: the current fold (0-based)
+        :type fold: int
+        :return: the training fold
+        :rtype: MappedInstances
+        """
+        start, end = self._fold_bounds(num_folds, fold)
+        rows = self.indices()
+        return self.view(numpy.concatenate([rows[:start], rows[end:]]))
+
+    def test_cv(self, num_folds, fold):
+        """
+        Returns a view of the test fold for cross-validation (like Weka's testCV).
+
+        :param num_folds: the number of folds of cross-validation, eg 10
+        :type num_folds: int
+        :param fold: the current fold (0-based)
+        :type fold: int
+        :return: the test fold
+        :rtype: MappedInstances
+        """
+        start, end = self._fold_bounds(num_folds, fold)
+        return self.view(self.indices()[start:end])
+
+    def to_instances(self, rows=None):
+        """
+        Materializes the rows of this view as Instances object.
+
+        :param rows: the 0-based rows of the view to materialize, None for all
+        :type rows: slice or list or ndarray
+        :return: the dataset
+        :rtype: Instances
+        """
+        matrix = self.to_numpy(rows=rows)
+        atts = []
+        for i in xrange(self.num_attributes):
+            att = self.header.attribute(i)
+            if att.is_string:
+                # fresh attribute, only containing the strings that are needed
+                att = Attribute.create_string(att.name)
+                strings = self.dictionary(i)
+                col = matrix[:, i]
+                present = ~numpy.isnan(col)
+                needed, inverse = numpy.unique(col[present].astype(numpy.int32), return_inverse=True)
+                mapping = numpy.array([att.add_string_value(strings[n]) for n in needed], dtype=numpy.float64)
+                if len(needed) > 0:
+                    col[present] = mapping[inverse]
+            else:
+                att = att.copy()
+            atts.append(att)
+        result = Instances.create_instances(self.relationname, atts, len(matrix))
+        result.add_ndarray(matrix, weights=self.weights(rows))
+        result.class_index = self.class_index
+        return result
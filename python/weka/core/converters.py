@@ -15,11 +15,15 @@
 # Copyright (C) 2014-2015 Fracpete (pythonwekawrapper at gmail dot com)
 
 import javabridge
+import weka.core
 from weka.core.classes import OptionHandler
 from weka.core.capabilities import Capabilities
 from weka.core.dataset import Instances, Instance, Attribute
+import csv
+import itertools
 import numpy
 import os
+import re
 
 
 class Loader(OptionHandler):
@@ -57,6 +61,25 @@ class Loader(OptionHandler):
             raise Exception("Not in incremental mode, cannot iterate!")
         return IncrementalLoaderIterator(self, self.structure)
 
+    def iter_batches(self, batch_size=1000, as_ndarray=False):
+        """
+        Returns an iterator over batches of rows in case the loader was instantiated in incremental mode,
+        otherwise an Exception is raised. Each batch is read with a single call.
+
+        :param batch_size: the maximum number of rows per batch
+        :type batch_size: int
+        :param as_ndarray: whether to return the batches as numpy matrices (rows x columns) of internal
+                           values rather than as Instances objects
+        :type as_ndarray: bool
+        :return: the iterator
+        :rtype: IncrementalLoaderBatchIterator
+        """
+        if not self.incremental:
+            raise Exception("Not in incremental mode, cannot iterate!")
+        if batch_size < 1:
+            raise Exception("Batch size must be at least 1: " + str(batch_size))
+        return IncrementalLoaderBatchIterator(self, self.structure, batch_size, as_ndarray)
+
     def load_file(self, dfile, incremental=False):
         """
         Loads the specified file and returns the Instances object.
@@ -146,6 +169,58 @@ class IncrementalLoaderIterator(object):
             return Instance(result)
 
 
+class IncrementalLoaderBatchIterator(object):
+    """
+    Iterator for batches of dataset rows when loading incrementally.
+    """
+    def __init__(self, loader, structure, batch_size, as_ndarray):
+        """
+        :param loader: the loader instance to use for loading the data incrementally
+        :type loader: Loader
+        :param structure: the dataset structure
+        :type structure: Instances
+        :param batch_size: the maximum number of rows per batch
+        :type batch_size: int
+        :param as_ndarray: whether to return numpy matrices instead of Instances objects
+        :type as_ndarray: bool
+        """
+        self.loader = loader
+        self.structure = structure
+        self.batch_size = batch_size
+        self.as_ndarray = as_ndarray
+
+    def __iter__(self):
+        """
+        Returns itself.
+        """
+        return self
+
+    def next(self):
+        """
+        Reads the next batch of rows.
+
+        :return: the next batch
+        :rtype: Instances or ndarray
+        """
+        if self.as_ndarray:
+            values = javabridge.get_env().get_double_array_elements(
+                javabridge.static_call(
+                    "weka/core/converters/LoaderHelper", "nextBatchArray",
+                    "(Lweka/core/converters/Loader;Lweka/core/Instances;I)[D",
+                    self.loader.jobject, self.structure.jobject, self.batch_size))
+            if len(values) == 0:
+                raise StopIteration()
+            return values.reshape((len(values) // self.structure.num_attributes, self.structure.num_attributes))
+        else:
+            result = javabridge.static_call(
+                "weka/core/converters/LoaderHelper", "nextBatch",
+                "(Lweka/core/converters/Loader;Lweka/core/Instances;I)Lweka/core/Instances;",
+                self.loader.jobject, self.structure.jobject, self.batch_size)
+            if result is None:
+                raise StopIteration()
+            return Instances(result)
+
+
 class TextDirectoryLoader(OptionHandler):
     """
     Wrapper class for TextDirectoryLoader.
@@ -296,9 +371,58 @@ def save_any_file(data, filename):
         return True
 
 
-def ndarray_to_instances(array, relation, att_template="Att-#", att_list=None):
+def read_parquet(filename, columns=None, relation=None, class_index=None, weights_column=None):
+    """
+    Reads the Parquet file into an Instances object, via a pyarrow Table (see Instances.from_arrow).
+    Requires pyarrow.
+
+    :param filename: the Parquet file to read
+    :type filename: str
+    :param columns: the names of the columns to read, None for all
+    :type columns: list
+    :param relation: the name of the dataset, None to use the metadata or "arrow"
+    :type relation: str
+    :param class_index: the 0-based index of the class attribute, None to use the metadata
+    :type class_index: int
+    :param weights_column: the name of the column with the weights, None to use the metadata
+    :type weights_column: str
+    :return: the dataset
+    :rtype: Instances
+    """
+    if not weka.core.pyarrow_available:
+        raise Exception("pyarrow is not available!")
+    import pyarrow.parquet
+    if not os.path.exists(filename):
+        raise Exception("Dataset file does not exist: " + str(filename))
+    table = pyarrow.parquet.read_table(filename, columns=columns)
+    return Instances.from_arrow(table, relation=relation, class_index=class_index, weights_column=weights_column)
+
+
+def write_parquet(data, filename, weights_column=None, compression="snappy"):
+    """
+    Writes the Instances object to the Parquet file, via a pyarrow Table (see Instances.to_arrow).
+    Requires pyarrow.
+
+    :param data: the dataset to write
+    :type data: Instances
+    :param filename: the Parquet file to write to
+    :type filename: str
+    :param weights_column: the name of the column to store the weights in, None to omit the weights
+    :type weights_column: str
+    :param compression: the compression to use, eg snappy, gzip or none
+    :type compression: str
+    """
+    if not weka.core.pyarrow_available:
+        raise Exception("pyarrow is not available!")
+    import pyarrow.parquet
+    pyarrow.parquet.write_table(data.to_arrow(weights_column=weights_column), filename, compression=compression)
+
+
+def ndarray_to_instances(array, relation, att_template="Att-#", att_list=None, weights=None, nominal=None,
+                         missing=None):
     """
-    Converts the numpy matrix into an Instances object and returns it.
+    Converts the numpy matrix into an Instances object and returns it. The data gets transferred in
+    bulk rather than row by row. NaN values are treated as missing values.
 
     :param array: the numpy ndarray to convert
     :type array: numpy.darray
@@ -309,32 +433,312 @@ def ndarray_to_instances(array, relation, att_template="Att-#", att_list=None):
     :type att_template: str
     :param att_list: the list of attribute names to use
     :type att_list: list
+    :param weights: the weights of the rows, None for 1.0
+    :type weights: ndarray or list
+    :param nominal: the labels of nominal columns (0-based column index -> list of labels); the values
+                    in these columns are the 0-based indices of the labels
+    :type nominal: dict
+    :param missing: the boolean mask (same shape as array) that flags missing values
+    :type missing: ndarray
     :return: the generated instances object
     :rtype: Instances
     """
     if len(numpy.shape(array)) != 2:
         raise Exception("Number of array dimensions must be 2!")
     rows, cols = numpy.shape(array)
+    if nominal is None:
+        nominal = {}
 
     # header
     atts = []
     if att_list is not None:
         if len(att_list) != cols:
             raise Exception(
-                "Number columns and provided attribute names differ: " + str(cols) + " != " + len(att_list))
-        for name in att_list:
-            att = Attribute.create_numeric(name)
-            atts.append(att)
+                "Number columns and provided attribute names differ: " + str(cols) + " != " + str(len(att_list)))
+        names = att_list
     else:
+        names = []
         for i in xrange(cols):
-            name = att_template.replace("#", str(i+1)).replace("!", str(i)).replace("@", relation)
+            names.append(att_template.replace("#", str(i+1)).replace("!", str(i)).replace("@", relation))
+    for i, name in enumerate(names):
+        if i in nominal:
+            att = Attribute.create_nominal(name, nominal[i])
+        else:
             att = Attribute.create_numeric(name)
-            atts.append(att)
+        atts.append(att)
     result = Instances.create_instances(relation, atts, rows)
 
     # data
-    for i in xrange(rows):
-        inst = Instance.create_instance(array[i])
-        result.add_instance(inst)
+    result.add_ndarray(array, weights=weights, missing=missing)
 
     return result
+
+
+def _unquote(s):
+    """
+    Removes surrounding single or double quotes from the string.
+
+    :param s: the string to process
+    :type s: str
+    :return: the unquoted string
+    :rtype: str
+    """
+    if (len(s) > 1) and (s[0] == s[-1]) and (s[0] in "'\""):
+        return s[1:-1]
+    return s
+
+
+def _read_arff_header(f):
+    """
+    Reads the header of an ARFF file up to and including the @data line.
+
+    :param f: the file to read from
+    :type f: file
+    :return: tuple of relation name, attribute names and nominal labels (0-based index -> list of labels)
+    :rtype: tuple
+    """
+    relation = "data"
+    names = []
+    labels = {}
+    for line in f:
+        line = line.strip()
+        if (len(line) == 0) or line.startswith("%"):
+            continue
+        lower = line.lower()
+        if lower.startswith("@relation"):
+            relation = _unquote(line[len("@relation"):].strip())
+        elif lower.startswith("@attribute"):
+            match = re.match(r"@attribute\s+('[^']*'|\"[^\"]*\"|\S+)\s+(.*)$", line, re.IGNORECASE)
+            if match is None:
+                raise Exception("Failed to parse attribute definition: " + line)
+            name = _unquote(match.group(1))
+            atype = match.group(2).strip()
+            if atype.startswith("{"):
+                values = atype[1:atype.rindex("}")]
+                labels[len(names)] = [x.strip() for x in next(csv.reader([values], quotechar="'", skipinitialspace=True))]
+            elif atype.lower() not in ["numeric", "real", "integer"]:
+                raise Exception("Unsupported attribute type for attribute '" + name + "': " + atype)
+            names.append(name)
+        elif lower.startswith("@data"):
+            return relation, names, labels
+    raise Exception("No @data section found!")
+
+
+def _split_quoted(s, delimiter, stop=None):
+    """
+    Splits the string at the delimiter, ignoring delimiters within single or double quotes. The quotes are
+    kept, so quoted values can be told apart from unquoted ones.
+
+    :param s: the string to split
+    :type s: str
+    :param delimiter: the delimiter
+    :type delimiter: str
+    :param stop: the character that ends the list outside of quotes, None to process the whole string
+    :type stop: str
+    :return: tuple of the stripped tokens and the index of the stop character (length of string if not found)
+    :rtype: tuple
+    """
+    tokens = []
+    current = []
+    quote = None
+    i = 0
+    while i < len(s):
+        c = s[i]
+        if quote is not None:
+            current.append(c)
+            if (c == "\\") and (i + 1 < len(s)):
+                i += 1
+                current.append(s[i])
+            elif c == quote:
+                quote = None
+        elif c in "'\"":
+            quote = c
+            current.append(c)
+        elif c == delimiter:
+            tokens.append("".join(current).strip())
+            current = []
+        elif c == stop:
+            break
+        else:
+            current.append(c)
+        i += 1
+    tokens.append("".join(current).strip())
+    return tokens, i
+
+
+def _unquote_arff(s):
+    """
+    Removes the surrounding quotes from the ARFF value and resolves escaped characters.
+
+    :param s: the value to process
+    :type s: str
+    :return: the unquoted value
+    :rtype: str
+    """
+    if (len(s) > 1) and (s[0] == s[-1]) and (s[0] in "'\""):
+        return re.sub(r"\\(.)", lambda m: {"n": "\n", "r": "\r", "t": "\t"}.get(m.group(1), m.group(1)), s[1:-1])
+    return s
+
+
+def _split_arff_row(line, zeros):
+    """
+    Splits the row of an ARFF file into its values, taking quotes into account. Sparse rows get expanded
+    (using the values from zeros for the absent ones), instance weights get dropped.
+
+    :param line: the row to split
+    :type line: str
+    :param zeros: the values representing 0 for each attribute
+    :type zeros: list
+    :return: the (still quoted) values
+    :rtype: list
+    """
+    line = line.strip()
+    if line.startswith("{"):
+        result = list(zeros)
+        tokens, end = _split_quoted(line[1:], ",", stop="}")
+        for token in tokens:
+            if len(token) == 0:
+                continue
+            index, value = token.split(None, 1)
+            result[int(index)] = value.strip()
+        return result
+    result = _split_quoted(line, ",")[0]
+    if (len(result) == len(zeros) + 1) and result[-1].startswith("{"):
+        result = result[:-1]
+    return result
+
+
+def read_numeric(filename, chunk_size=10000, delimiter=",", missing="?", quotechar='"', nominal=None):
+    """
+    Reads an ARFF or CSV file (based on the file extension) directly into a numpy matrix (rows x columns)
+    of internal values, without going through a Weka loader. The data gets parsed in chunks of rows.
+    Missing values are represented by NaN, nominal values by the 0-based index of their label.
+    String, date and relational attributes are not supported.
+    ARFF files can contain quoted values (quoted '?' is a label, not a missing value) and sparse rows;
+    instance weights are ignored.
+    In case of CSV files, the first row contains the attribute names, values can be enclosed in quotechar
+    and the column types get determined from the first chunk: a column is numeric if all its values in the
+    first chunk are numeric, otherwise nominal (labels in order of appearance). Use nominal to declare
+    columns as nominal that only contain numbers in the first chunk.
+    The data can be pushed into Weka on demand with the add_ndarray method of the returned header.
+
+    :param filename: the ARFF or CSV file to read
+    :type filename: str
+    :param chunk_size: the number of lines to parse at a time
+    :type chunk_size: int
+    :param delimiter: the column delimiter (CSV only)
+    :type delimiter: str
+    :param missing: the string representing missing values (empty cells are missing as well)
+    :type missing: str
+    :param quotechar: the character for enclosing values (CSV only)
+    :type quotechar: str
+    :param nominal: the 0-based indices of the columns to treat as nominal (CSV only)
+    :type nominal: list
+    :return: tuple of matrix and header-only Instances
+    :rtype: tuple
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    if ext not in [".arff", ".csv"]:
+        raise Exception("Unsupported file format (only .arff and .csv): " + filename)
+    if not os.path.exists(filename):
+        raise Exception("Dataset file does not exist: " + str(filename))
+    is_arff = (ext == ".arff")
+
+    chunks = []
+    with open(filename, "r") as f:
+        if is_arff:
+            relation, names, labels = _read_arff_header(f)
+            lookup = {}
+            for i in labels:
+                lookup[i] = dict([(label, n) for n, label in enumerate(labels[i])])
+            zeros = []
+            for i in xrange(len(names)):
+                if i in labels:
+                    zeros.append(labels[i][0])
+                else:
+                    zeros.append("0")
+        else:
+            relation = os.path.splitext(os.path.basename(filename))[0]
+            names = [_unquote(x.strip()) for x in next(csv.reader([next(f)], delimiter=delimiter, quotechar=quotechar))]
+            lookup = None
+
+        while True:
+            lines = list(itertools.islice(f, chunk_size))
+            if len(lines) == 0:
+                break
+            lines = [line for line in lines if (len(line.strip()) > 0) and not line.lstrip().startswith("%")]
+            if len(lines) == 0:
+                continue
+            text = "".join(lines)
+            if not is_arff:
+                rows = list(csv.reader(lines, delimiter=delimiter, quotechar=quotechar, skipinitialspace=True))
+            elif any(c in text for c in "'\"{"):
+                # quoted values, sparse rows or instance weights
+                rows = [_split_arff_row(line, zeros) for line in lines]
+            else:
+                rows = list(csv.reader(lines, quoting=csv.QUOTE_NONE, skipinitialspace=True))
+            cells = numpy.array(rows)
+            if (cells.ndim != 2) or (cells.shape[1] != len(names)):
+                raise Exception("Rows must have " + str(len(names)) + " columns!")
+            cells = numpy.char.strip(cells)
+            mask = (cells == missing) | (cells == "")
+            if is_arff:
+                quoted = numpy.char.startswith(cells, "'") | numpy.char.startswith(cells, '"')
+                if quoted.any():
+                    cells = cells.astype(object)
+                    cells[quoted] = [_unquote_arff(x) for x in cells[quoted]]
+                    cells = cells.astype(str)
+
+            # determine nominal columns
+            if lookup is None:
+                lookup = {}
+                for i in xrange(len(names)):
+                    if (nominal is not None) and (i in nominal):
+                        lookup[i] = {}
+                        continue
+                    try:
+                        cells[:, i][~mask[:, i]].astype(numpy.float64)
+                    except ValueError:
+                        lookup[i] = {}
+
+            values = numpy.empty(cells.shape, dtype=numpy.float64)
+            for i in xrange(len(names)):
+                if i in lookup:
+                    present = ~mask[:, i]
+                    uniq, first, inverse = numpy.unique(cells[present, i], return_index=True, return_inverse=True)
+                    indices = numpy.empty(len(uniq), dtype=numpy.float64)
+                    for n in numpy.argsort(first):
+                        label = uniq[n]
+                        if label not in lookup[i]:
+                            if is_arff:
+                                raise Exception("Undefined label '" + label + "' for attribute '" + names[i] + "'!")
+                            lookup[i][str(label)] = len(lookup[i])
+                        indices[n] = lookup[i][label]
+                    values[:, i] = numpy.nan
+                    values[present, i] = indices[inverse]
+                else:
+                    try:
+                        values[:, i] = numpy.where(mask[:, i], "nan", cells[:, i]).astype(numpy.float64)
+                    except ValueError:
+                        raise Exception(
+                            "Non-numeric value in numeric attribute '" + names[i] + "' (column types get "
+                            + "determined from the first chunk, use 'nominal' to declare nominal columns)!")
+            chunks.append(values)
+
+    if lookup is None:
+        lookup = {}
+    if len(chunks) == 0:
+        result = numpy.zeros((0, len(names)), dtype=numpy.float64)
+    else:
+        result = numpy.concatenate(chunks)
+
+    # header
+    atts = []
+    for i, name in enumerate(names):
+        if i in lookup:
+            atts.append(Attribute.create_nominal(name, sorted(lookup[i], key=lookup[i].get)))
+        else:
+            atts.append(Attribute.create_numeric(name))
+    header = Instances.create_instances(relation, atts, 0)
+
+    return result, header
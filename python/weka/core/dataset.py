@@ -17,7 +17,8 @@
 import javabridge
 import logging
 import numpy
-from weka.core.classes import JavaObject
+import weka.core
+from weka.core.classes import JavaObject, Random, get_method_handle
 import weka.core.types as types
 
 # logging setup
@@ -28,6 +29,35 @@ class Instances(JavaObject):
     """
     Wrapper class for weka.core.Instances.
     """
+
+    _attribute = get_method_handle("weka/core/Instances", "attribute", "(I)Lweka/core/Attribute;")
+    _attribute_by_name = get_method_handle("weka/core/Instances", "attribute", "(Ljava/lang/String;)Lweka/core/Attribute;")
+    _num_attributes = get_method_handle("weka/core/Instances", "numAttributes", "()I")
+    _num_instances = get_method_handle("weka/core/Instances", "numInstances", "()I")
+    _get_class_index = get_method_handle("weka/core/Instances", "classIndex", "()I")
+    _set_class_index = get_method_handle("weka/core/Instances", "setClassIndex", "(I)V")
+    _class_attribute = get_method_handle("weka/core/Instances", "classAttribute", "()Lweka/core/Attribute;")
+    _get_instance = get_method_handle("weka/core/Instances", "instance", "(I)Lweka/core/Instance;")
+    _set_instance = get_method_handle("weka/core/Instances", "set", "(ILweka/core/Instance;)Lweka/core/Instance;")
+    _append_instance = get_method_handle("weka/core/Instances", "add", "(Lweka/core/Instance;)Z")
+    _insert_instance = get_method_handle("weka/core/Instances", "add", "(ILweka/core/Instance;)V")
+    _relation_name = get_method_handle("weka/core/Instances", "relationName", "()Ljava/lang/String;")
+    _set_relation_name = get_method_handle("weka/core/Instances", "setRelationName", "(Ljava/lang/String;)V")
+    _attribute_stats = get_method_handle("weka/core/Instances", "attributeStats", "(I)Lweka/core/AttributeStats;")
+    _attribute_to_double_array = get_method_handle("weka/core/Instances", "attributeToDoubleArray", "(I)[D")
+    _delete = get_method_handle("weka/core/Instances", "delete", "()V")
+    _delete_at = get_method_handle("weka/core/Instances", "delete", "(I)V")
+    _delete_attribute_at = get_method_handle("weka/core/Instances", "deleteAttributeAt", "(I)V")
+    _delete_attribute_type = get_method_handle("weka/core/Instances", "deleteAttributeType", "(I)V")
+    _delete_with_missing = get_method_handle("weka/core/Instances", "deleteWithMissing", "(I)V")
+    _compactify = get_method_handle("weka/core/Instances", "compactify", "()V")
+    _sort = get_method_handle("weka/core/Instances", "sort", "(I)V")
+    _randomize = get_method_handle("weka/core/Instances", "randomize", "(Ljava/util/Random;)V")
+    _stratify = get_method_handle("weka/core/Instances", "stratify", "(I)V")
+    _train_cv = get_method_handle("weka/core/Instances", "trainCV", "(II)Lweka/core/Instances;")
+    _train_cv_random = get_method_handle("weka/core/Instances", "trainCV", "(IILjava/util/Random;)Lweka/core/Instances;")
+    _test_cv = get_method_handle("weka/core/Instances", "testCV", "(II)Lweka/core/Instances;")
+    _equal_headers_msg = get_method_handle("weka/core/Instances", "equalHeadersMsg", "(Lweka/core/Instances;)Ljava/lang/String;")
     
     def __init__(self, jobject):
         """
@@ -38,17 +68,6 @@ class Instances(JavaObject):
         """
         self.enforce_type(jobject, "weka.core.Instances")
         super(Instances, self).__init__(jobject)
-        self.__attribute = javabridge.make_call(self.jobject, "attribute", "(I)Lweka/core/Attribute;")
-        self.__attribute_by_name = javabridge.make_call(self.jobject, "attribute", "(Ljava/lang/String;)Lweka/core/Attribute;")
-        self.__num_attributes = javabridge.make_call(self.jobject, "numAttributes", "()I")
-        self.__num_instances = javabridge.make_call(self.jobject, "numInstances", "()I")
-        self.__get_class_index = javabridge.make_call(self.jobject, "classIndex", "()I")
-        self.__set_class_index = javabridge.make_call(self.jobject, "setClassIndex", "(I)V")
-        self.__class_attribute = javabridge.make_call(self.jobject, "classAttribute", "()Lweka/core/Attribute;")
-        self.__get_instance = javabridge.make_call(self.jobject, "instance", "(I)Lweka/core/Instance;")
-        self.__set_instance = javabridge.make_call(self.jobject, "set", "(ILweka/core/Instance;)Lweka/core/Instance;")
-        self.__append_instance = javabridge.make_call(self.jobject, "add", "(Lweka/core/Instance;)Z")
-        self.__insert_instance = javabridge.make_call(self.jobject, "add", "(ILweka/core/Instance;)V")
 
     def __iter__(self):
         """
@@ -67,7 +86,7 @@ class Instances(JavaObject):
         :return: the name
         :rtype: str
         """
-        return javabridge.call(self.jobject, "relationName", "()Ljava/lang/String;")
+        return self._relation_name(self.jobject)
 
     @relationname.setter
     def relationname(self, value):
@@ -77,7 +96,7 @@ class Instances(JavaObject):
         :param value: the name
         :type value: str
         """
-        javabridge.call(self.jobject, "setRelationName", "(Ljava/lang/String;)V", value)
+        self._set_relation_name(self.jobject, value)
 
     @property
     def num_attributes(self):
@@ -87,7 +106,7 @@ class Instances(JavaObject):
         :return: the number of attributes
         :rtype: int
         """
-        return self.__num_attributes()
+        return self._num_attributes(self.jobject)
 
     def attributes(self):
         """
@@ -104,7 +123,7 @@ class Instances(JavaObject):
         :return: the attribute
         :rtype: Attribute
         """
-        return Attribute(self.__attribute(index))
+        return Attribute(self._attribute(self.jobject, index))
 
     def attribute_by_name(self, name):
         """
@@ -115,7 +134,7 @@ class Instances(JavaObject):
         :return: the attribute or None
         :rtype: Attribute
         """
-        att = self.__attribute_by_name(javabridge.get_env().new_string(name))
+        att = self._attribute_by_name(self.jobject, name)
         if att is None:
             return None
         else:
@@ -130,7 +149,53 @@ class Instances(JavaObject):
         :return: the attribute statistics
         :rtype: AttributeStats
         """
-        return AttributeStats(javabridge.call(self.jobject, "attributeStats", "(I)Lweka/core/AttributeStats;", index))
+        return AttributeStats(self._attribute_stats(self.jobject, index))
+
+    def describe(self):
+        """
+        Computes statistics for all attributes, using a single bulk export of all the values and numpy
+        instead of one AttributeStats object per attribute. The record array contains one row per attribute
+        with the following fields: name, type (short type string), count (non-missing values), missing,
+        distinct, unique (values occurring only once), min, max, mean, stddev (mean and stddev are
+        weighted, like Weka's Stats; NaN for non-numeric attributes) and nominal_counts (array with the
+        counts per label, None for non-nominal attributes). Since some of the field names clash with
+        ndarray methods, access the fields via their name, eg result["mean"].
+
+        :return: the statistics
+        :rtype: numpy.recarray
+        """
+        weights = self.weights()
+        matrix = self.to_numpy()
+        rows = []
+        for i in xrange(self.num_attributes):
+            att = self.attribute(i)
+            values = matrix[:, i]
+            present = ~numpy.isnan(values)
+            x = values[present]
+            w = weights[present]
+            if len(x) > 0:
+                uniq, counts = numpy.unique(x, return_counts=True)
+            else:
+                uniq, counts = x, numpy.zeros(0, dtype=numpy.int64)
+            minimum = maximum = mean = stddev = numpy.nan
+            nominal_counts = None
+            if att.is_numeric and (len(x) > 0):
+                minimum = x.min()
+                maximum = x.max()
+                sum_w = w.sum()
+                sum_wx = (w * x).sum()
+                mean = sum_wx / sum_w
+                if sum_w > 1:
+                    stddev = numpy.sqrt(max(0.0, ((w * x * x).sum() - sum_wx * sum_wx / sum_w) / (sum_w - 1)))
+            elif att.is_nominal:
+                nominal_counts = numpy.bincount(x.astype(numpy.int64), minlength=att.num_values)
+            rows.append((
+                att.name, att.type_str(short=True), len(x), len(values) - len(x), len(uniq),
+                int((counts == 1).sum()), minimum, maximum, mean, stddev, nominal_counts))
+        return numpy.rec.fromrecords(rows, dtype=[
+            ("name", object), ("type", object), ("count", numpy.int64), ("missing", numpy.int64),
+            ("distinct", numpy.int64), ("unique", numpy.int64), ("min", numpy.float64), ("max", numpy.float64),
+            ("mean", numpy.float64), ("stddev", numpy.float64), ("nominal_counts", object)])
 
     def values(self, index):
         """
@@ -139,11 +204,60 @@ class Instances(JavaObject):
         :return: the values as numpy array
         :rtype: list
         """
-        values = []
-        for i in xrange(self.num_instances):
-            inst = self.get_instance(i)
-            values.append(inst.get_value(index))
-        return numpy.array(values)
+        return self.column(index)
+
+    def column(self, index):
+        """
+        Returns the internal values of the specified attribute, transferred with a single call.
+
+        :param index: the 0-based index of the attribute
+        :type index: int
+        :return: the values
+        :rtype: ndarray
+        """
+        return javabridge.get_env().get_double_array_elements(
+            self._attribute_to_double_array(self.jobject, index))
+
+    def weights(self):
+        """
+        Returns the weights of all the rows, transferred with a single call.
+
+        :return: the weights
+        :rtype: ndarray
+        """
+        return javabridge.get_env().get_double_array_elements(
+            javabridge.static_call(
+                "weka/core/InstancesHelper", "weightsToDoubleArray", "(Lweka/core/Instances;)[D", self.jobject))
+
+    def to_numpy(self, indices=None, split=False):
+        """
+        Returns the internal values as numpy matrix (rows x columns), transferred with a single call.
+        If split is True, the class attribute is removed from the matrix and a tuple consisting of
+        matrix, class values and weights is returned instead.
+
+        :param indices: the 0-based indices of the attributes to return, None for all
+        :type indices: list or ndarray
+        :param split: whether to return class values and weights as separate vectors
+        :type split: bool
+        :return: the matrix or the tuple (matrix, class values, weights)
+        :rtype: ndarray or tuple
+        """
+        if indices is None:
+            indices = range(self.num_attributes)
+        if split:
+            if not self.has_class():
+                raise Exception("No class attribute set!")
+            indices = [i for i in indices if i != self.class_index]
+        cols = javabridge.get_env().make_int_array(numpy.array(indices, dtype=numpy.int32))
+        values = javabridge.get_env().get_double_array_elements(
+            javabridge.static_call(
+                "weka/core/InstancesHelper", "toDoubleArray", "(Lweka/core/Instances;[I)[D",
+                self.jobject, cols))
+        result = values.reshape((self.num_instances, len(indices)))
+        if split:
+            return result, self.column(self.class_index), self.weights()
+        else:
+            return result
 
     @property
     def num_instances(self):
@@ -153,7 +267,7 @@ class Instances(JavaObject):
         :return: the number of instances
         :rtype: int
         """
-        return self.__num_instances()
+        return self._num_instances(self.jobject)
 
     @property
     def class_attribute(self):
@@ -163,7 +277,7 @@ class Instances(JavaObject):
         :return: the class attribute
         :rtype: Attribute
         """
-        return Attribute(self.__class_attribute())
+        return Attribute(self._class_attribute(self.jobject))
 
     @property
     def class_index(self):
@@ -173,7 +287,7 @@ class Instances(JavaObject):
         :return: the class index, -1 if not set
         :rtype: int
         """
-        return self.__get_class_index()
+        return self._get_class_index(self.jobject)
 
     @class_index.setter
     def class_index(self, index):
@@ -183,7 +297,7 @@ class Instances(JavaObject):
         :param index: the new index, use -1 to unset
         :type index: int
         """
-        self.__set_class_index(index)
+        self._set_class_index(self.jobject, index)
 
     def has_class(self):
         """
@@ -221,7 +335,7 @@ class Instances(JavaObject):
         :return: the instance
         :rtype: Instance
         """
-        return Instance(self.__get_instance(index))
+        return Instance(self._get_instance(self.jobject, index))
 
     def add_instance(self, inst, index=None):
         """
@@ -233,9 +347,219 @@ class Instances(JavaObject):
         :type index: int
         """
         if index is None:
-            self.__append_instance(inst.jobject)
+            self._append_instance(self.jobject, inst.jobject)
         else:
-            self.__insert_instance(index, inst.jobject)
+            self._insert_instance(self.jobject, index, inst.jobject)
+
+    def add_ndarray(self, array, weights=None, missing=None):
+        """
+        Adds the rows of the matrix (internal format, one column per attribute) to the dataset. The data
+        gets transferred in large chunks rather than row by row. NaN values are treated as missing.
+
+        :param array: the 2-dim matrix with the internal values
+        :type array: ndarray
+        :param weights: the weights of the rows, None for 1.0
+        :type weights: ndarray or list
+        :param missing: the boolean mask (same shape as array) that flags missing values
+        :type missing: ndarray
+        """
+        array = numpy.asarray(array, dtype=numpy.float64)
+        if len(array.shape) != 2:
+            raise Exception("Number of array dimensions must be 2!")
+        rows, cols = array.shape
+        if cols != self.num_attributes:
+            raise Exception("Number of columns and attributes differ: " + str(cols) + " != " + str(self.num_attributes))
+        if missing is not None:
+            array = numpy.where(missing, numpy.nan, array)
+        if weights is not None:
+            weights = numpy.asarray(weights, dtype=numpy.float64)
+            if len(weights) != rows:
+                raise Exception("Number of rows and weights differ: " + str(rows) + " != " + str(len(weights)))
+        env = javabridge.get_env()
+        chunk = max(1, (1 << 24) // max(1, cols))
+        for start in xrange(0, rows, chunk):
+            values = numpy.ascontiguousarray(array[start:start + chunk]).ravel()
+            if weights is None:
+                jweights = None
+            else:
+                jweights = env.make_double_array(numpy.ascontiguousarray(weights[start:start + chunk]))
+            javabridge.static_call(
+                "weka/core/InstancesHelper", "addDoubleArray", "(Lweka/core/Instances;[D[D)V",
+                self.jobject, env.make_double_array(values), jweights)
+
+    def add_csr(self, matrix, weights=None):
+        """
+        Adds the rows of the scipy sparse matrix (internal format, one column per attribute) to the
+        dataset as sparse instances. The CSR arrays (data, indices, indptr) get transferred in large
+        chunks, without densifying the matrix. Requires scipy.
+
+        :param matrix: the sparse matrix with the internal values
+        :type matrix: scipy.sparse.spmatrix
+        :param weights: the weights of the rows, None for 1.0
+        :type weights: ndarray or list
+        """
+        if not weka.core.scipy_available:
+            raise Exception("scipy is not available!")
+        import scipy.sparse
+
+        matrix = scipy.sparse.csr_matrix(matrix)
+        if not matrix.has_sorted_indices:
+            matrix = matrix.sorted_indices()
+        rows, cols = matrix.shape
+        if cols != self.num_attributes:
+            raise Exception("Number of columns and attributes differ: " + str(cols) + " != " + str(self.num_attributes))
+        if weights is not None:
+            weights = numpy.asarray(weights, dtype=numpy.float64)
+            if len(weights) != rows:
+                raise Exception("Number of rows and weights differ: " + str(rows) + " != " + str(len(weights)))
+        values = numpy.asarray(matrix.data, dtype=numpy.float64)
+        indices = numpy.asarray(matrix.indices, dtype=numpy.int32)
+        indptr = numpy.asarray(matrix.indptr, dtype=numpy.int64)
+        env = javabridge.get_env()
+        start = 0
+        while start < rows:
+            # limit the number of non-zero values per chunk
+            end = int(numpy.searchsorted(indptr, indptr[start] + (1 << 24), side="right")) - 1
+            end = min(rows, max(end, start + 1))
+            offset = indptr[start]
+            if weights is None:
+                jweights = None
+            else:
+                jweights = env.make_double_array(numpy.ascontiguousarray(weights[start:end]))
+            javabridge.static_call(
+                "weka/core/InstancesHelper", "addSparseArrays", "(Lweka/core/Instances;[D[I[I[D)V",
+                self.jobject,
+                env.make_double_array(numpy.ascontiguousarray(values[offset:indptr[end]])),
+                env.make_int_array(numpy.ascontiguousarray(indices[offset:indptr[end]])),
+                env.make_int_array((indptr[start:end + 1] - offset).astype(numpy.int32)),
+                jweights)
+            start = end
+
+    def to_csr(self):
+        """
+        Returns the internal values as scipy sparse matrix (rows x columns, CSR format), transferred
+        with a single call and without densifying the data. Missing values are stored as NaN.
+        Requires scipy.
+
+        :return: the sparse matrix
+        :rtype: scipy.sparse.csr_matrix
+        """
+        if not weka.core.scipy_available:
+            raise Exception("scipy is not available!")
+        import scipy.sparse
+
+        env = javabridge.get_env()
+        arrays = env.get_object_array_elements(
+            javabridge.static_call(
+                "weka/core/InstancesHelper", "toSparseArrays", "(Lweka/core/Instances;)[Ljava/lang/Object;",
+                self.jobject))
+        values = env.get_double_array_elements(arrays[0])
+        indices = env.get_int_array_elements(arrays[1])
+        indptr = env.get_int_array_elements(arrays[2])
+        return scipy.sparse.csr_matrix((values, indices, indptr), shape=(self.num_instances, self.num_attributes))
+
+    def to_arrow(self, weights_column=None):
+        """
+        Converts the dataset into a pyarrow Table, transferring the data one column at a time.
+        Numeric attributes turn into float64 columns, nominal attributes into dictionary-encoded columns,
+        string attributes into string columns and date attributes into timestamp (ms) columns. Missing
+        values are represented by nulls. Relation name, class index and name of the weights column are
+        stored in the metadata of the schema. Requires pyarrow.
+
+        :param weights_column: the name of the column to store the weights in, None to omit the weights
+        :type weights_column: str
+        :return: the table
+        :rtype: pyarrow.Table
+        """
+        if not weka.core.pyarrow_available:
+            raise Exception("pyarrow is not available!")
+        import pyarrow
+
+        arrays = []
+        names = []
+        for i in xrange(self.num_attributes):
+            att = self.attribute(i)
+            values = self.column(i)
+            mask = numpy.isnan(values)
+            if att.is_date:
+                array = pyarrow.array(
+                    numpy.where(mask, 0, values).astype(numpy.int64), type=pyarrow.timestamp("ms"), mask=mask)
+            elif att.is_numeric:
+                array = pyarrow.array(values, mask=mask)
+            elif att.is_nominal:
+                labels = att.values
+                if labels is None:
+                    labels = []
+                array = pyarrow.DictionaryArray.from_arrays(
+                    pyarrow.array(numpy.where(mask, 0, values).astype(numpy.int32), mask=mask),
+                    pyarrow.array(labels, type=pyarrow.string()))
+            elif att.is_string:
+                strings = att.values
+                if not strings:
+                    strings = [""]
+                strings = numpy.array(strings, dtype=object)
+                array = pyarrow.array(
+                    strings[numpy.where(mask, 0, values).astype(numpy.int32)], type=pyarrow.string(), mask=mask)
+            else:
+                raise Exception("Unsupported attribute type for attribute '" + att.name + "': " + att.type_str())
+            arrays.append(array)
+            names.append(att.name)
+
+        metadata = {"weka.relation": self.relationname, "weka.class_index": str(self.class_index)}
+        if weights_column is not None:
+            arrays.append(pyarrow.array(self.weights()))
+            names.append(weights_column)
+            metadata["weka.weights"] = weights_column
+        table = pyarrow.Table.from_arrays(arrays, names=names)
+        return table.replace_schema_metadata(metadata)
+
+    def to_dataframe(self, weights_column=None):
+        """
+        Converts the dataset into a pandas DataFrame, transferring the data one column at a time.
+        Numeric attributes turn into float64 columns, nominal attributes into categoricals, string
+        attributes into object columns and date attributes into datetime64 columns. Missing values are
+        represented by NaN/None/NaT. Requires pandas.
+
+        :param weights_column: the name of the column to store the weights in, None to omit the weights
+        :type weights_column: str
+        :return: the data frame
+        :rtype: pandas.DataFrame
+        """
+        if not weka.core.pandas_available:
+            raise Exception("pandas is not available!")
+        import pandas
+
+        columns = []
+        names = []
+        for i in xrange(self.num_attributes):
+            att = self.attribute(i)
+            values = self.column(i)
+            mask = numpy.isnan(values)
+            if att.is_date:
+                column = pandas.to_datetime(values, unit="ms")
+            elif att.is_numeric:
+                column = values
+            elif att.is_nominal:
+                labels = att.values
+                if labels is None:
+                    labels = []
+                column = pandas.Categorical.from_codes(
+                    numpy.where(mask, -1, values).astype(numpy.int64), categories=labels)
+            elif att.is_string:
+                strings = att.values
+                if not strings:
+                    strings = [""]
+                column = numpy.array(strings, dtype=object)[numpy.where(mask, 0, values).astype(numpy.int64)]
+                column[mask] = None
+            else:
+                raise Exception("Unsupported attribute type for attribute '" + att.name + "': " + att.type_str())
+            columns.append(column)
+            names.append(att.name)
+        if weights_column is not None:
+            columns.append(self.weights())
+            names.append(weights_column)
+
+        return pandas.DataFrame(dict(zip(names, columns)), columns=names)
 
     def set_instance(self, index, inst):
         """
@@ -249,7 +573,7 @@ class Instances(JavaObject):
         :rtype: Instance
         """
         return Instance(
-            self.__set_instance(index, inst.jobject))
+            self._set_instance(self.jobject, index, inst.jobject))
             
     def delete(self, index=None):
         """
@@ -259,9 +583,9 @@ class Instances(JavaObject):
         :type index: int
         """
         if index is None:
-            javabridge.call(self.jobject, "delete", "()V")
+            self._delete(self.jobject)
         else:
-            javabridge.call(self.jobject, "delete", "(I)V", index)
+            self._delete_at(self.jobject, index)
 
     def delete_attribute(self, index):
         """
@@ -270,7 +594,7 @@ class Instances(JavaObject):
         :param index: the 0-based index of the attribute to remove
         :type index: int
         """
-        javabridge.call(self.jobject, "deleteAttributeAt", "(I)V", index)
+        self._delete_attribute_at(self.jobject, index)
 
     def delete_first_attribute(self):
         """
@@ -291,7 +615,7 @@ class Instances(JavaObject):
         :param typ: the attribute type to remove, see weka.core.Attribute Javadoc
         :type typ: int
         """
-        javabridge.call(self.jobject, "deleteAttributeType", "(I)V", typ)
+        self._delete_attribute_type(self.jobject, typ)
 
     def delete_with_missing(self, index):
         """
@@ -300,13 +624,13 @@ class Instances(JavaObject):
         :param index: the attribute index to check for missing attributes
         :type index: int
         """
-        javabridge.call(self.jobject, "deleteWithMissing", "(I)V", index)
+        self._delete_with_missing(self.jobject, index)
 
     def compactify(self):
         """
         Compactifies the set of instances.
         """
-        javabridge.call(self.jobject, "compactify", "()V")
+        self._compactify(self.jobject)
 
     def sort(self, index):
         """
@@ -315,7 +639,7 @@ class Instances(JavaObject):
         :param index: the index of the attribute
         :type index: int
         """
-        javabridge.call(self.jobject, "sort", "(I)V", index)
+        self._sort(self.jobject, index)
 
     def randomize(self, random):
         """
@@ -324,7 +648,22 @@ class Instances(JavaObject):
         :param random: the random number generator to use
         :type random: Random
         """
-        javabridge.call(self.jobject, "randomize", "(Ljava/util/Random;)V", random.jobject)
+        self._randomize(self.jobject, random.jobject)
+
+    def random_order(self, random):
+        """
+        Returns the row indices in the order that randomize generates with the random number generator,
+        without modifying the dataset. Can be used with take to obtain a randomized subset.
+
+        :param random: the random number generator to use
+        :type random: Random
+        :return: the 0-based row indices
+        :rtype: ndarray
+        """
+        return javabridge.get_env().get_int_array_elements(
+            javabridge.static_call(
+                "weka/core/InstancesHelper", "randomOrder", "(ILjava/util/Random;)[I",
+                self.num_instances, random.jobject))
 
     def stratify(self, folds):
         """
@@ -333,7 +672,7 @@ class Instances(JavaObject):
         :param folds: the number of folds to perform the stratification for
         :type folds: int
         """
-        javabridge.call(self.jobject, "stratify", "(I)V", folds)
+        self._stratify(self.jobject, folds)
 
     def train_cv(self, num_folds, fold, random=None):
         """
@@ -350,12 +689,10 @@ class Instances(JavaObject):
         """
         if random is None:
             return Instances(
-                javabridge.call(self.jobject, "trainCV", "(II)Lweka/core/Instances;",
-                                num_folds, fold))
+                self._train_cv(self.jobject, num_folds, fold))
         else:
             return Instances(
-                javabridge.call(self.jobject, "trainCV", "(IILjava/util/Random;)Lweka/core/Instances;",
-                                num_folds, fold, random.jobject))
+                self._train_cv_random(self.jobject, num_folds, fold, random.jobject))
 
     def test_cv(self, num_folds, fold):
         """
@@ -369,8 +706,7 @@ class Instances(JavaObject):
         :rtype: Instances
         """
         return Instances(
-            javabridge.call(self.jobject, "testCV", "(II)Lweka/core/Instances;",
-                            num_folds, fold))
+            self._test_cv(self.jobject, num_folds, fold))
 
     def equal_headers(self, inst):
         """
@@ -381,8 +717,7 @@ class Instances(JavaObject):
         :return: None if the same, otherwise an error message
         :rtype: str
         """
-        return javabridge.call(
-            self.jobject, "equalHeadersMsg", "(Lweka/core/Instances;)Ljava/lang/String;", inst.jobject)
+        return self._equal_headers_msg(self.jobject, inst.jobject)
 
     @classmethod
     def copy_instances(cls, dataset, from_row=None, num_rows=None):
@@ -405,7 +740,6 @@ class Instances(JavaObject):
                     "weka/core/Instances", "(Lweka/core/Instances;)V",
                     dataset.jobject))
         else:
-            dataset = cls.copy_instances(dataset)
             return Instances(
                 javabridge.make_instance(
                     "weka/core/Instances", "(Lweka/core/Instances;II)V",
@@ -449,6 +783,129 @@ class Instances(JavaObject):
                 "weka/core/Instances", "(Ljava/lang/String;Ljava/util/ArrayList;I)V",
                 name, javabridge.make_list(attributes), capacity))
 
+    @classmethod
+    def from_arrow(cls, table, relation=None, class_index=None, weights_column=None):
+        """
+        Creates a dataset from the pyarrow Table, transferring the data one column at a time.
+        Integer, floating point and boolean columns turn into numeric attributes, dictionary-encoded
+        columns into nominal attributes, string columns into string attributes and timestamp/date columns
+        into date attributes. Nulls are treated as missing values. Relation name, class index and
+        weights column default to the values stored by to_arrow in the metadata of the schema.
+        Requires pyarrow.
+
+        :param table: the table to convert
+        :type table: pyarrow.Table
+        :param relation: the name of the dataset, None to use the metadata or "arrow"
+        :type relation: str
+        :param class_index: the 0-based index of the class attribute, None to use the metadata
+        :type class_index: int
+        :param weights_column: the name of the column with the weights, None to use the metadata
+        :type weights_column: str
+        :return: the dataset
+        :rtype: Instances
+        """
+        if not weka.core.pyarrow_available:
+            raise Exception("pyarrow is not available!")
+
+        metadata = table.schema.metadata
+        if metadata is None:
+            metadata = {}
+        if relation is None:
+            relation = metadata.get(b"weka.relation", "arrow")
+        if class_index is None:
+            class_index = int(metadata.get(b"weka.class_index", -1))
+        if weights_column is None:
+            weights_column = metadata.get(b"weka.weights", None)
+
+        atts = []
+        columns = []
+        weights = None
+        for i, field in enumerate(table.schema):
+            column = table.column(i)
+            if hasattr(column, "chunks"):
+                chunks = column.chunks
+            else:
+                chunks = column.data.chunks
+            if field.name == weights_column:
+                weights = _arrow_concat([_arrow_to_float(chunk) for chunk in chunks])
+            else:
+                att, values = _arrow_to_attribute(field, chunks)
+                atts.append(att)
+                columns.append(values)
+
+        result = cls.create_instances(relation, atts, table.num_rows)
+        if len(columns) > 0:
+            result.add_ndarray(numpy.column_stack(columns), weights=weights)
+        result.class_index = class_index
+        return result
+
+    @classmethod
+    def from_csr(cls, matrix, header, weights=None):
+        """
+        Creates a dataset with sparse instances from the scipy sparse matrix (internal format, one
+        column per attribute), using the header as template. See add_csr. Requires scipy.
+
+        :param matrix: the sparse matrix with the internal values
+        :type matrix: scipy.sparse.spmatrix
+        :param header: the dataset to use as template
+        :type header: Instances
+        :param weights: the weights of the rows, None for 1.0
+        :type weights: ndarray or list
+        :return: the dataset
+        :rtype: Instances
+        """
+        result = cls.template_instances(header, matrix.shape[0])
+        result.add_csr(matrix, weights=weights)
+        return result
+
+    @classmethod
+    def from_dataframe(cls, df, relation="pandas", class_column=None, weights_column=None, chunk_size=None):
+        """
+        Creates a dataset from the pandas DataFrame, transferring the data one column at a time.
+        Numeric and boolean columns turn into numeric attributes, categoricals into nominal attributes,
+        datetime64 columns into date attributes and object/string columns into string attributes.
+        NaN/None/NaT are treated as missing values. With chunk_size, the rows get converted and
+        transferred in chunks, which only limits the size of the temporary Python arrays; the complete
+        dataset still ends up in the JVM heap. Requires pandas.
+
+        :param df: the data frame to convert
+        :type df: pandas.DataFrame
+        :param relation: the name of the dataset
+        :type relation: str
+        :param class_column: the name or 0-based index (in df.columns) of the class column, None for no class
+        :type class_column: str or int
+        :param weights_column: the name of the column with the weights, None for 1.0
+        :type weights_column: str
+        :param chunk_size: the maximum number of rows to convert at a time, None for all at once
+        :type chunk_size: int
+        :return: the dataset
+        :rtype: Instances
+        """
+        if not weka.core.pandas_available:
+            raise Exception("pandas is not available!")
+
+        if isinstance(class_column, (int, long)):
+            class_column = df.columns[class_column]
+        if (class_column is not None) and (class_column == weights_column):
+            raise Exception("Class column cannot be the weights column: " + str(class_column))
+        names = [name for name in df.columns if name != weights_column]
+        atts = [_dataframe_attribute(str(name), df[name]) for name in names]
+        result = cls.create_instances(relation, atts, len(df))
+
+        if chunk_size is None:
+            chunk_size = max(1, len(df))
+        for start in xrange(0, len(df), chunk_size):
+            chunk = df.iloc[start:start + chunk_size]
+            values = numpy.column_stack([_dataframe_column_to_float(chunk[name], att) for name, att in zip(names, atts)])
+            weights = None
+            if weights_column is not None:
+                weights = chunk[weights_column].values.astype(numpy.float64)
+            result.add_ndarray(values, weights=weights)
+
+        if class_column is not None:
+            result.class_index = names.index(class_column)
+        return result
+
     @classmethod
     def merge_instances(cls, inst1, inst2):
         """
@@ -480,11 +937,71 @@ class Instances(JavaObject):
         msg = inst1.equal_headers(inst2)
         if msg is not None:
             raise Exception("Cannot appent instances: " + msg)
-        result = cls.copy_instances(inst1)
-        for i in xrange(inst2.num_instances):
-            result.add_instance(inst2.get_instance(i))
+        return cls.concat([inst1, inst2])
+
+    @classmethod
+    def concat(cls, datasets):
+        """
+        Combines the datasets (one-after-the-other), with the rows getting appended within the JVM.
+        Throws an exception if the datasets aren't compatible. In case of a list or tuple, the capacity
+        of the combined dataset gets reserved upfront. Any other iterable (eg a generator) gets consumed
+        one dataset at a time, without holding on to the datasets already appended.
+
+        :param datasets: the datasets to combine
+        :type datasets: list or tuple or iterable
+        :return: the combined dataset
+        :rtype: Instances
+        """
+        if isinstance(datasets, (list, tuple)):
+            if len(datasets) == 0:
+                raise Exception("No datasets provided!")
+            capacity = sum([data.num_instances for data in datasets])
+        else:
+            capacity = 0
+        result = None
+        for data in datasets:
+            if result is None:
+                result = cls.template_instances(data, capacity)
+            javabridge.static_call(
+                "weka/core/InstancesHelper", "append", "(Lweka/core/Instances;Lweka/core/Instances;)V",
+                result.jobject, data.jobject)
+        if result is None:
+            raise Exception("No datasets provided!")
         return result
 
+    def take(self, indices):
+        """
+        Returns a new dataset with copies of the specified rows (in the order of the indices),
+        transferring the indices with a single call.
+
+        :param indices: the 0-based indices of the rows
+        :type indices: ndarray or list
+        :return: the subset
+        :rtype: Instances
+        """
+        indices = numpy.asarray(indices, dtype=numpy.int64)
+        if len(indices) > 0:
+            if (indices.min() < 0) or (indices.max() >= self.num_instances):
+                raise Exception("Row indices must be in the range 0.." + str(self.num_instances - 1) + "!")
+        return Instances(
+            javabridge.static_call(
+                "weka/core/InstancesHelper", "subset", "(Lweka/core/Instances;[I)Lweka/core/Instances;",
+                self.jobject, javabridge.get_env().make_int_array(indices.astype(numpy.int32))))
+
+    def mask(self, mask):
+        """
+        Returns a new dataset with copies of the rows that are flagged in the boolean mask.
+
+        :param mask: the boolean mask, one flag per row
+        :type mask: ndarray or list
+        :return: the subset
+        :rtype: Instances
+        """
+        mask = numpy.asarray(mask, dtype=bool)
+        if len(mask) != self.num_instances:
+            raise Exception("Length of mask and number of rows differ: " + str(len(mask)) + " != " + str(self.num_instances))
+        return self.take(numpy.flatnonzero(mask))
+
     def train_test_split(self, percentage, rnd=None):
         """
         Generates a train/test split.
@@ -521,10 +1038,130 @@ class Instances(JavaObject):
         return javabridge.call(inst.jobject, "toSummaryString", "()Ljava/lang/String;")
 
 
+class FoldView(object):
+    """
+    Assigns the rows of a dataset to cross-validation folds, providing the train/test row indices of
+    each fold and materializing the subsets only on demand (see Instances.take).
+    The rows get randomized like Instances.randomize does, but the assignment of the rows to the
+    (stratified) folds differs from Weka's.
+    """
+
+    def __init__(self, data, num_folds=10, seed=1, stratify=True):
+        """
+        Initializes the folds.
+
+        :param data: the dataset to generate the folds for
+        :type data: Instances
+        :param num_folds: the number of folds
+        :type num_folds: int
+        :param seed: the seed value for randomizing the rows, None to keep the order
+        :type seed: int
+        :param stratify: whether to stratify the folds in case of a nominal class attribute
+        :type stratify: bool
+        """
+        if num_folds < 2:
+            raise Exception("Number of folds must be at least 2!")
+        if num_folds > data.num_instances:
+            raise Exception("Can't have more folds than instances!")
+        self.data = data
+        self.num_folds = num_folds
+        if seed is None:
+            order = numpy.arange(data.num_instances)
+        else:
+            order = data.random_order(Random(seed))
+        if stratify and data.has_class() and data.class_attribute.is_nominal:
+            order = order[numpy.argsort(data.column(data.class_index)[order], kind="mergesort")]
+        self.folds = numpy.empty(data.num_instances, dtype=numpy.int32)
+        self.folds[order] = numpy.arange(data.num_instances) % num_folds
+
+    def __len__(self):
+        """
+        Returns the number of folds.
+
+        :return: the number of folds
+        :rtype: int
+        """
+        return self.num_folds
+
+    def __iter__(self):
+        """
+        Iterates over the folds, returning tuples of train and test row indices.
+
+        :return: the iterator
+        :rtype: iterator
+        """
+        for fold in xrange(self.num_folds):
+            yield self.train_indices(fold), self.test_indices(fold)
+
+    def train_indices(self, fold):
+        """
+        Returns the indices of the training rows of the fold.
+
+        :param fold: the 0-based fold
+        :type fold: int
+        :return: the row indices
+        :rtype: ndarray
+        """
+        return numpy.flatnonzero(self.folds != fold)
+
+    def test_indices(self, fold):
+        """
+        Returns the indices of the test rows of the fold.
+
+        :param fold: the 0-based fold
+        :type fold: int
+        :return: the row indices
+        :rtype: ndarray
+        """
+        return numpy.flatnonzero(self.folds == fold)
+
+    def train(self, fold):
+        """
+        Materializes the training set of the fold.
+
+        :param fold: the 0-based fold
+        :type fold: int
+        :return: the training set
+        :rtype: Instances
+        """
+        return self.data.take(self.train_indices(fold))
+
+    def test(self, fold):
+        """
+        Materializes the test set of the fold.
+
+        :param fold: the 0-based fold
+        :type fold: int
+        :return: the test set
+        :rtype: Instances
+        """
+        return self.data.take(self.test_indices(fold))
+
+
 class Instance(JavaObject):
     """
     Wrapper class for weka.core.Instance.
     """
+
+    __slots__ = ()
+
+    _set_value = get_method_handle("weka/core/Instance", "setValue", "(ID)V")
+    _get_value = get_method_handle("weka/core/Instance", "value", "(I)D")
+    _set_string_value = get_method_handle("weka/core/Instance", "setValue", "(ILjava/lang/String;)V")
+    _get_string_value = get_method_handle("weka/core/Instance", "stringValue", "(I)Ljava/lang/String;")
+    _set_weight = get_method_handle("weka/core/Instance", "setWeight", "(D)V")
+    _get_weight = get_method_handle("weka/core/Instance", "weight", "()D")
+    _is_missing = get_method_handle("weka/core/Instance", "isMissing", "(I)Z")
+    _class_index = get_method_handle("weka/core/Instance", "classIndex", "()I")
+    _dataset = get_method_handle("weka/core/Instance", "dataset", "()Lweka/core/Instances;")
+    _set_dataset = get_method_handle("weka/core/Instance", "setDataset", "(Lweka/core/Instances;)V")
+    _num_attributes = get_method_handle("weka/core/Instance", "numAttributes", "()I")
+    _num_classes = get_method_handle("weka/core/Instance", "numClasses", "()I")
+    _class_attribute = get_method_handle("weka/core/Instance", "classAttribute", "()Lweka/core/Attribute;")
+    _relational_value = get_method_handle("weka/core/Instance", "relationalValue", "(I)Lweka/core/Instances;")
+    _set_missing = get_method_handle("weka/core/Instance", "setMissing", "(I)V")
+    _has_missing_value = get_method_handle("weka/core/Instance", "hasMissingValue", "()Z")
+    _to_double_array = get_method_handle("weka/core/Instance", "toDoubleArray", "()[D")
     
     def __init__(self, jobject):
         """
@@ -535,14 +1172,6 @@ class Instance(JavaObject):
         """
         self.enforce_type(jobject, "weka.core.Instance")
         super(Instance, self).__init__(jobject)
-        self.__set_value = javabridge.make_call(self.jobject, "setValue", "(ID)V")
-        self.__get_value = javabridge.make_call(self.jobject, "value", "(I)D")
-        self.__set_string_value = javabridge.make_call(self.jobject, "setValue", "(ILjava/lang/String;)V")
-        self.__get_string_value = javabridge.make_call(self.jobject, "stringValue", "(I)Ljava/lang/String;")
-        self.__set_weight = javabridge.make_call(self.jobject, "setWeight", "(D)V")
-        self.__get_weight = javabridge.make_call(self.jobject, "weight", "()D")
-        self.__is_missing = javabridge.make_call(self.jobject, "isMissing", "(I)Z")
-        self.__class_index = javabridge.make_call(self.jobject, "classIndex", "()I")
 
     def __iter__(self):
         """
@@ -561,7 +1190,7 @@ class Instance(JavaObject):
         :return: the dataset or None if no dataset set
         :rtype: Instances
         """
-        dataset = javabridge.call(self.jobject, "dataset", "()Lweka/core/Instances;")
+        dataset = self._dataset(self.jobject)
         if dataset is None:
             return None
         else:
@@ -575,7 +1204,7 @@ class Instance(JavaObject):
         :param dataset: the dataset this instance belongs to.
         :type dataset: Instances
         """
-        javabridge.call(self.jobject, "setDataset", "(Lweka/core/Instances;)V", dataset.jobject)
+        self._set_dataset(self.jobject, dataset.jobject)
 
     @property
     def num_attributes(self):
@@ -585,7 +1214,7 @@ class Instance(JavaObject):
         :return: the numer of attributes
         :rtype: int
         """
-        return javabridge.call(self.jobject, "numAttributes", "()I")
+        return self._num_attributes(self.jobject)
 
     @property
     def num_classes(self):
@@ -595,7 +1224,7 @@ class Instance(JavaObject):
         :return: the numer of class labels
         :rtype: int
         """
-        return javabridge.call(self.jobject, "numClasses", "()I")
+        return self._num_classes(self.jobject)
 
     @property
     def class_attribute(self):
@@ -605,7 +1234,7 @@ class Instance(JavaObject):
         :return: the class attribute
         :rtype: Attribute
         """
-        return Attribute(javabridge.call(self.jobject, "classAttribute", "()Lweka/core/Attribute;"))
+        return Attribute(self._class_attribute(self.jobject))
 
     @property
     def class_index(self):
@@ -615,7 +1244,7 @@ class Instance(JavaObject):
         :return: the class index, -1 if not set
         :rtype: int
         """
-        return self.__class_index()
+        return self._class_index(self.jobject)
 
     def has_class(self):
         """
@@ -635,7 +1264,7 @@ class Instance(JavaObject):
         :param value: the internal float value to set
         :type value: float
         """
-        self.__set_value(index, value)
+        self._set_value(self.jobject, index, value)
 
     def get_value(self, index):
         """
@@ -646,7 +1275,7 @@ class Instance(JavaObject):
         :return: the internal value
         :rtype: float
         """
-        return self.__get_value(index)
+        return self._get_value(self.jobject, index)
 
     def set_string_value(self, index, s):
         """
@@ -657,7 +1286,7 @@ class Instance(JavaObject):
         :param s: the string value
         :type s: str
         """
-        return self.__set_string_value(index, javabridge.get_env().new_string(s))
+        return self._set_string_value(self.jobject, index, s)
 
     def get_string_value(self, index):
         """
@@ -668,7 +1297,7 @@ class Instance(JavaObject):
         :return: the string value
         :rtype: str
         """
-        return javabridge.get_env().get_string(self.__get_string_value(index))
+        return self._get_string_value(self.jobject, index)
 
     def get_relational_value(self, index):
         """
@@ -679,7 +1308,7 @@ class Instance(JavaObject):
         :return: the relational value
         :rtype: Instances
         """
-        return Instances(javabridge.call(self.jobject, "relationalValue", "(I)Lweka/core/Instances;", index))
+        return Instances(self._relational_value(self.jobject, index))
 
     def set_missing(self, index):
         """
@@ -688,7 +1317,7 @@ class Instance(JavaObject):
         :param index: the 0-based index of the attribute
         :type index: int
         """
-        javabridge.call(self.jobject, "setMissing", "(I)V", index)
+        self._set_missing(self.jobject, index)
 
     def is_missing(self, index):
         """
@@ -699,7 +1328,7 @@ class Instance(JavaObject):
         :return: whether the value is missing
         :rtype: bool
         """
-        return self.__is_missing(index)
+        return self._is_missing(self.jobject, index)
 
     def has_missing(self):
         """
@@ -708,7 +1337,7 @@ class Instance(JavaObject):
         :return: whether at least one value is missing
         :rtype: bool
         """
-        return javabridge.call(self.jobject, "hasMissingValue", "()Z")
+        return self._has_missing_value(self.jobject)
 
     @property
     def weight(self):
@@ -718,7 +1347,7 @@ class Instance(JavaObject):
         :return: the weight
         :rtype: float
         """
-        return self.__get_weight()
+        return self._get_weight(self.jobject)
 
     @weight.setter
     def weight(self, weight):
@@ -728,7 +1357,7 @@ class Instance(JavaObject):
         :param weight: the weight to set
         :type weight: float
         """
-        self.__set_weight(weight)
+        self._set_weight(self.jobject, weight)
 
     @property
     def values(self):
@@ -738,7 +1367,7 @@ class Instance(JavaObject):
         :return: the values as numpy array
         :rtype: ndarray
         """
-        return javabridge.get_env().get_double_array_elements(javabridge.call(self.jobject, "toDoubleArray", "()[D"))
+        return javabridge.get_env().get_double_array_elements(self._to_double_array(self.jobject))
 
     @classmethod
     def create_instance(cls, values, classname="weka.core.DenseInstance", weight=1.0):
@@ -797,6 +1426,36 @@ class Attribute(JavaObject):
     """
     Wrapper class for weka.core.Attribute.
     """
+
+    __slots__ = ()
+
+    _name = get_method_handle("weka/core/Attribute", "name", "()Ljava/lang/String;")
+    _index = get_method_handle("weka/core/Attribute", "index", "()I")
+    _weight = get_method_handle("weka/core/Attribute", "weight", "()D")
+    _set_weight = get_method_handle("weka/core/Attribute", "setWeight", "(D)V")
+    _index_of_value = get_method_handle("weka/core/Attribute", "indexOfValue", "(Ljava/lang/String;)I")
+    _value = get_method_handle("weka/core/Attribute", "value", "(I)Ljava/lang/String;")
+    _num_values = get_method_handle("weka/core/Attribute", "numValues", "()I")
+    _enumerate_values = get_method_handle("weka/core/Attribute", "enumerateValues", "()Ljava/util/Enumeration;")
+    _ordering = get_method_handle("weka/core/Attribute", "ordering", "()I")
+    _type = get_method_handle("weka/core/Attribute", "type", "()I")
+    _is_averagable = get_method_handle("weka/core/Attribute", "isAveragable", "()Z")
+    _is_date = get_method_handle("weka/core/Attribute", "isDate", "()Z")
+    _is_nominal = get_method_handle("weka/core/Attribute", "isNominal", "()Z")
+    _is_numeric = get_method_handle("weka/core/Attribute", "isNumeric", "()Z")
+    _is_relation_valued = get_method_handle("weka/core/Attribute", "isRelationValued", "()Z")
+    _is_string = get_method_handle("weka/core/Attribute", "isString", "()Z")
+    _get_date_format = get_method_handle("weka/core/Attribute", "getDateFormat", "()Ljava/lang/String;")
+    _get_lower_numeric_bound = get_method_handle("weka/core/Attribute", "getLowerNumericBound", "()D")
+    _get_upper_numeric_bound = get_method_handle("weka/core/Attribute", "getUpperNumericBound", "()D")
+    _is_in_range = get_method_handle("weka/core/Attribute", "isInRange", "(D)Z")
+    _add_string_value = get_method_handle("weka/core/Attribute", "addStringValue", "(Ljava/lang/String;)I")
+    _add_relation = get_method_handle("weka/core/Attribute", "addRelation", "(Lweka/core/Instances;)I")
+    _parse_date = get_method_handle("weka/core/Attribute", "parseDate", "(Ljava/lang/String;)D")
+    _equals = get_method_handle("weka/core/Attribute", "equals", "(Lweka/core/Attribute;)Z")
+    _equals_msg = get_method_handle("weka/core/Attribute", "equalsMsg", "(Lweka/core/Attribute;)Ljava/lang/String;")
+    _copy = get_method_handle("weka/core/Attribute", "copy", "()Ljava/lang/Object;")
+    _copy_with_name = get_method_handle("weka/core/Attribute", "copy", "(Ljava/lang/String;)Lweka/core/Attribute;")
     
     def __init__(self, jobject):
         """
@@ -815,7 +1474,7 @@ class Attribute(JavaObject):
         :return: the name
         :rtype: str
         """
-        return javabridge.call(self.jobject, "name", "()Ljava/lang/String;")
+        return self._name(self.jobject)
         
     @property
     def index(self):
@@ -825,7 +1484,7 @@ class Attribute(JavaObject):
         :return: the index
         :rtype: int
         """
-        return javabridge.call(self.jobject, "index", "()I")
+        return self._index(self.jobject)
 
     @property
     def weight(self):
@@ -835,7 +1494,7 @@ class Attribute(JavaObject):
         :return: the weight
         :rtype: float
         """
-        return javabridge.call(self.jobject, "weight", "()D")
+        return self._weight(self.jobject)
 
     @weight.setter
     def weight(self, weight):
@@ -845,7 +1504,7 @@ class Attribute(JavaObject):
         :param weight: the weight of the attribute
         :type weight: float
         """
-        javabridge.call(self.jobject, "setWeight", "(D)V", weight)
+        self._set_weight(self.jobject, weight)
 
     def index_of(self, label):
         """
@@ -856,7 +1515,7 @@ class Attribute(JavaObject):
         :return: the 0-based index
         :rtype: int
         """
-        return javabridge.call(self.jobject, "indexOfValue", "(Ljava/lang/String;)I", label)
+        return self._index_of_value(self.jobject, label)
 
     def value(self, index):
         """
@@ -867,7 +1526,7 @@ class Attribute(JavaObject):
         :return: the label
         :rtype: str
         """
-        return javabridge.call(self.jobject, "value", "(I)Ljava/lang/String;", index)
+        return self._value(self.jobject, index)
 
     @property
     def num_values(self):
@@ -877,7 +1536,7 @@ class Attribute(JavaObject):
         :return: the number of labels
         :rtype: int
         """
-        return javabridge.call(self.jobject, "numValues", "()I")
+        return self._num_values(self.jobject)
 
     @property
     def values(self):
@@ -887,7 +1546,7 @@ class Attribute(JavaObject):
         :return: all the values, None if not NOMINAL, STRING, or RELATION
         :rtype: list
         """
-        enm = javabridge.call(self.jobject, "enumerateValues", "()Ljava/util/Enumeration;")
+        enm = self._enumerate_values(self.jobject)
         if enm is None:
             return None
         else:
@@ -901,7 +1560,7 @@ class Attribute(JavaObject):
         :return: the ordering (ORDERING_SYMBOLIC, ORDERING_ORDERED, ORDERING_MODULO)
         :rtype: int
         """
-        return javabridge.call(self.jobject, "ordering", "()I")
+        return self._ordering(self.jobject)
 
     @property
     def type(self):
@@ -911,7 +1570,7 @@ class Attribute(JavaObject):
         :return: the type
         :rtype: int
         """
-        return javabridge.call(self.jobject, "type", "()I")
+        return self._type(self.jobject)
 
     def type_str(self, short=False):
         """
@@ -937,7 +1596,7 @@ class Attribute(JavaObject):
         :return: whether averagable
         :rtype: bool
         """
-        return javabridge.call(self.jobject, "isAveragable", "()Z")
+        return self._is_averagable(self.jobject)
 
     @property
     def is_date(self):
@@ -947,7 +1606,7 @@ class Attribute(JavaObject):
         :return: whether date attribute
         :rtype: bool
         """
-        return javabridge.call(self.jobject, "isDate", "()Z")
+        return self._is_date(self.jobject)
 
     @property
     def is_nominal(self):
@@ -957,7 +1616,7 @@ class Attribute(JavaObject):
         :return: whether nominal attribute
         :rtype: bool
         """
-        return javabridge.call(self.jobject, "isNominal", "()Z")
+        return self._is_nominal(self.jobject)
 
     @property
     def is_numeric(self):
@@ -967,7 +1626,7 @@ class Attribute(JavaObject):
         :return: whether numeric attribute
         :rtype: bool
         """
-        return javabridge.call(self.jobject, "isNumeric", "()Z")
+        return self._is_numeric(self.jobject)
 
     @property
     def is_relation_valued(self):
@@ -977,7 +1636,7 @@ class Attribute(JavaObject):
         :return: whether relation valued attribute
         :rtype: bool
         """
-        return javabridge.call(self.jobject, "isRelationValued", "()Z")
+        return self._is_relation_valued(self.jobject)
 
     @property
     def is_string(self):
@@ -987,7 +1646,7 @@ class Attribute(JavaObject):
         :return: whether string attribute
         :rtype: bool
         """
-        return javabridge.call(self.jobject, "isString", "()Z")
+        return self._is_string(self.jobject)
 
     @property
     def date_format(self):
@@ -997,7 +1656,7 @@ class Attribute(JavaObject):
         :return: the format string
         :rtype: str
         """
-        return javabridge.call(self.jobject, "getDateFormat", "()Ljava/lang/String;")
+        return self._get_date_format(self.jobject)
 
     @property
     def lower_numeric_bound(self):
@@ -1007,7 +1666,7 @@ class Attribute(JavaObject):
         :return: the lower bound
         :rtype: float
         """
-        return javabridge.call(self.jobject, "getLowerNumericBound", "()D")
+        return self._get_lower_numeric_bound(self.jobject)
 
     @property
     def upper_numeric_bound(self):
@@ -1017,7 +1676,7 @@ class Attribute(JavaObject):
         :return: the upper bound
         :rtype: float
         """
-        return javabridge.call(self.jobject, "getUpperNumericBound", "()D")
+        return self._get_upper_numeric_bound(self.jobject)
 
     def is_in_range(self, value):
         """
@@ -1028,7 +1687,7 @@ class Attribute(JavaObject):
         :return: whether between lower and upper bound
         :rtype: bool
         """
-        return javabridge.call(self.jobject, "isInRange", "(D)Z", value)
+        return self._is_in_range(self.jobject, value)
 
     def add_string_value(self, s):
         """
@@ -1039,7 +1698,7 @@ class Attribute(JavaObject):
         :return: the index
         :rtype: int
         """
-        return javabridge.call(self.jobject, "addStringValue", "(Ljava/lang/String;)I", s)
+        return self._add_string_value(self.jobject, s)
 
     def add_relation(self, instances):
         """
@@ -1050,7 +1709,7 @@ class Attribute(JavaObject):
         :return: the index
         :rtype: int
         """
-        return javabridge.call(self.jobject, "addRelation", "(Lweka/core/Instances;)I", instances.jobject)
+        return self._add_relation(self.jobject, instances.jobject)
 
     def parse_date(self, s):
         """
@@ -1061,7 +1720,7 @@ class Attribute(JavaObject):
         :return: the internal format
         :rtype: float
         """
-        return javabridge.call(self.jobject, "parseDate", "(Ljava/lang/String;)D", s)
+        return self._parse_date(self.jobject, s)
 
     def equals(self, att):
         """
@@ -1072,7 +1731,7 @@ class Attribute(JavaObject):
         :return: whether the same
         :rtype: bool
         """
-        return javabridge.call(self.jobject, "equals", "(Lweka/core/Attribute;)Z", att.jobject)
+        return self._equals(self.jobject, att.jobject)
 
     def equals_msg(self, att):
         """
@@ -1084,7 +1743,7 @@ class Attribute(JavaObject):
         :return: None if the same, otherwise error message
         :rtype: str
         """
-        return javabridge.call(self.jobject, "equalsMsg", "(Lweka/core/Attribute;)Ljava/lang/String;", att.jobject)
+        return self._equals_msg(self.jobject, att.jobject)
 
     def copy(self, name=None):
         """
@@ -1097,10 +1756,10 @@ class Attribute(JavaObject):
         """
         if name is None:
             return Attribute(
-                javabridge.call(self.jobject, "copy", "()Ljava/lang/Object;"))
+                self._copy(self.jobject))
         else:
             return Attribute(
-                javabridge.call(self.jobject, "copy", "(Ljava/lang/String;)Lweka/core/Attribute;", name))
+                self._copy_with_name(self.jobject, name))
 
     @classmethod
     def create_numeric(cls, name):
@@ -1155,6 +1814,175 @@ class Attribute(JavaObject):
                 "weka/core/Attribute", "(Ljava/lang/String;Ljava/util/List;)V", name, None))
 
 
+def _to_label(value):
+    """
+    Turns the value into a string, leaving strings untouched.
+
+    :param value: the value to convert
+    :type value: object
+    :return: the string
+    :rtype: str
+    """
+    if isinstance(value, basestring):
+        return value
+    return str(value)
+
+
+def _arrow_concat(arrays):
+    """
+    Concatenates the float arrays generated from the chunks of an Arrow column.
+
+    :param arrays: the arrays to concatenate
+    :type arrays: list
+    :return: the combined array
+    :rtype: ndarray
+    """
+    if len(arrays) == 0:
+        return numpy.zeros(0, dtype=numpy.float64)
+    return numpy.concatenate(arrays)
+
+
+def _arrow_to_float(array):
+    """
+    Turns the (numeric) Arrow array into a float64 numpy array, with nulls as NaN.
+
+    :param array: the Arrow array to convert
+    :type array: pyarrow.Array
+    :return: the values
+    :rtype: ndarray
+    """
+    values = numpy.array(array.to_numpy(zero_copy_only=False), dtype=numpy.float64)
+    if array.null_count > 0:
+        values[numpy.asarray(array.is_null().to_numpy(zero_copy_only=False), dtype=bool)] = numpy.nan
+    return values
+
+
+def _arrow_dictionary_to_float(array, index_of):
+    """
+    Turns the dictionary-encoded Arrow array into a float64 numpy array of label/string indices,
+    with nulls as NaN.
+
+    :param array: the Arrow array to convert
+    :type array: pyarrow.DictionaryArray
+    :param index_of: the function that returns the index of a dictionary value
+    :type index_of: function
+    :return: the values
+    :rtype: ndarray
+    """
+    dictionary = []
+    for value in array.dictionary.to_pylist():
+        dictionary.append(index_of(_to_label(value)))
+    mapping = numpy.array(dictionary, dtype=numpy.float64)
+    indices = _arrow_to_float(array.indices)
+    present = ~numpy.isnan(indices)
+    result = numpy.empty(len(indices), dtype=numpy.float64)
+    result.fill(numpy.nan)
+    if len(mapping) > 0:
+        result[present] = mapping[indices[present].astype(numpy.int64)]
+    return result
+
+
+def _arrow_to_attribute(field, chunks):
+    """
+    Generates the attribute and the internal values for the chunks of an Arrow column.
+
+    :param field: the field describing the column
+    :type field: pyarrow.Field
+    :param chunks: the chunks of the column
+    :type chunks: list
+    :return: tuple of attribute and float64 values
+    :rtype: tuple
+    """
+    import pyarrow
+
+    typ = field.type
+    if pyarrow.types.is_dictionary(typ):
+        lookup = {}
+        values = _arrow_concat(
+            [_arrow_dictionary_to_float(chunk, lambda x: lookup.setdefault(x, len(lookup))) for chunk in chunks])
+        att = Attribute.create_nominal(field.name, sorted(lookup, key=lookup.get))
+    elif pyarrow.types.is_string(typ) or pyarrow.types.is_large_string(typ):
+        att = Attribute.create_string(field.name)
+        values = _arrow_concat(
+            [_arrow_dictionary_to_float(chunk.dictionary_encode(), att.add_string_value) for chunk in chunks])
+    elif pyarrow.types.is_timestamp(typ):
+        factor = {"s": 1000.0, "ms": 1.0, "us": 1e-3, "ns": 1e-6}[typ.unit]
+        values = _arrow_concat([_arrow_to_float(chunk.cast(pyarrow.int64())) for chunk in chunks]) * factor
+        att = Attribute.create_date(field.name)
+    elif pyarrow.types.is_date32(typ):
+        values = _arrow_concat([_arrow_to_float(chunk.cast(pyarrow.int32())) for chunk in chunks]) * 86400000.0
+        att = Attribute.create_date(field.name)
+    elif pyarrow.types.is_date64(typ):
+        values = _arrow_concat([_arrow_to_float(chunk.cast(pyarrow.int64())) for chunk in chunks])
+        att = Attribute.create_date(field.name)
+    elif pyarrow.types.is_integer(typ) or pyarrow.types.is_floating(typ) or pyarrow.types.is_boolean(typ):
+        values = _arrow_concat([_arrow_to_float(chunk) for chunk in chunks])
+        att = Attribute.create_numeric(field.name)
+    else:
+        raise Exception("Unsupported Arrow type for column '" + field.name + "': " + str(typ))
+    return att, values
+
+
+def _dataframe_attribute(name, series):
+    """
+    Generates the attribute for the column of a pandas DataFrame.
+
+    :param name: the name of the attribute
+    :type name: str
+    :param series: the column
+    :type series: pandas.Series
+    :return: the attribute
+    :rtype: Attribute
+    """
+    import pandas.api.types as ptypes
+
+    if ptypes.is_categorical_dtype(series):
+        return Attribute.create_nominal(name, [_to_label(c) for c in series.cat.categories])
+    elif ptypes.is_datetime64_any_dtype(series):
+        return Attribute.create_date(name)
+    elif ptypes.is_bool_dtype(series) or ptypes.is_numeric_dtype(series):
+        return Attribute.create_numeric(name)
+    elif ptypes.is_object_dtype(series) or ptypes.is_string_dtype(series):
+        return Attribute.create_string(name)
+    else:
+        raise Exception("Unsupported dtype for column '" + name + "': " + str(series.dtype))
+
+
+def _dataframe_column_to_float(series, att):
+    """
+    Turns the column of a pandas DataFrame into a float64 numpy array of internal values, with
+    missing values as NaN.
+
+    :param series: the column to convert
+    :type series: pandas.Series
+    :param att: the corresponding attribute
+    :type att: Attribute
+    :return: the values
+    :rtype: ndarray
+    """
+    import pandas
+
+    if att.is_nominal:
+        values = series.cat.codes.values.astype(numpy.float64)
+        values[values < 0] = numpy.nan
+    elif att.is_date:
+        if series.dt.tz is not None:
+            series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+        values = series.values.astype("datetime64[ms]").astype(numpy.int64).astype(numpy.float64)
+        values[series.isnull().values] = numpy.nan
+    elif att.is_string:
+        codes, uniques = pandas.factorize(series)
+        mapping = numpy.array([att.add_string_value(_to_label(u)) for u in uniques], dtype=numpy.float64)
+        values = numpy.empty(len(codes), dtype=numpy.float64)
+        values.fill(numpy.nan)
+        present = codes >= 0
+        if len(mapping) > 0:
+            values[present] = mapping[codes[present]]
+    else:
+        values = series.values.astype(numpy.float64)
+    return values
+
+
 class AttributeStats(JavaObject):
     """
     Container for attribute statistics.
@@ -1471,8 +2299,6 @@ def create_instances_from_lists(x, y, name="data"):
     atts.append(Attribute.create_numeric("y"))
     result = Instances.create_instances(name, atts, len(y))
     # add data
-    for i in xrange(len(x)):
-        values = x[i][:]
-        values.append(y[i])
-        result.add_instance(Instance.create_instance(values))
+    values = numpy.column_stack((numpy.array(x, dtype=numpy.float64), numpy.array(y, dtype=numpy.float64)))
+    result.add_ndarray(values)
     return result
@@ -22,6 +22,9 @@ import logging
 
 started = None
 
+# the functions to call before the JVM gets stopped
+shutdown_hooks = []
+
 # logging setup
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
@@ -82,6 +85,30 @@ def add_system_classpath():
             javabridge.JARS.append(part)
 
 
+def add_shutdown_hook(func):
+    """
+    Registers the function (without arguments) to call before the JVM gets stopped, e.g., for stopping
+    threads that are attached to the JVM, as these prevent it from shutting down. The hooks get called
+    in reverse order of registration.
+
+    :param func: the function to call
+    :type func: function
+    """
+    if func not in shutdown_hooks:
+        shutdown_hooks.append(func)
+
+
+def remove_shutdown_hook(func):
+    """
+    Removes the function from the functions to call before the JVM gets stopped.
+
+    :param func: the function to remove
+    :type func: function
+    """
+    if func in shutdown_hooks:
+        shutdown_hooks.remove(func)
+
+
 def start(class_path=None, bundled=True, packages=False, system_cp=False, max_heap_size=None):
     """
     Initializes the javabridge connection (starts up the JVM).
@@ -141,4 +168,10 @@ def stop():
     global started
     if started is not None:
         started = None
+        while len(shutdown_hooks) > 0:
+            hook = shutdown_hooks.pop()
+            try:
+                hook()
+            except Exception:
+                logger.exception("Shutdown hook failed: " + str(hook))
         javabridge.kill_vm()
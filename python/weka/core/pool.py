@@ -0,0 +1,580 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# pool.py
+# Copyright (C) 2016 Fracpete (pythonwekawrapper at gmail dot com)
+
+import os
+import sys
+import binascii
+import select
+import time
+import logging
+import multiprocessing
+import subprocess
+import threading
+import traceback
+import Queue
+import javabridge
+import weka.core.jvm as jvm
+import weka.core.serialization as serialization
+from weka.core.dataset import Instances
+from multiprocessing.connection import Listener, Client
+
+# logging setup
+logger = logging.getLogger(__name__)
+
+
+class Job(object):
+    """
+    A job submitted to a JVMPool, can be used to wait for the result.
+    """
+
+    def __init__(self, func, args, convert=None):
+        """
+        Initializes the job.
+
+        :param func: the module-level function to execute in the worker
+        :type func: function
+        :param args: the (picklable) arguments for the function
+        :type args: tuple
+        :param convert: the function to apply to the result in this process (eg for deserialization), can be None
+        :type convert: function
+        """
+        self.func = func
+        self.args = args
+        self.convert = convert
+        self._event = threading.Event()
+        self._result = None
+        self._error = None
+
+    def _finish(self, result=None, error=None):
+        """
+        Stores the result or the error and signals the waiting threads.
+
+        :param result: the result of the function
+        :param error: the error message, None if successful
+        :type error: str
+        """
+        self._result = result
+        self._error = error
+        self._event.set()
+
+    def done(self):
+        """
+        Returns whether the job has finished.
+
+        :return: True if finished
+        :rtype: bool
+        """
+        return self._event.is_set()
+
+    def get(self, timeout=None):
+        """
+        Waits for the job to finish and returns the result.
+
+        :param timeout: the number of seconds to wait, None to wait indefinitely
+        :type timeout: float
+        :return: the result of the function
+        """
+        if not self._event.wait(timeout):
+            raise Exception("Job did not finish within " + str(timeout) + " seconds!")
+        if self._error is not None:
+            raise Exception("Job failed:\n" + self._error)
+        if self.convert is not None:
+            return self.convert(self._result)
+        return self._result
+
+
+class JVMPool(object):
+    """
+    Pool of worker processes, each with its own JVM. Since javabridge only supports a single JVM per
+    process, this allows using multiple cores for Weka operations that are not multi-threaded themselves
+    and running long-lived services with multiple jobs.
+    Jobs consist of module-level functions and picklable arguments, Weka objects get shipped as bytes
+    (see serialization.to_bytes and serialization.from_bytes). The train, predict, evaluate and filter
+    methods take care of the serialization.
+    """
+
+    def __init__(self, num_workers=None, class_path=None, bundled=True, packages=False, max_heap_size=None,
+                 max_queue=0, max_jobs=None, start_timeout=60):
+        """
+        Initializes the pool. If no class_path is supplied and the JVM is running in this process,
+        the workers use the same classpath.
+
+        :param num_workers: the number of worker processes, None for the number of CPUs
+        :type num_workers: int
+        :param class_path: the additional classpath elements to add
+        :type class_path: list
+        :param bundled: whether to add jars from the "lib" directory
+        :type bundled: bool
+        :param packages: whether to add jars from Weka packages as well (bool) or an alternative Weka home directory (str)
+        :type packages: bool or str
+        :param max_heap_size: the maximum heap size of each worker (-Xmx parameter, eg 512m or 4g)
+        :type max_heap_size: str
+        :param max_queue: the maximum number of queued jobs, submit blocks when reached; 0 for unlimited
+        :type max_queue: int
+        :param max_jobs: the number of jobs after which a worker gets replaced with a fresh one, None for never
+        :type max_jobs: int
+        :param start_timeout: the maximum number of seconds to wait for a worker to start up its JVM
+        :type start_timeout: float
+        """
+        if num_workers is None:
+            num_workers = multiprocessing.cpu_count()
+        if (class_path is None) and (jvm.started is not None):
+            class_path = list(javabridge.JARS)
+            bundled = False
+        self.num_workers = num_workers
+        self.config = {
+            "class_path": class_path,
+            "bundled": bundled,
+            "packages": packages,
+            "max_heap_size": max_heap_size,
+        }
+        self.max_jobs = max_jobs
+        self.start_timeout = start_timeout
+        self._queue = Queue.Queue(max_queue)
+        self._lock = threading.Lock()
+        self._listener = None
+        self._authkey = None
+        self._threads = []
+        self._workers = []
+
+    def __enter__(self):
+        """
+        Starts the pool.
+
+        :return: the pool
+        :rtype: JVMPool
+        """
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Stops the pool.
+        """
+        self.stop()
+
+    @property
+    def is_running(self):
+        """
+        Returns whether the pool has been started.
+
+        :return: True if running
+        :rtype: bool
+        """
+        return len(self._threads) > 0
+
+    @property
+    def pending(self):
+        """
+        Returns the (approximate) number of queued jobs that haven't been picked up by a worker yet.
+
+        :return: the number of jobs
+        :rtype: int
+        """
+        return self._queue.qsize()
+
+    def _wait_for(self, process, ready, deadline):
+        """
+        Waits until ready returns True, as long as the process is alive and the deadline hasn't passed.
+        Kills the process in case of the deadline.
+
+        :param process: the worker process
+        :type process: subprocess.Popen
+        :param ready: the function that checks (for a short period) whether the worker is ready
+        :type ready: function
+        :param deadline: the time by which the worker has to be ready
+        :type deadline: float
+        :raises Exception: if the worker exited or did not start up in time
+        """
+        while not ready():
+            if process.poll() is not None:
+                raise Exception("Worker process exited during start up with code " + str(process.returncode) + "!")
+            if time.time() > deadline:
+                process.kill()
+                process.wait()
+                raise Exception("Worker process did not start up within " + str(self.start_timeout) + " seconds!")
+
+    def _spawn(self):
+        """
+        Launches a new worker process and waits for it to connect and start up its JVM.
+
+        :return: the process and the connection
+        :rtype: tuple
+        :raises Exception: if the worker fails to start up within start_timeout seconds
+        """
+        with self._lock:
+            env = os.environ.copy()
+            env["PYTHONPATH"] = os.pathsep.join([p for p in sys.path if len(p) > 0])
+            process = subprocess.Popen(
+                [sys.executable, "-m", "weka.core.pool", self._listener.address],
+                stdin=subprocess.PIPE, env=env)
+            process.stdin.write(binascii.hexlify(self._authkey) + "\n")
+            process.stdin.close()
+            deadline = time.time() + self.start_timeout
+            # Listener.accept has no timeout, so poll the listening socket
+            sock = self._listener._listener._socket
+            self._wait_for(process, lambda: len(select.select([sock], [], [], 0.5)[0]) > 0, deadline)
+            conn = self._listener.accept()
+            try:
+                conn.send(self.config)
+                self._wait_for(process, lambda: conn.poll(0.5), deadline)
+                status, value = conn.recv()
+            except Exception:
+                conn.close()
+                process.kill()
+                process.wait()
+                raise
+            if status != "ok":
+                conn.close()
+                process.wait()
+                raise Exception("Worker failed to start up:\n" + value)
+            return process, conn
+
+    def _retire(self, index, kill=False):
+        """
+        Shuts down the worker and replaces it with a fresh one.
+
+        :param index: the index of the worker
+        :type index: int
+        :param kill: whether to kill the process rather than asking it to stop
+        :type kill: bool
+        """
+        process, conn = self._workers[index]
+        try:
+            if kill:
+                process.kill()
+            else:
+                conn.send(None)
+        except Exception, e:
+            logger.warning("Failed to stop worker #" + str(index) + ": " + str(e))
+        conn.close()
+        process.wait()
+        self._workers[index] = None
+        self._workers[index] = self._spawn()
+
+    def _dispatch(self, index):
+        """
+        Sends the queued jobs to the worker, one at a time. Recycles the worker after max_jobs jobs
+        or if the connection fails. If a worker cannot be started, it is attempted again with the next
+        job, which fails with the error otherwise.
+
+        :param index: the index of the worker
+        :type index: int
+        """
+        count = 0
+        while True:
+            job = self._queue.get()
+            if job is None:
+                if self._workers[index] is not None:
+                    process, conn = self._workers[index]
+                    try:
+                        conn.send(None)
+                    except Exception, e:
+                        logger.warning("Failed to stop worker #" + str(index) + ": " + str(e))
+                    conn.close()
+                break
+            try:
+                if self._workers[index] is None:
+                    self._workers[index] = self._spawn()
+                    count = 0
+                process, conn = self._workers[index]
+                try:
+                    conn.send((job.func, job.args))
+                    status, value = conn.recv()
+                except Exception, e:
+                    job._finish(error="Worker connection failed: " + str(e))
+                    self._retire(index, kill=True)
+                    count = 0
+                    continue
+                if status == "ok":
+                    job._finish(result=value)
+                else:
+                    job._finish(error=value)
+                count += 1
+                if (self.max_jobs is not None) and (count >= self.max_jobs):
+                    logger.debug("Recycling worker #" + str(index) + " after " + str(count) + " jobs")
+                    self._retire(index)
+                    count = 0
+            except Exception:
+                logger.error("Worker #" + str(index) + " failed:\n" + traceback.format_exc())
+                if not job.done():
+                    job._finish(error=traceback.format_exc())
+
+    def start(self):
+        """
+        Launches the worker processes, each starting up its own JVM.
+        """
+        if self.is_running:
+            return
+        self._authkey = os.urandom(20)
+        self._listener = Listener(authkey=self._authkey)
+        try:
+            for i in xrange(self.num_workers):
+                self._workers.append(self._spawn())
+        except Exception:
+            for process, conn in self._workers:
+                conn.close()
+                process.kill()
+                process.wait()
+            self._workers = []
+            self._listener.close()
+            self._listener = None
+            raise
+        for i in xrange(self.num_workers):
+            thread = threading.Thread(target=self._dispatch, args=(i,))
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """
+        Shuts down the worker processes once all queued jobs have been processed.
+        """
+        for thread in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        for worker in self._workers:
+            if worker is not None:
+                worker[0].wait()
+        if self._listener is not None:
+            self._listener.close()
+        self._listener = None
+        self._threads = []
+        self._workers = []
+
+    def submit(self, func, *args):
+        """
+        Queues the function to be executed by one of the workers. The function must be defined
+        at module-level, the arguments must be picklable. Blocks if max_queue jobs are already waiting.
+
+        :param func: the function to execute
+        :type func: function
+        :param args: the arguments for the function
+        :return: the job, use its get method to obtain the result
+        :rtype: Job
+        """
+        return self.submit_job(Job(func, args))
+
+    def submit_job(self, job, timeout=None):
+        """
+        Queues the job to be executed by one of the workers. Blocks if max_queue jobs are already waiting.
+
+        :param job: the job to queue
+        :type job: Job
+        :param timeout: the maximum number of seconds to wait for a free slot in the queue, None for no limit
+        :type timeout: float
+        :return: the job
+        :rtype: Job
+        """
+        if not self.is_running:
+            raise Exception("Pool has not been started!")
+        try:
+            self._queue.put(job, timeout=timeout)
+        except Queue.Full:
+            raise Exception("Job queue still full after " + str(timeout) + " seconds!")
+        return job
+
+    def map(self, func, items):
+        """
+        Applies the function to each of the items using the workers and returns the results in
+        the same order.
+
+        :param func: the module-level function to apply
+        :type func: function
+        :param items: the picklable items to apply the function to
+        :type items: list
+        :return: the results
+        :rtype: list
+        """
+        jobs = [self.submit(func, item) for item in items]
+        return [job.get() for job in jobs]
+
+    def train(self, classifier, data):
+        """
+        Queues a job for building the classifier on the data.
+
+        :param classifier: the classifier to build
+        :type classifier: Classifier
+        :param data: the training data
+        :type data: Instances
+        :return: the job, returns the built Classifier
+        :rtype: Job
+        """
+        from weka.classifiers import Classifier
+        return self.submit_job(
+            Job(train_job, (serialization.to_bytes(classifier), serialization.to_bytes(data)),
+                convert=lambda x: Classifier(jobject=serialization.from_bytes(x))))
+
+    def predict(self, classifier, data):
+        """
+        Queues a job for making predictions with the built classifier.
+
+        :param classifier: the built classifier
+        :type classifier: Classifier
+        :param data: the data to make predictions for
+        :type data: Instances
+        :return: the job, returns the class distributions (rows x classes) as ndarray
+        :rtype: Job
+        """
+        return self.submit_job(
+            Job(predict_job, (serialization.to_bytes(classifier), serialization.to_bytes(data))))
+
+    def evaluate(self, classifier, train, test):
+        """
+        Queues a job for building the classifier on the training data and evaluating it on the test data.
+
+        :param classifier: the classifier to build and evaluate
+        :type classifier: Classifier
+        :param train: the training data
+        :type train: Instances
+        :param test: the test data
+        :type test: Instances
+        :return: the job, returns the Evaluation
+        :rtype: Job
+        """
+        from weka.classifiers import Evaluation
+        return self.submit_job(
+            Job(evaluate_job,
+                (serialization.to_bytes(classifier), serialization.to_bytes(train), serialization.to_bytes(test)),
+                convert=lambda x: Evaluation(jobject=serialization.from_bytes(x))))
+
+    def filter(self, flter, data):
+        """
+        Queues a job for initializing the filter with the data and filtering it.
+
+        :param flter: the filter to apply
+        :type flter: Filter
+        :param data: the data to filter
+        :type data: Instances
+        :return: the job, returns the filtered Instances
+        :rtype: Job
+        """
+        return self.submit_job(
+            Job(filter_job, (serialization.to_bytes(flter), serialization.to_bytes(data)),
+                convert=lambda x: Instances(serialization.from_bytes(x))))
+
+
+def train_job(classifier, data):
+    """
+    Builds the serialized classifier on the serialized data.
+
+    :param classifier: the serialized classifier
+    :type classifier: str
+    :param data: the serialized training data
+    :type data: str
+    :return: the serialized built classifier
+    :rtype: str
+    """
+    from weka.classifiers import Classifier
+    cls = Classifier(jobject=serialization.from_bytes(classifier))
+    cls.build_classifier(Instances(serialization.from_bytes(data)))
+    return serialization.to_bytes(cls)
+
+
+def predict_job(classifier, data):
+    """
+    Makes predictions with the serialized built classifier for the serialized data.
+
+    :param classifier: the serialized built classifier
+    :type classifier: str
+    :param data: the serialized data
+    :type data: str
+    :return: the class distributions (rows x classes)
+    :rtype: ndarray
+    """
+    from weka.classifiers import Classifier
+    cls = Classifier(jobject=serialization.from_bytes(classifier))
+    return cls.distributions_batch(Instances(serialization.from_bytes(data)))
+
+
+def evaluate_job(classifier, train, test):
+    """
+    Builds the serialized classifier on the serialized training data and evaluates it on the
+    serialized test data.
+
+    :param classifier: the serialized classifier template
+    :type classifier: str
+    :param train: the serialized training data
+    :type train: str
+    :param test: the serialized test data
+    :type test: str
+    :return: the serialized evaluation
+    :rtype: str
+    """
+    from weka.classifiers import Classifier, Evaluation
+    cls = Classifier(jobject=serialization.from_bytes(classifier))
+    train = Instances(serialization.from_bytes(train))
+    test = Instances(serialization.from_bytes(test))
+    cls.build_classifier(train)
+    evl = Evaluation(train)
+    evl.test_model(cls, test)
+    return serialization.to_bytes(evl)
+
+
+def filter_job(flter, data):
+    """
+    Initializes the serialized filter with the serialized data and filters it.
+
+    :param flter: the serialized filter
+    :type flter: str
+    :param data: the serialized data
+    :type data: str
+    :return: the serialized filtered data
+    :rtype: str
+    """
+    from weka.filters import Filter
+    flter = Filter(jobject=serialization.from_bytes(flter))
+    data = Instances(serialization.from_bytes(data))
+    flter.inputformat(data)
+    return serialization.to_bytes(flter.filter(data))
+
+
+def _work(address, authkey):
+    """
+    The worker loop: connects to the pool, starts the JVM and executes jobs until told to stop.
+
+    :param address: the address of the pool
+    :type address: str
+    :param authkey: the key for authenticating the connection
+    :type authkey: str
+    """
+    conn = Client(address, authkey=authkey)
+    try:
+        jvm.start(**conn.recv())
+    except Exception:
+        conn.send(("error", traceback.format_exc()))
+        conn.close()
+        raise
+    conn.send(("ok", None))
+    try:
+        while True:
+            msg = conn.recv()
+            if msg is None:
+                break
+            func, args = msg
+            try:
+                result = ("ok", func(*args))
+            except Exception:
+                result = ("error", traceback.format_exc())
+            conn.send(result)
+    finally:
+        conn.close()
+        jvm.stop()
+
+
+if __name__ == "__main__":
+    _work(sys.argv[1], binascii.unhexlify(sys.stdin.readline().strip()))
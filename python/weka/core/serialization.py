@@ -12,10 +12,11 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 # serialization.py
-# Copyright (C) 2014-2015 Fracpete (pythonwekawrapper at gmail dot com)
+# Copyright (C) 2014-2016 Fracpete (pythonwekawrapper at gmail dot com)
 
 import javabridge
 import logging
+import numpy
 import weka.core.classes as classes
 from weka.core.classes import JavaObject
 from javabridge.jutil import JavaException
@@ -120,3 +121,41 @@ def write_all(filename, jobjects):
         "Lweka/core/SerializationHelper;", "writeAll",
         "(Ljava/lang/String;[Ljava/lang/Object;)V",
         filename, array)
+
+
+def to_bytes(jobject):
+    """
+    Serializes the object in memory and returns the bytes. JavaObject instances get automatically unwrapped.
+    Useful for shipping objects to other processes.
+
+    :param jobject: the object to serialize
+    :type jobject: JB_Object or JavaObject
+    :return: the serialized object
+    :rtype: str
+    """
+    if isinstance(jobject, JavaObject):
+        jobject = jobject.jobject
+    stream = javabridge.make_instance("java/io/ByteArrayOutputStream", "()V")
+    javabridge.static_call(
+        "Lweka/core/SerializationHelper;", "write",
+        "(Ljava/io/OutputStream;Ljava/lang/Object;)V",
+        stream, jobject)
+    return javabridge.call(stream, "toByteArray", "()[B").tostring()
+
+
+def from_bytes(data):
+    """
+    Deserializes the object from the bytes generated by to_bytes. Caller must wrap object in appropriate
+    Python wrapper class.
+
+    :param data: the serialized object
+    :type data: str
+    :return: the JB_Object
+    :rtype: JB_Object
+    """
+    array = javabridge.get_env().make_byte_array(numpy.frombuffer(data, dtype=numpy.uint8))
+    stream = javabridge.make_instance("java/io/ByteArrayInputStream", "([B)V", array)
+    return javabridge.static_call(
+        "Lweka/core/SerializationHelper;", "read",
+        "(Ljava/io/InputStream;)Ljava/lang/Object;",
+        stream)
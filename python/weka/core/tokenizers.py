@@ -15,13 +15,19 @@
 # Copyright (C) 2015 Fracpete (pythonwekawrapper at gmail dot com)
 
 import javabridge
-from weka.core.classes import OptionHandler
+from weka.core.classes import OptionHandler, get_method_handle
 
 
 class TokenIterator(object):
     """
     Iterator for string tokens.
     """
+
+    __slots__ = ("tokenizer",)
+
+    _has_more = get_method_handle("weka/core/tokenizers/Tokenizer", "hasMoreElements", "()Z")
+    _next = get_method_handle("weka/core/tokenizers/Tokenizer", "nextElement", "()Ljava/lang/String;")
+
     def __init__(self, tokenizer):
         """
         Initializes the iterator.
@@ -30,8 +36,6 @@ class TokenIterator(object):
         :type tokenizer: Tokenizer
         """
         self.tokenizer = tokenizer
-        self.__has_more = javabridge.make_call(self.tokenizer.jobject, "hasMoreElements", "()Z")
-        self.__next = javabridge.make_call(self.tokenizer.jobject, "nextElement", "()Ljava/lang/String;")
 
     def __iter__(self):
         """
@@ -46,10 +50,10 @@ class TokenIterator(object):
         :return: the next row
         :rtype: Instance
         """
-        if not self.__has_more():
+        if not self._has_more(self.tokenizer.jobject):
             raise StopIteration()
         else:
-            return javabridge.get_env().get_string(self.__next())
+            return self._next(self.tokenizer.jobject)
 
 
 class Tokenizer(OptionHandler):
@@ -12,7 +12,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 # types.py
-# Copyright (C) 2014-2015 Fracpete (pythonwekawrapper at gmail dot com)
+# Copyright (C) 2014-2016 Fracpete (pythonwekawrapper at gmail dot com)
 
 import javabridge
 import logging
@@ -31,12 +31,8 @@ def string_array_to_list(a):
     :return: the string list
     :rtype: list
     """
-    result = []
-    length = javabridge.get_env().get_array_length(a)
-    wrapped = javabridge.get_env().get_object_array_elements(a)
-    for i in xrange(length):
-        result.append(javabridge.get_env().get_string(wrapped[i]))
-    return result
+    env = javabridge.get_env()
+    return [env.get_string(element) for element in env.get_object_array_elements(a)]
 
 
 def string_list_to_array(l):
@@ -48,32 +44,92 @@ def string_list_to_array(l):
     :rtype: java string array
     :return: JB_Object
     """
-    result = javabridge.get_env().make_object_array(len(l), javabridge.get_env().find_class("java/lang/String"))
+    env = javabridge.get_env()
+    result = env.make_object_array(len(l), env.find_class("java/lang/String"))
     for i in xrange(len(l)):
-        javabridge.get_env().set_object_array_element(result, i, javabridge.get_env().new_string_utf(l[i]))
+        env.set_object_array_element(result, i, env.new_string_utf(l[i]))
+    return result
+
+
+def _matrix_to_ndarray(m, get_elements, dtype, fill):
+    """
+    Turns the Java matrix (2-dim array) into a numpy 2-dim array, copying each row with a single call.
+    The number of columns is determined by the longest row, shorter (or null) rows get padded.
+
+    :param m: the matrix
+    :type m: JB_Object
+    :param get_elements: the JB_Env method for retrieving the elements of a row
+    :type get_elements: method
+    :param dtype: the numpy type of the result
+    :type dtype: type
+    :param fill: the value to use for padding jagged rows
+    :return: Numpy array
+    :rtype: numpy.ndarray
+    """
+    env = javabridge.get_env()
+    rows = [None if row is None else get_elements(row) for row in env.get_object_array_elements(m)]
+    num_cols = 0
+    for row in rows:
+        if (row is not None) and (len(row) > num_cols):
+            num_cols = len(row)
+    result = numpy.empty((len(rows), num_cols), dtype=dtype)
+    for i, row in enumerate(rows):
+        if row is None:
+            result[i, :] = fill
+            continue
+        result[i, :len(row)] = row
+        if len(row) < num_cols:
+            result[i, len(row):] = fill
     return result
 
 
-def double_matrix_to_ndarray(m):
+def double_matrix_to_ndarray(m, fill=numpy.nan):
     """
     Turns the Java matrix (2-dim array) of doubles into a numpy 2-dim array.
+    Handles arbitrary (rows x cols) matrices, jagged ones get padded with the fill value.
 
     :param m: the double matrix
     :type: JB_Object
+    :param fill: the value to use for padding jagged rows
+    :type fill: float
     :return: Numpy array
     :rtype: numpy.darray
     """
-    rows = javabridge.get_env().get_object_array_elements(m)
-    num = javabridge.get_env().get_array_length(m)
-    result = numpy.zeros(num * num).reshape((num, num))
-    i = 0
-    for row in rows:
-        elements = javabridge.get_env().get_double_array_elements(row)
-        n = 0
-        for element in elements:
-            result[i][n] = element
-            n += 1
-        i += 1
+    return _matrix_to_ndarray(m, javabridge.get_env().get_double_array_elements, numpy.float64, fill)
+
+
+def int_matrix_to_ndarray(m, fill=-1):
+    """
+    Turns the Java matrix (2-dim array) of ints into a numpy 2-dim array.
+    Handles arbitrary (rows x cols) matrices, jagged ones get padded with the fill value.
+
+    :param m: the int matrix
+    :type: JB_Object
+    :param fill: the value to use for padding jagged rows
+    :type fill: int
+    :return: Numpy array
+    :rtype: numpy.darray
+    """
+    return _matrix_to_ndarray(m, javabridge.get_env().get_int_array_elements, numpy.int32, fill)
+
+
+def ndarray_to_double_matrix(a):
+    """
+    Turns the numpy 2-dim array into a Java matrix (2-dim array) of doubles, copying each row with
+    a single call.
+
+    :param a: the numpy array
+    :type a: numpy.ndarray
+    :return: the double matrix
+    :rtype: JB_Object
+    """
+    a = numpy.asarray(a, dtype=numpy.float64)
+    if a.ndim != 2:
+        raise Exception("Expected 2-dim array, got: " + str(a.ndim))
+    env = javabridge.get_env()
+    result = env.make_object_array(a.shape[0], env.find_class("[D"))
+    for i in xrange(a.shape[0]):
+        env.set_object_array_element(result, i, env.make_double_array(numpy.ascontiguousarray(a[i])))
     return result
 
 
@@ -146,7 +146,7 @@ class DataGenerator(OptionHandler):
         :return: a finish comment
         :rtype: str
         """
-        return javabridge.call(self.jobject, "generateFinish", "()Ljava/lang/String;")
+        return javabridge.call(self.jobject, "generateFinished", "()Ljava/lang/String;")
 
     @classmethod
     def make_data(cls, generator, args):
@@ -1748,6 +1748,7 @@ class Predict(Transformer):
         super(Predict, self).__init__(name=name, config=config)
         self._model = None
         self._is_classifier = None
+        self._overrides_classify = None
 
     def description(self):
         """
@@ -1759,6 +1760,8 @@ class Predict(Transformer):
         return \
             "Uses the serialized model or, if pointing to a directory, the specified model from storage for "\
             "making a prediction on the incoming Instance object. The model can be either a Classifier or Clusterer.\n"\
+            "Classifications get derived from the class distribution, unless the classifier implements its own "\
+            "classifyInstance method.\n"\
             "Outputs either a ClassificationContainer or ClusteringContainer."
 
     @property
@@ -1835,12 +1838,23 @@ class Predict(Transformer):
             self._is_classifier = javabridge.is_instance_of(model, "weka/classifiers/Classifier")
             if self._is_classifier:
                 self._model = Classifier(jobject=model)
+                self._overrides_classify = javabridge.static_call(
+                    "weka/classifiers/ClassifierHelper", "overridesClassifyInstance",
+                    "(Lweka/classifiers/Classifier;)Z", model)
             else:
                 self._model = Clusterer(jobject=model)
 
         if self._is_classifier:
-            cls = self._model.classify_instance(inst)
+            # derive classification from distribution if possible, avoids evaluating the model twice
             dist = self._model.distribution_for_instance(inst)
+            if self._overrides_classify:
+                cls = self._model.classify_instance(inst)
+            elif not inst.class_attribute.is_nominal:
+                cls = dist[0]
+            elif sum(dist) == 0:
+                cls = float("nan")
+            else:
+                cls = float(dist.argmax())
             label = inst.class_attribute.value(int(cls))
             cont = ClassificationContainer(inst=inst, classification=cls, distribution=dist, label=label)
         else:
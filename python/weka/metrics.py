@@ -0,0 +1,371 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# metrics.py
+# Copyright (C) 2016 Fracpete (pythonwekawrapper at gmail dot com)
+
+"""
+Computes Weka's evaluation statistics from prediction arrays (as returned by
+weka.classifiers.Evaluation.predictions_array) using numpy only, i.e., without
+a running JVM. The definitions follow weka.classifiers.Evaluation and
+weka.classifiers.evaluation.ThresholdCurve. Metrics that require the class
+priors of the training data (eg relative errors, entropy-based metrics) or
+a cost matrix are not available.
+"""
+
+import numpy
+
+
+def _divide(num, denom):
+    """
+    Divides the numbers/arrays, returning 0 where the denominator is 0.
+
+    :param num: the numerator
+    :type num: float or ndarray
+    :param denom: the denominator
+    :type denom: float or ndarray
+    :return: the result
+    :rtype: float or ndarray
+    """
+    num = numpy.asarray(num, dtype=numpy.float64)
+    denom = numpy.asarray(denom, dtype=numpy.float64)
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        result = numpy.where(denom == 0, 0.0, num / numpy.where(denom == 0, 1.0, denom))
+    if result.ndim == 0:
+        return float(result)
+    return result
+
+
+def _weights(actual, weights):
+    """
+    Returns the weights as float array, 1.0 for all if None.
+
+    :param actual: the actual values
+    :type actual: ndarray
+    :param weights: the weights, can be None
+    :type weights: ndarray or list
+    :return: the weights
+    :rtype: ndarray
+    """
+    if weights is None:
+        return numpy.ones(len(actual), dtype=numpy.float64)
+    return numpy.asarray(weights, dtype=numpy.float64)
+
+
+def confusion_matrix(actual, predicted, num_classes, weights=None):
+    """
+    Computes the (weighted) confusion matrix (rows: actual, columns: predicted). Predictions with
+    missing actual or predicted values (NaN) are skipped.
+
+    :param actual: the actual class label indices
+    :type actual: ndarray
+    :param predicted: the predicted class label indices
+    :type predicted: ndarray
+    :param num_classes: the number of class labels
+    :type num_classes: int
+    :param weights: the weights of the predictions, None for 1.0
+    :type weights: ndarray
+    :return: the matrix
+    :rtype: ndarray
+    """
+    actual = numpy.asarray(actual, dtype=numpy.float64)
+    predicted = numpy.asarray(predicted, dtype=numpy.float64)
+    weights = _weights(actual, weights)
+    valid = ~numpy.isnan(actual) & ~numpy.isnan(predicted)
+    cells = actual[valid].astype(numpy.int64) * num_classes + predicted[valid].astype(numpy.int64)
+    counts = numpy.bincount(cells, weights=weights[valid], minlength=num_classes * num_classes)
+    return counts.reshape((num_classes, num_classes))
+
+
+def threshold_curve(actual, dists, class_index, weights=None):
+    """
+    Computes the points of the threshold curve for the class label, like Weka's ThresholdCurve:
+    one point per distinct probability (ascending), plus a final point with no positive predictions.
+
+    :param actual: the actual class label indices
+    :type actual: ndarray
+    :param dists: the class distributions (rows x classes)
+    :type dists: ndarray
+    :param class_index: the 0-based index of the class label
+    :type class_index: int
+    :param weights: the weights of the predictions, None for 1.0
+    :type weights: ndarray
+    :return: dictionary with arrays for threshold, tp, fp, fn, tn, tpr, fpr, precision, recall
+    :rtype: dict
+    """
+    actual = numpy.asarray(actual, dtype=numpy.float64)
+    weights = _weights(actual, weights)
+    valid = ~numpy.isnan(actual)
+    actual = actual[valid]
+    weights = weights[valid]
+    probs = numpy.asarray(dists, dtype=numpy.float64)[valid, class_index]
+    positive = numpy.where(actual == class_index, weights, 0.0)
+    negative = numpy.where(actual != class_index, weights, 0.0)
+    total_pos = positive.sum()
+    total_neg = negative.sum()
+
+    thresholds, inverse = numpy.unique(probs, return_inverse=True)
+    # weight of positives/negatives with a probability of at least the threshold
+    tp = numpy.cumsum(numpy.bincount(inverse, weights=positive, minlength=len(thresholds))[::-1])[::-1]
+    fp = numpy.cumsum(numpy.bincount(inverse, weights=negative, minlength=len(thresholds))[::-1])[::-1]
+    if (len(thresholds) == 0) or (tp[-1] != 0) or (fp[-1] != 0):
+        if len(thresholds) > 0:
+            last = thresholds[-1] + 10e-6
+        else:
+            last = 0.0
+        thresholds = numpy.append(thresholds, last)
+        tp = numpy.append(tp, 0.0)
+        fp = numpy.append(fp, 0.0)
+    fn = total_pos - tp
+    tn = total_neg - fp
+
+    return {
+        "threshold": thresholds,
+        "tp": tp,
+        "fp": fp,
+        "fn": fn,
+        "tn": tn,
+        "tpr": _divide(tp, tp + fn),
+        "fpr": _divide(fp, fp + tn),
+        "precision": _divide(tp, tp + fp),
+        "recall": _divide(tp, tp + fn),
+    }
+
+
+def roc_curve(actual, dists, class_index, weights=None):
+    """
+    Computes the ROC curve for the class label.
+
+    :param actual: the actual class label indices
+    :type actual: ndarray
+    :param dists: the class distributions (rows x classes)
+    :type dists: ndarray
+    :param class_index: the 0-based index of the class label
+    :type class_index: int
+    :param weights: the weights of the predictions, None for 1.0
+    :type weights: ndarray
+    :return: tuple of false positive rates, true positive rates and thresholds
+    :rtype: tuple
+    """
+    curve = threshold_curve(actual, dists, class_index, weights=weights)
+    return curve["fpr"], curve["tpr"], curve["threshold"]
+
+
+def prc_curve(actual, dists, class_index, weights=None):
+    """
+    Computes the precision-recall curve for the class label.
+
+    :param actual: the actual class label indices
+    :type actual: ndarray
+    :param dists: the class distributions (rows x classes)
+    :type dists: ndarray
+    :param class_index: the 0-based index of the class label
+    :type class_index: int
+    :param weights: the weights of the predictions, None for 1.0
+    :type weights: ndarray
+    :return: tuple of recall values, precision values and thresholds
+    :rtype: tuple
+    """
+    curve = threshold_curve(actual, dists, class_index, weights=weights)
+    return curve["recall"], curve["precision"], curve["threshold"]
+
+
+def area_under_roc(actual, dists, class_index, weights=None):
+    """
+    Computes the area under the ROC curve for the class label (like ThresholdCurve.getROCArea).
+
+    :param actual: the actual class label indices
+    :type actual: ndarray
+    :param dists: the class distributions (rows x classes)
+    :type dists: ndarray
+    :param class_index: the 0-based index of the class label
+    :type class_index: int
+    :param weights: the weights of the predictions, None for 1.0
+    :type weights: ndarray
+    :return: the area, NaN if not available
+    :rtype: float
+    """
+    curve = threshold_curve(actual, dists, class_index, weights=weights)
+    tp = curve["tp"]
+    fp = curve["fp"]
+    cip = tp - numpy.append(tp[1:], 0.0)
+    cin = fp - numpy.append(fp[1:], 0.0)
+    cum_neg = numpy.cumsum(cin) - cin
+    area = (cip * (cum_neg + 0.5 * cin)).sum()
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        return float(numpy.float64(area) / (fp[0] * tp[0]))
+
+
+def area_under_prc(actual, dists, class_index, weights=None):
+    """
+    Computes the area under the precision-recall curve for the class label (like
+    ThresholdCurve.getPRCArea).
+
+    :param actual: the actual class label indices
+    :type actual: ndarray
+    :param dists: the class distributions (rows x classes)
+    :type dists: ndarray
+    :param class_index: the 0-based index of the class label
+    :type class_index: int
+    :param weights: the weights of the predictions, None for 1.0
+    :type weights: ndarray
+    :return: the area, NaN if not available
+    :rtype: float
+    """
+    curve = threshold_curve(actual, dists, class_index, weights=weights)
+    precision = curve["precision"]
+    recall = curve["recall"]
+    area = (precision[:-1] * (recall[:-1] - recall[1:])).sum()
+    if area == 0:
+        return numpy.nan
+    return float(area)
+
+
+def _weighted_average(values, class_counts):
+    """
+    Averages the per-class values, weighted by the class counts (NaN values are ignored).
+
+    :param values: the per-class values
+    :type values: ndarray
+    :param class_counts: the counts per class
+    :type class_counts: ndarray
+    :return: the average
+    :rtype: float
+    """
+    usable = (class_counts > 0) & ~numpy.isnan(values)
+    return _divide((values[usable] * class_counts[usable]).sum(), class_counts.sum())
+
+
+def evaluate(actual, predicted, weights=None, dists=None):
+    """
+    Computes the statistics for the predictions. If class distributions are provided, the class is
+    treated as nominal, otherwise as numeric. The keys of the returned dictionary are the same as
+    for weka.classifiers.Evaluation.metrics; per-class metrics are numpy arrays.
+
+    :param actual: the actual values (label indices for nominal classes)
+    :type actual: ndarray
+    :param predicted: the predicted values, NaN for unclassified
+    :type predicted: ndarray
+    :param weights: the weights of the predictions, None for 1.0
+    :type weights: ndarray
+    :param dists: the class distributions (rows x classes) for nominal classes, None for numeric ones
+    :type dists: ndarray
+    :return: the statistics
+    :rtype: dict
+    """
+    actual = numpy.asarray(actual, dtype=numpy.float64)
+    predicted = numpy.asarray(predicted, dtype=numpy.float64)
+    weights = _weights(actual, weights)
+    with_class = ~numpy.isnan(actual)
+    classified = with_class & ~numpy.isnan(predicted)
+    total = weights[with_class].sum()
+    unclassified = total - weights[classified].sum()
+    num_classified = total - unclassified
+
+    result = {
+        "num_instances": float(total),
+        "unclassified": float(unclassified),
+        "percent_unclassified": 100.0 * _divide(unclassified, total),
+    }
+    w = weights[classified]
+
+    if dists is None:
+        a = actual[classified]
+        p = predicted[classified]
+        mae = _divide((w * numpy.abs(p - a)).sum(), num_classified)
+        rmse = numpy.sqrt(_divide((w * (p - a) ** 2).sum(), num_classified))
+        var_actual = (w * a * a).sum() - (w * a).sum() ** 2 / num_classified
+        var_predicted = (w * p * p).sum() - (w * p).sum() ** 2 / num_classified
+        var_prod = (w * a * p).sum() - (w * a).sum() * (w * p).sum() / num_classified
+        if var_actual * var_predicted <= 0:
+            correlation = 0.0
+        else:
+            correlation = var_prod / numpy.sqrt(var_actual * var_predicted)
+        result["mean_absolute_error"] = float(mae)
+        result["root_mean_squared_error"] = float(rmse)
+        result["error_rate"] = float(rmse)
+        result["correlation_coefficient"] = float(correlation)
+        return result
+
+    dists = numpy.asarray(dists, dtype=numpy.float64)
+    num_classes = dists.shape[1]
+    matrix = confusion_matrix(actual, predicted, num_classes, weights=weights)
+    tp = numpy.diag(matrix)
+    fp = matrix.sum(axis=0) - tp
+    fn = matrix.sum(axis=1) - tp
+    tn = matrix.sum() - tp - fp - fn
+    class_counts = matrix.sum(axis=1)
+    present = class_counts > 0
+    correct = tp.sum()
+    incorrect = matrix.sum() - correct
+
+    precision = _divide(tp, tp + fp)
+    recall = _divide(tp, tp + fn)
+    f_measure = _divide(2 * precision * recall, precision + recall)
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        mcc = (tp * tn - fp * fn) / numpy.sqrt((tp + fp) * (tp + fn) * (tn + fp) * (tn + fn))
+    auc = numpy.array([area_under_roc(actual, dists, i, weights=weights) for i in xrange(num_classes)])
+    prc = numpy.array([area_under_prc(actual, dists, i, weights=weights) for i in xrange(num_classes)])
+
+    sum_rows = matrix.sum(axis=1)
+    sum_cols = matrix.sum(axis=0)
+    sum_weights = matrix.sum()
+    chance = _divide((sum_rows * sum_cols).sum(), sum_weights * sum_weights)
+    if chance < 1:
+        kappa = (_divide(correct, sum_weights) - chance) / (1 - chance)
+    else:
+        kappa = 1.0
+
+    onehot = numpy.zeros(dists.shape)
+    onehot[numpy.flatnonzero(classified), actual[classified].astype(numpy.int64)] = 1.0
+    diff = (dists - onehot)[classified]
+    mae = _divide((w * numpy.abs(diff).sum(axis=1) / num_classes).sum(), num_classified)
+    rmse = numpy.sqrt(_divide((w * (diff ** 2).sum(axis=1) / num_classes).sum(), num_classified))
+
+    result.update({
+        "correct": float(correct),
+        "incorrect": float(incorrect),
+        "percent_correct": 100.0 * _divide(correct, total),
+        "percent_incorrect": 100.0 * _divide(incorrect, total),
+        "error_rate": _divide(incorrect, total),
+        "kappa": float(kappa),
+        "mean_absolute_error": float(mae),
+        "root_mean_squared_error": float(rmse),
+        "num_true_positives": tp,
+        "num_false_positives": fp,
+        "num_true_negatives": tn,
+        "num_false_negatives": fn,
+        "true_positive_rate": recall,
+        "false_positive_rate": _divide(fp, fp + tn),
+        "true_negative_rate": _divide(tn, fp + tn),
+        "false_negative_rate": _divide(fn, tp + fn),
+        "precision": precision,
+        "recall": recall,
+        "f_measure": f_measure,
+        "matthews_correlation_coefficient": mcc,
+        "area_under_roc": auc,
+        "area_under_prc": prc,
+        "weighted_true_positive_rate": _weighted_average(recall, class_counts),
+        "weighted_false_positive_rate": _weighted_average(_divide(fp, fp + tn), class_counts),
+        "weighted_true_negative_rate": _weighted_average(_divide(tn, fp + tn), class_counts),
+        "weighted_false_negative_rate": _weighted_average(_divide(fn, tp + fn), class_counts),
+        "weighted_precision": _weighted_average(precision, class_counts),
+        "weighted_recall": _weighted_average(recall, class_counts),
+        "weighted_f_measure": _weighted_average(f_measure, class_counts),
+        "weighted_matthews_correlation": _weighted_average(mcc, class_counts),
+        "weighted_area_under_roc": _weighted_average(auc, class_counts),
+        "weighted_area_under_prc": _weighted_average(prc, class_counts),
+        "unweighted_macro_f_measure": float(f_measure[present].mean()) if present.any() else numpy.nan,
+        "unweighted_micro_f_measure": _divide(2 * tp.sum(), 2 * tp.sum() + fn.sum() + fp.sum()),
+    })
+    return result
@@ -0,0 +1,362 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# parallel.py
+# Copyright (C) 2016 Fracpete (pythonwekawrapper at gmail dot com)
+
+import logging
+import multiprocessing
+import threading
+import traceback
+import Queue
+import javabridge
+import numpy
+import weka.core.serialization as serialization
+from weka.core.classes import Random, SetupGenerator, AbstractParameter
+from weka.core.dataset import Instances
+from weka.core.pool import JVMPool, evaluate_job
+from weka.classifiers import Classifier, Evaluation, AggregateableEvaluation
+
+# logging setup
+logger = logging.getLogger(__name__)
+
+
+# the supported metrics (properties of Evaluation) and whether they get maximized
+METRICS = {
+    "percent_correct": True,
+    "kappa": True,
+    "weighted_area_under_roc": True,
+    "weighted_area_under_prc": True,
+    "weighted_f_measure": True,
+    "correlation_coefficient": True,
+    "percent_incorrect": False,
+    "error_rate": False,
+    "mean_absolute_error": False,
+    "root_mean_squared_error": False,
+    "relative_absolute_error": False,
+    "root_relative_squared_error": False,
+}
+
+# the metrics to record by default, depending on the class type
+NOMINAL_METRICS = ["percent_correct", "kappa", "weighted_area_under_roc", "weighted_f_measure",
+                   "mean_absolute_error", "root_mean_squared_error"]
+NUMERIC_METRICS = ["correlation_coefficient", "mean_absolute_error", "root_mean_squared_error",
+                   "relative_absolute_error", "root_relative_squared_error"]
+
+
+def cv_folds(data, num_folds, rnd):
+    """
+    Generates the train/test pairs for cross-validation the same way as Weka's
+    Evaluation.crossValidateModel does (randomization, stratification for nominal classes).
+
+    :param data: the data to split
+    :type data: Instances
+    :param num_folds: the number of folds
+    :type num_folds: int
+    :param rnd: the random number generator to use
+    :type rnd: Random
+    :return: the list of (train, test) tuples
+    :rtype: list
+    """
+    data = Instances.copy_instances(data)
+    data.randomize(rnd)
+    if data.class_attribute.is_nominal:
+        data.stratify(num_folds)
+    result = []
+    for i in xrange(num_folds):
+        result.append((data.train_cv(num_folds, i, rnd), data.test_cv(num_folds, i)))
+    return result
+
+
+def crossvalidate_model(classifier, data, num_folds, rnd, pool=None, num_workers=None):
+    """
+    Cross-validates the classifier, evaluating the folds in parallel using the worker processes of
+    a JVMPool. Data and models get shipped to the workers in serialized form, the evaluations of the
+    folds get aggregated into a single evaluation.
+
+    :param classifier: the classifier to cross-validate
+    :type classifier: Classifier
+    :param data: the data to evaluate on
+    :type data: Instances
+    :param num_folds: the number of folds
+    :type num_folds: int
+    :param rnd: the random number generator to use
+    :type rnd: Random
+    :param pool: the pool to use, if None a temporary one gets started
+    :type pool: JVMPool
+    :param num_workers: the number of workers for the temporary pool, None for the number of folds/CPUs
+    :type num_workers: int
+    :return: the aggregated evaluation
+    :rtype: AggregateableEvaluation
+    """
+    result = AggregateableEvaluation(Evaluation(data))
+    template = serialization.to_bytes(classifier)
+    folds = cv_folds(data, num_folds, rnd)
+
+    temporary = pool is None
+    if temporary:
+        pool = JVMPool(num_workers=num_workers)
+        if (num_workers is None) and (pool.num_workers > num_folds):
+            pool.num_workers = num_folds
+        pool.start()
+    try:
+        jobs = []
+        for train, test in folds:
+            jobs.append(
+                pool.submit(evaluate_job, template, serialization.to_bytes(train), serialization.to_bytes(test)))
+        for job in jobs:
+            result.aggregate(serialization.from_bytes(job.get()))
+    finally:
+        if temporary:
+            pool.stop()
+
+    return result
+
+
+def _evaluate_fold_jvm(classifier, train, test):
+    """
+    Trains a copy of the classifier on a copy of the training fold and evaluates it on the test fold.
+    Executed by the threads of ParallelSearch.
+
+    :param classifier: the classifier template
+    :type classifier: Classifier
+    :param train: the training fold
+    :type train: Instances
+    :param test: the test fold
+    :type test: Instances
+    :return: the evaluation of the fold
+    :rtype: Evaluation
+    """
+    cls = Classifier.make_copy(classifier)
+    train = Instances.copy_instances(train)
+    cls.build_classifier(train)
+    evl = Evaluation(train)
+    evl.test_model(cls, test)
+    return evl
+
+
+def _run_threads(func, tasks, num_threads):
+    """
+    Executes the function for each of the tasks (tuples of arguments) using threads that are
+    attached to the JVM.
+
+    :param func: the function to execute
+    :type func: function
+    :param tasks: the list of argument tuples
+    :type tasks: list
+    :param num_threads: the number of threads to use
+    :type num_threads: int
+    :return: the results, in the same order as the tasks
+    :rtype: list
+    """
+    results = [None] * len(tasks)
+    errors = []
+    queue = Queue.Queue()
+    for item in enumerate(tasks):
+        queue.put(item)
+
+    def work():
+        javabridge.attach()
+        try:
+            while len(errors) == 0:
+                try:
+                    i, task = queue.get_nowait()
+                except Queue.Empty:
+                    break
+                try:
+                    results[i] = func(*task)
+                except Exception:
+                    errors.append(traceback.format_exc())
+        finally:
+            javabridge.detach()
+
+    threads = [threading.Thread(target=work) for i in xrange(min(num_threads, len(tasks)))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if len(errors) > 0:
+        raise Exception("Evaluation failed:\n" + errors[0])
+    return results
+
+
+class ParallelSearch(object):
+    """
+    Evaluates parameter setups of a classifier concurrently, either using threads within the running
+    JVM or the worker processes of a JVMPool. All setups get cross-validated on the same folds.
+    Optionally, setups that are clearly worse than the best one after the first folds get abandoned.
+    Setups with a non-finite value (eg NaN) for the metric are never selected as the best one.
+    """
+
+    def __init__(self, setups, classifier=None, metric=None, metrics=None, num_folds=10, seed=1,
+                 num_threads=None, pool=None, abandon_folds=None, abandon_margin=0.0):
+        """
+        Initializes the search.
+
+        :param setups: the SetupGenerator, the list of parameters (MathParameter/ListParameter) to apply to
+                       the classifier or the list of Classifier objects to evaluate
+        :type setups: SetupGenerator or list
+        :param classifier: the base classifier, required when supplying a list of parameters
+        :type classifier: Classifier
+        :param metric: the metric to select the best setup with (see METRICS), None for percent_correct
+                       with nominal and root_mean_squared_error with numeric classes
+        :type metric: str
+        :param metrics: the metrics to record in the results, None for the defaults of the class type
+        :type metrics: list
+        :param num_folds: the number of cross-validation folds
+        :type num_folds: int
+        :param seed: the seed value for randomizing the data
+        :type seed: int
+        :param num_threads: the number of threads to use, None for the number of CPUs (ignored if pool is supplied)
+        :type num_threads: int
+        :param pool: the pool of workers to use instead of threads
+        :type pool: JVMPool
+        :param abandon_folds: the number of folds after which to abandon clearly bad setups, None to evaluate all
+        :type abandon_folds: int
+        :param abandon_margin: setups that are worse than the best one by more than this margin get abandoned
+        :type abandon_margin: float
+        """
+        if isinstance(setups, list) and (len(setups) > 0) and isinstance(setups[0], AbstractParameter):
+            if classifier is None:
+                raise Exception("Base classifier required when supplying parameters!")
+            generator = SetupGenerator()
+            generator.base_object = classifier
+            generator.parameters = setups
+            setups = generator
+        if metric is not None and metric not in METRICS:
+            raise Exception("Unsupported metric: " + metric)
+        if (abandon_folds is not None) and ((abandon_folds < 1) or (abandon_folds >= num_folds)):
+            raise Exception("Number of folds for abandoning setups must be between 1 and " + str(num_folds - 1))
+        self.setups = setups
+        self.metric = metric
+        self.metrics = metrics
+        self.num_folds = num_folds
+        self.seed = seed
+        self.num_threads = num_threads
+        self.pool = pool
+        self.abandon_folds = abandon_folds
+        self.abandon_margin = abandon_margin
+        self.best = None
+        self.results = None
+
+    def _classifiers(self):
+        """
+        Returns the classifiers to evaluate.
+
+        :return: the classifier setups
+        :rtype: list
+        """
+        if isinstance(self.setups, SetupGenerator):
+            return [Classifier(jobject=setup.jobject) for setup in self.setups.setups()]
+        else:
+            return list(self.setups)
+
+    def _evaluate(self, classifiers, folds, tasks):
+        """
+        Evaluates the (setup, fold) tasks.
+
+        :param classifiers: the classifier setups
+        :type classifiers: list
+        :param folds: the list of (train, test) tuples
+        :type folds: list
+        :param tasks: the list of (setup index, fold index) tuples
+        :type tasks: list
+        :return: the fold evaluations, in the same order as the tasks
+        :rtype: list
+        """
+        if self.pool is None:
+            num_threads = self.num_threads
+            if num_threads is None:
+                num_threads = multiprocessing.cpu_count()
+            return _run_threads(
+                _evaluate_fold_jvm, [(classifiers[s], folds[f][0], folds[f][1]) for s, f in tasks], num_threads)
+        else:
+            templates = {}
+            serialized = {}
+            jobs = []
+            for s, f in tasks:
+                if s not in templates:
+                    templates[s] = serialization.to_bytes(classifiers[s])
+                if f not in serialized:
+                    serialized[f] = (serialization.to_bytes(folds[f][0]), serialization.to_bytes(folds[f][1]))
+                jobs.append(self.pool.submit(evaluate_job, templates[s], serialized[f][0], serialized[f][1]))
+            return [serialization.from_bytes(job.get()) for job in jobs]
+
+    def search(self, data):
+        """
+        Evaluates all the setups on the data and builds the best one on the full data.
+
+        :param data: the data to use
+        :type data: Instances
+        :return: the best classifier (trained) and the results table
+        :rtype: tuple
+        """
+        nominal = data.class_attribute.is_nominal
+        metric = self.metric
+        if metric is None:
+            metric = "percent_correct" if nominal else "root_mean_squared_error"
+        metrics = self.metrics
+        if metrics is None:
+            metrics = NOMINAL_METRICS if nominal else NUMERIC_METRICS
+        if metric not in metrics:
+            metrics = [metric] + list(metrics)
+        maximize = METRICS[metric]
+
+        classifiers = self._classifiers()
+        if len(classifiers) == 0:
+            raise Exception("No setups to evaluate!")
+        folds = cv_folds(data, self.num_folds, Random(self.seed))
+        evaluations = [AggregateableEvaluation(Evaluation(data)) for cls in classifiers]
+        num_evaluated = [0] * len(classifiers)
+        abandoned = [False] * len(classifiers)
+
+        if self.abandon_folds is None:
+            rounds = [range(self.num_folds)]
+        else:
+            rounds = [range(self.abandon_folds), range(self.abandon_folds, self.num_folds)]
+        for i, fold_range in enumerate(rounds):
+            active = [s for s in xrange(len(classifiers)) if not abandoned[s]]
+            tasks = [(s, f) for s in active for f in fold_range]
+            for (s, f), evl in zip(tasks, self._evaluate(classifiers, folds, tasks)):
+                evaluations[s].aggregate(evl)
+                num_evaluated[s] += 1
+            if (i == 0) and (self.abandon_folds is not None):
+                values = dict([(s, getattr(evaluations[s], metric)) for s in active])
+                finite = [v for v in values.values() if numpy.isfinite(v)]
+                if len(finite) == 0:
+                    continue
+                best = max(finite) if maximize else min(finite)
+                for s in active:
+                    # setups with non-finite values (eg NaN) cannot compete
+                    if not numpy.isfinite(values[s]) or (abs(values[s] - best) > self.abandon_margin):
+                        abandoned[s] = True
+                        logger.debug("Abandoned setup #" + str(s) + ": " + metric + "=" + str(values[s]))
+
+        dtype = [("setup", object), ("folds", numpy.int32), ("abandoned", numpy.bool_)]
+        dtype.extend([(m, numpy.float64) for m in metrics])
+        self.results = numpy.zeros(len(classifiers), dtype=dtype)
+        for s, cls in enumerate(classifiers):
+            row = [cls.to_commandline(), num_evaluated[s], abandoned[s]]
+            row.extend([getattr(evaluations[s], m) for m in metrics])
+            self.results[s] = tuple(row)
+
+        candidates = [s for s in xrange(len(classifiers))
+                      if not abandoned[s] and numpy.isfinite(self.results[metric][s])]
+        if len(candidates) == 0:
+            raise Exception("No setup with a finite value for " + metric + "!")
+        values = self.results[metric][candidates]
+        index = candidates[numpy.argmax(values) if maximize else numpy.argmin(values)]
+        self.best = Classifier.make_copy(classifiers[index])
+        self.best.build_classifier(data)
+
+        return self.best, self.results
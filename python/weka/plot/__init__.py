@@ -14,7 +14,6 @@
 # __init__.py
 # Copyright (C) 2014 Fracpete (pythonwekawrapper at gmail dot com)
 
-from weka.core.dataset import Instances
 from weka.core.classes import Random
 
 # check whether pygraphviz is there
@@ -54,7 +53,5 @@ def create_subsample(data, percent, seed=1):
     """
     if percent <= 0 or percent >= 100:
         return data
-    data = Instances.copy_instances(data)
-    data.randomize(Random(seed))
-    data = Instances.copy_instances(data, 0, int(round(data.num_instances * percent / 100.0)))
-    return data
+    indices = data.random_order(Random(seed))
+    return data.take(indices[0:int(round(data.num_instances * percent / 100.0))])
@@ -337,27 +337,30 @@ def plot_learning_curve(classifiers, train, test=None, increments=100, metric="p
         for t in tst:
             evls[cl][t] = []
 
-    for i in xrange(train.num_instances):
-        if (i > 0) and (i % inc == 0):
-            steps.append(i+1)
+    for cl in cls:
+        if cl.is_updateable:
+            tr = Instances.copy_instances(train, 0, 1)
+            cl.build_classifier(tr)
+
+    last = 0
+    for i in xrange(1, train.num_instances):
+        if i % inc != 0:
+            continue
+        steps.append(i+1)
         for cl in cls:
             # train
             if cl.is_updateable:
-                if i == 0:
-                    tr = Instances.copy_instances(train, 0, 1)
-                    cl.build_classifier(tr)
-                else:
-                    cl.update_classifier(train.get_instance(i))
+                tr = Instances.copy_instances(train, last + 1, i - last)
+                cl.train_incremental(tr, initialize=False)
             else:
-                if (i > 0) and (i % inc == 0):
-                    tr = Instances.copy_instances(train, 0, i + 1)
-                    cl.build_classifier(tr)
+                tr = Instances.copy_instances(train, 0, i + 1)
+                cl.build_classifier(tr)
             # evaluate
-            if (i > 0) and (i % inc == 0):
-                for t in tst:
-                    evl = Evaluation(t)
-                    evl.test_model(cl, t)
-                    evls[cl][t].append(getattr(evl, metric))
+            for t in tst:
+                evl = Evaluation(t)
+                evl.test_model(cl, t)
+                evls[cl][t].append(getattr(evl, metric))
+        last = i
 
     fig, ax = plt.subplots()
     ax.set_xlabel("# of instances")
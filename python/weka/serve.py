@@ -0,0 +1,706 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# serve.py
+# Copyright (C) 2016 Fracpete (pythonwekawrapper at gmail dot com)
+
+"""
+Serves predictions of serialized classifiers over a Unix domain socket or a local TCP socket, using
+a compact binary framing (all numbers little-endian):
+
+Request: op (uint8), length of model name (uint16), rows (uint32), columns (uint32), model name (UTF-8),
+rows * columns float64 values (row after row, internal format, NaN for missing; the class column can
+be omitted).
+
+Response: status (uint8), rows (uint32), columns (uint32), payload. For successful predictions, the
+payload consists of rows * columns float64 values (the class distributions, or the predicted value
+for numeric classes). For statistics (OP_STATS) and errors, rows is the number of bytes of the UTF-8
+payload (JSON or error message) and columns is 0.
+
+Concurrent requests for the same model get combined into a single batch prediction inside the JVM.
+Requests whose values exceed the maximum request size get rejected with an error and the connection
+gets closed.
+"""
+
+import os
+import stat
+import json
+import time
+import struct
+import socket
+import logging
+import argparse
+import threading
+import traceback
+import Queue
+import SocketServer
+import javabridge
+import numpy
+import weka.core.jvm as jvm
+import weka.core.serialization as serialization
+from weka.core.dataset import Instances
+from weka.classifiers import Classifier
+
+# logging setup
+logger = logging.getLogger(__name__)
+
+OP_PREDICT = 0
+""" predicts the rows """
+
+OP_STATS = 1
+""" returns the counters as JSON """
+
+STATUS_OK = 0
+""" request was successful """
+
+STATUS_ERROR = 1
+""" request failed """
+
+REQUEST_HEADER = struct.Struct("<BHII")
+""" op, length of model name, rows, columns """
+
+RESPONSE_HEADER = struct.Struct("<BII")
+""" status, rows, columns """
+
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+""" the default maximum number of bytes of the values of a request """
+
+
+def load_model(filename, header=None):
+    """
+    Loads the serialized classifier. Unless provided, the dataset structure must be stored in the file
+    as well (following the classifier, like Weka does).
+
+    :param filename: the serialized model to load
+    :type filename: str
+    :param header: the dataset structure to use, None to use the one from the file
+    :type header: Instances
+    :return: tuple of classifier and header
+    :rtype: tuple
+    """
+    objects = serialization.read_all(filename)
+    if (objects is None) or (len(objects) == 0):
+        raise Exception("No objects stored in: " + filename)
+    classifier = Classifier(jobject=objects[0])
+    if (header is None) and (len(objects) > 1) and javabridge.is_instance_of(objects[1], "weka/core/Instances"):
+        header = Instances(objects[1])
+    if header is None:
+        raise Exception("No dataset structure available for: " + filename)
+    if header.class_index < 0:
+        header.class_is_last()
+    return classifier, header
+
+
+class Counters(object):
+    """
+    Thread-safe latency and throughput counters of a model.
+    """
+
+    def __init__(self):
+        """
+        Initializes the counters.
+        """
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.errors = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def update(self, requests, rows, latencies, error=False):
+        """
+        Records a processed batch.
+
+        :param requests: the number of requests in the batch
+        :type requests: int
+        :param rows: the number of rows in the batch
+        :type rows: int
+        :param latencies: the latencies of the requests in seconds (from receiving to answering)
+        :type latencies: list
+        :param error: whether the batch failed
+        :type error: bool
+        """
+        with self._lock:
+            self.batches += 1
+            self.requests += requests
+            self.rows += rows
+            if error:
+                self.errors += requests
+            self.latency_total += sum(latencies)
+            self.latency_max = max([self.latency_max] + latencies)
+
+    def to_dict(self):
+        """
+        Returns the counters and the statistics derived from them.
+
+        :return: the statistics
+        :rtype: dict
+        """
+        with self._lock:
+            elapsed = time.time() - self.started
+            return {
+                "requests": self.requests,
+                "rows": self.rows,
+                "batches": self.batches,
+                "errors": self.errors,
+                "uptime": elapsed,
+                "mean_latency": self.latency_total / self.requests if self.requests > 0 else 0.0,
+                "max_latency": self.latency_max,
+                "mean_batch_size": float(self.rows) / self.batches if self.batches > 0 else 0.0,
+                "rows_per_second": self.rows / elapsed if elapsed > 0 else 0.0,
+                "requests_per_second": self.requests / elapsed if elapsed > 0 else 0.0,
+            }
+
+
+class Request(object):
+    """
+    A pending prediction request.
+    """
+
+    def __init__(self, values):
+        """
+        Initializes the request.
+
+        :param values: the rows to predict
+        :type values: ndarray
+        """
+        self.values = values
+        self.received = time.time()
+        self.result = None
+        self.error = None
+        self._event = threading.Event()
+
+    def finish(self, result=None, error=None):
+        """
+        Stores the result or the error and signals the waiting thread.
+
+        :param result: the predictions
+        :type result: ndarray
+        :param error: the error message, None if successful
+        :type error: str
+        """
+        self.result = result
+        self.error = error
+        self._event.set()
+
+    def wait(self):
+        """
+        Waits for the request to finish.
+
+        :return: the predictions
+        :rtype: ndarray
+        """
+        self._event.wait()
+        if self.error is not None:
+            raise Exception(self.error)
+        return self.result
+
+
+class ModelWorker(object):
+    """
+    Thread (attached to the JVM) that combines the queued requests for a model into batches.
+    """
+
+    def __init__(self, classifier, header, max_batch_size=256, max_delay=0.002):
+        """
+        Initializes the worker.
+
+        :param classifier: the trained classifier
+        :type classifier: Classifier
+        :param header: the dataset structure the classifier was trained on
+        :type header: Instances
+        :param max_batch_size: the maximum number of rows per batch (a single request is never split)
+        :type max_batch_size: int
+        :param max_delay: the maximum time in seconds to wait for further requests before predicting
+        :type max_delay: float
+        """
+        self.classifier = classifier
+        self.header = Instances.template_instances(header)
+        self.num_attributes = header.num_attributes
+        self.class_index = header.class_index
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.counters = Counters()
+        self._queue = Queue.Queue()
+        self._thread = None
+
+    def start(self):
+        """
+        Starts the worker thread.
+        """
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the worker thread, once the queued requests have been processed.
+        """
+        thread = self._thread
+        if thread is not None:
+            self._thread = None
+            self._queue.put(None)
+            thread.join()
+
+    def submit(self, values):
+        """
+        Queues the rows for prediction.
+
+        :param values: the rows (all attributes or all but the class attribute)
+        :type values: ndarray
+        :return: the request to wait for
+        :rtype: Request
+        """
+        # called from the connection threads, which aren't attached to the JVM
+        num_attributes = self.num_attributes
+        if values.shape[1] == num_attributes - 1:
+            values = numpy.insert(values, self.class_index, numpy.nan, axis=1)
+        elif values.shape[1] != num_attributes:
+            raise Exception(
+                "Expected " + str(num_attributes) + " or " + str(num_attributes - 1) + " columns, but received "
+                + str(values.shape[1]))
+        request = Request(values)
+        self._queue.put(request)
+        return request
+
+    def predict(self, values):
+        """
+        Predicts the rows in a single call.
+
+        :param values: the rows (all attributes)
+        :type values: ndarray
+        :return: the class distributions
+        :rtype: ndarray
+        """
+        data = Instances.template_instances(self.header, len(values))
+        data.add_ndarray(values)
+        return self.classifier.distributions_batch(data)
+
+    def _run(self):
+        """
+        Collects and processes the batches until stopped.
+        """
+        javabridge.attach()
+        try:
+            stopped = False
+            while not stopped:
+                request = self._queue.get()
+                if request is None:
+                    break
+                batch = [request]
+                rows = len(request.values)
+                deadline = time.time() + self.max_delay
+                while rows < self.max_batch_size:
+                    try:
+                        request = self._queue.get(timeout=max(0.0, deadline - time.time()))
+                    except Queue.Empty:
+                        break
+                    if request is None:
+                        stopped = True
+                        break
+                    batch.append(request)
+                    rows += len(request.values)
+                self._process(batch, rows)
+        finally:
+            javabridge.detach()
+
+    def _process(self, batch, rows):
+        """
+        Predicts the rows of the requests in a single call and hands out the results.
+
+        :param batch: the requests
+        :type batch: list
+        :param rows: the total number of rows
+        :type rows: int
+        """
+        error = None
+        try:
+            if len(batch) == 1:
+                values = batch[0].values
+            else:
+                values = numpy.vstack([request.values for request in batch])
+            dists = self.predict(values)
+        except Exception, e:
+            logger.error(traceback.format_exc())
+            error = str(e)
+        latencies = []
+        offset = 0
+        for request in batch:
+            if error is None:
+                request.finish(result=dists[offset:offset + len(request.values)])
+            else:
+                request.finish(error=error)
+            offset += len(request.values)
+            latencies.append(time.time() - request.received)
+        self.counters.update(len(batch), rows, latencies, error=error is not None)
+
+
+def _read_exactly(stream, size):
+    """
+    Reads the specified number of bytes.
+
+    :param stream: the stream to read from
+    :type stream: file
+    :param size: the number of bytes
+    :type size: int
+    :return: the bytes, None if the stream ended
+    :rtype: str
+    """
+    data = stream.read(size)
+    if len(data) < size:
+        return None
+    return data
+
+
+class RequestHandler(SocketServer.StreamRequestHandler):
+    """
+    Handles the requests of a connection until the client disconnects.
+    """
+
+    def handle(self):
+        """
+        Processes the requests.
+        """
+        server = self.server.prediction_server
+        while True:
+            header = _read_exactly(self.rfile, REQUEST_HEADER.size)
+            if header is None:
+                break
+            op, name_len, rows, cols = REQUEST_HEADER.unpack(header)
+            size = rows * cols * 8
+            if size > server.max_request_bytes:
+                # the payload doesn't get read, i.e., the stream can't be continued
+                self._respond_bytes(
+                    STATUS_ERROR,
+                    "Request too large: " + str(size) + " > " + str(server.max_request_bytes) + " bytes")
+                self.wfile.flush()
+                break
+            name = _read_exactly(self.rfile, name_len)
+            values = _read_exactly(self.rfile, size)
+            if (name is None) or (values is None):
+                break
+            try:
+                if op == OP_PREDICT:
+                    result = server.predict(name.decode("utf-8"), numpy.frombuffer(values, dtype="<f8").reshape((rows, cols)).copy())
+                    self._respond(STATUS_OK, result.shape[0], result.shape[1], result.astype("<f8").tostring())
+                elif op == OP_STATS:
+                    self._respond_bytes(STATUS_OK, json.dumps(server.stats()))
+                else:
+                    raise Exception("Unknown op: " + str(op))
+            except Exception, e:
+                self._respond_bytes(STATUS_ERROR, str(e))
+            self.wfile.flush()
+
+    def _respond(self, status, rows, cols, payload):
+        """
+        Sends the response.
+
+        :param status: the status
+        :type status: int
+        :param rows: the number of rows (or bytes)
+        :type rows: int
+        :param cols: the number of columns
+        :type cols: int
+        :param payload: the payload
+        :type payload: str
+        """
+        self.wfile.write(RESPONSE_HEADER.pack(status, rows, cols))
+        self.wfile.write(payload)
+
+    def _respond_bytes(self, status, text):
+        """
+        Sends a response with a text payload.
+
+        :param status: the status
+        :type status: int
+        :param text: the text to send
+        :type text: str
+        """
+        if isinstance(text, unicode):
+            text = text.encode("utf-8")
+        self._respond(status, len(text), 0, text)
+
+
+class _TCPServer(SocketServer.ThreadingMixIn, SocketServer.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socket, "AF_UNIX"):
+    class _UnixServer(SocketServer.ThreadingMixIn, SocketServer.UnixStreamServer):
+        daemon_threads = True
+
+
+class PredictionServer(object):
+    """
+    Serves predictions of classifiers that are kept in memory, combining concurrent requests
+    into batches. The JVM must have been started, the server gets shut down automatically when
+    the JVM is stopped.
+    """
+
+    def __init__(self, models, address, max_batch_size=256, max_delay=0.002, max_request_bytes=MAX_REQUEST_BYTES):
+        """
+        Initializes the server.
+
+        :param models: the models to serve (name -> tuple of classifier and header)
+        :type models: dict
+        :param address: the path of the Unix domain socket or tuple of host and port for TCP
+        :type address: str or tuple
+        :param max_batch_size: the maximum number of rows per batch
+        :type max_batch_size: int
+        :param max_delay: the maximum time in seconds to wait for further requests before predicting
+        :type max_delay: float
+        :param max_request_bytes: the maximum number of bytes of the values of a request
+        :type max_request_bytes: int
+        """
+        self.max_request_bytes = max_request_bytes
+        self.workers = {}
+        for name in models:
+            classifier, header = models[name]
+            self.workers[name] = ModelWorker(
+                classifier, header, max_batch_size=max_batch_size, max_delay=max_delay)
+        if isinstance(address, basestring):
+            if os.path.exists(address):
+                if not stat.S_ISSOCK(os.stat(address).st_mode):
+                    raise Exception("Address exists and is not a socket: " + address)
+                os.remove(address)
+            self.server = _UnixServer(address, RequestHandler)
+        else:
+            self.server = _TCPServer(address, RequestHandler)
+        self.server.prediction_server = self
+        self._thread = None
+        self._stopped = threading.Event()
+        self._stopped.set()
+
+    @property
+    def address(self):
+        """
+        Returns the address the server is bound to.
+
+        :return: the socket path or tuple of host and port
+        :rtype: str or tuple
+        """
+        return self.server.server_address
+
+    def predict(self, name, values):
+        """
+        Predicts the rows with the specified model.
+
+        :param name: the name of the model
+        :type name: str
+        :param values: the rows
+        :type values: ndarray
+        :return: the class distributions
+        :rtype: ndarray
+        """
+        if name not in self.workers:
+            raise Exception("Unknown model: " + name)
+        return self.workers[name].submit(values).wait()
+
+    def stats(self):
+        """
+        Returns the counters of all models.
+
+        :return: the counters (name -> dict)
+        :rtype: dict
+        """
+        result = {}
+        for name in self.workers:
+            result[name] = self.workers[name].counters.to_dict()
+        return result
+
+    def serve_forever(self):
+        """
+        Starts the workers and serves requests until shutdown gets called.
+        """
+        self._stopped.clear()
+        jvm.add_shutdown_hook(self.shutdown)
+        for name in self.workers:
+            self.workers[name].start()
+        try:
+            self.server.serve_forever()
+        finally:
+            jvm.remove_shutdown_hook(self.shutdown)
+            for name in self.workers:
+                self.workers[name].stop()
+            self.server.server_close()
+            if isinstance(self.address, basestring) and os.path.exists(self.address) \
+                    and stat.S_ISSOCK(os.stat(self.address).st_mode):
+                os.remove(self.address)
+            self._stopped.set()
+
+    def start(self):
+        """
+        Serves requests in a background thread.
+        """
+        self._stopped.clear()
+        jvm.add_shutdown_hook(self.shutdown)
+        self._thread = threading.Thread(target=self.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def shutdown(self):
+        """
+        Stops serving requests and waits for the workers (attached to the JVM) to finish.
+        """
+        if not self._stopped.is_set():
+            self.server.shutdown()
+            self._stopped.wait()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+class Client(object):
+    """
+    Client for a PredictionServer, does not require a JVM.
+    """
+
+    def __init__(self, address):
+        """
+        Connects to the server.
+
+        :param address: the path of the Unix domain socket or tuple of host and port for TCP
+        :type address: str or tuple
+        """
+        if isinstance(address, basestring):
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.socket.connect(address)
+        self._stream = self.socket.makefile("rb")
+
+    def _request(self, op, name, values):
+        """
+        Sends the request and returns the response.
+
+        :param op: the operation
+        :type op: int
+        :param name: the model name
+        :type name: str
+        :param values: the rows
+        :type values: ndarray
+        :return: tuple of rows, columns and payload
+        :rtype: tuple
+        """
+        name = name.encode("utf-8")
+        rows, cols = values.shape
+        self.socket.sendall(REQUEST_HEADER.pack(op, len(name), rows, cols) + name + values.astype("<f8").tostring())
+        header = _read_exactly(self._stream, RESPONSE_HEADER.size)
+        if header is None:
+            raise Exception("Connection closed by server")
+        status, rows, cols = RESPONSE_HEADER.unpack(header)
+        payload = _read_exactly(self._stream, rows * cols * 8 if cols > 0 else rows)
+        if payload is None:
+            raise Exception("Connection closed by server")
+        if status != STATUS_OK:
+            raise Exception(payload.decode("utf-8"))
+        return rows, cols, payload
+
+    def predict(self, name, values):
+        """
+        Predicts the rows with the specified model.
+
+        :param name: the name of the model
+        :type name: str
+        :param values: the rows (internal format), either all attributes or all but the class attribute
+        :type values: ndarray
+        :return: the class distributions (or predicted values for numeric classes), one row per input row
+        :rtype: ndarray
+        """
+        values = numpy.asarray(values, dtype=numpy.float64)
+        if len(values.shape) == 1:
+            values = values.reshape((1, len(values)))
+        rows, cols, payload = self._request(OP_PREDICT, name, values)
+        return numpy.frombuffer(payload, dtype="<f8").reshape((rows, cols))
+
+    def stats(self):
+        """
+        Returns the counters of all models.
+
+        :return: the counters (name -> dict)
+        :rtype: dict
+        """
+        rows, cols, payload = self._request(OP_STATS, "", numpy.zeros((0, 0)))
+        return json.loads(payload.decode("utf-8"))
+
+    def close(self):
+        """
+        Closes the connection.
+        """
+        self._stream.close()
+        self.socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+
+def main():
+    """
+    Serves predictions of serialized classifiers. Calls JVM start/stop automatically.
+    Use -h to see all options.
+    """
+    parser = argparse.ArgumentParser(
+        description='Serves predictions of serialized classifiers (which must include the dataset structure). '
+                    'Calls JVM start/stop automatically.')
+    parser.add_argument("-j", metavar="classpath", dest="classpath", help="additional classpath, jars/directories")
+    parser.add_argument("-X", metavar="heap", dest="heap", help="max heap size for jvm, e.g., 512m")
+    parser.add_argument("-s", metavar="socket", dest="socket", help="the Unix domain socket to listen on")
+    parser.add_argument("-p", metavar="port", dest="port", type=int, default=8765, help="the TCP port to listen on (localhost)")
+    parser.add_argument("-b", metavar="batch", dest="batch", type=int, default=256, help="maximum number of rows per batch")
+    parser.add_argument("-d", metavar="delay", dest="delay", type=float, default=2.0, help="maximum delay in milliseconds for collecting a batch")
+    parser.add_argument("-m", metavar="bytes", dest="max_request", type=int, default=MAX_REQUEST_BYTES, help="maximum number of bytes of the values of a request")
+    parser.add_argument("model", nargs="+", help="model to serve, format: name=file (name defaults to the file name)")
+    parsed = parser.parse_args()
+    jars = []
+    if parsed.classpath is not None:
+        jars = parsed.classpath.split(os.pathsep)
+
+    jvm.start(jars, max_heap_size=parsed.heap, packages=True)
+
+    try:
+        models = {}
+        for spec in parsed.model:
+            if "=" in spec:
+                name, filename = spec.split("=", 1)
+            else:
+                name, filename = os.path.splitext(os.path.basename(spec))[0], spec
+            models[name] = load_model(filename)
+            logger.info("Loaded model '" + name + "' from: " + filename)
+        if parsed.socket is not None:
+            address = parsed.socket
+        else:
+            address = ("127.0.0.1", parsed.port)
+        server = PredictionServer(
+            models, address, max_batch_size=parsed.batch, max_delay=parsed.delay / 1000.0,
+            max_request_bytes=parsed.max_request)
+        logger.info("Serving on: " + str(server.address))
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except Exception, e:
+        print(e)
+    finally:
+        jvm.stop()
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception, ex:
+        print(ex)
@@ -115,6 +115,8 @@ setup(
     extras_require={
         'plots': ["matplotlib"],
         'graphs': ["pygraphviz", "PIL"],
+        'arrow': ["pyarrow"],
+        'pandas': ["pandas"],
     },
     ext_modules=ext_modules(),
 )
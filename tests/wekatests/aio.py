@@ -0,0 +1,87 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# aio.py
+# Copyright (C) 2016 Fracpete (pythonwekawrapper at gmail dot com)
+
+import unittest
+import weka.core.jvm as jvm
+import weka.core.converters as converters
+import weka.classifiers as classifiers
+import weka.aio as aio
+from weka.core.classes import Random
+import wekatests.tests.weka_test as weka_test
+
+
+class TestAio(weka_test.WekaTest):
+
+    def test_classifier(self):
+        """
+        Tests building, predicting and cross-validating in the background.
+        """
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        data = loader.load_file(self.datafile("iris.arff"))
+        self.assertIsNotNone(data)
+        data.class_is_last()
+
+        executor = aio.JVMExecutor(num_threads=2)
+        try:
+            cls = classifiers.Classifier(classname="weka.classifiers.trees.J48")
+            future = cls.abuild(data, executor=executor)
+            self.assertIs(cls, future.result(timeout=60), msg="classifier should be the result")
+            preds = cls.apredict_batch(data, executor=executor).result(timeout=60)
+            self.assertEqual(cls.predict_batch(data).tolist(), preds.tolist(), msg="predictions differ")
+
+            evl = classifiers.Evaluation(data)
+            finished = []
+            future = evl.acrossvalidate(
+                classifiers.Classifier(classname="weka.classifiers.trees.J48"), data, 10, Random(1), executor=executor)
+            future.add_done_callback(lambda f: finished.append(f.done()))
+            self.assertIs(evl, future.result(timeout=60), msg="evaluation should be the result")
+            self.assertEqual([True], finished, msg="callback not called")
+            self.assertEqual(150, evl.num_instances, msg="number of instances differs")
+
+            future = classifiers.Classifier(classname="weka.classifiers.functions.LinearRegression").abuild(
+                data, executor=executor)
+            self.assertIsNotNone(future.exception(timeout=60), msg="nominal class should fail")
+            self.assertRaises(Exception, future.result)
+        finally:
+            executor.shutdown()
+        self.assertRaises(Exception, executor.submit, len, [])
+
+    def test_shared_executor(self):
+        """
+        Tests the shared executor and its shutdown hook.
+        """
+        executor = aio.get_executor()
+        self.assertIs(executor, aio.get_executor(), msg="executor should be shared")
+        self.assertIn(aio.shutdown, jvm.shutdown_hooks, msg="shutdown hook not registered")
+        self.assertEqual(3, executor.submit(len, [1, 2, 3]).result(timeout=60), msg="result differs")
+        aio.shutdown()
+        self.assertNotIn(aio.shutdown, jvm.shutdown_hooks, msg="shutdown hook not removed")
+        self.assertRaises(Exception, executor.submit, len, [])
+
+
+def suite():
+    """
+    Returns the test suite.
+    :return: the test suite
+    :rtype: unittest.TestSuite
+    """
+    return unittest.TestLoader().loadTestsFromTestCase(TestAio)
+
+
+if __name__ == '__main__':
+    jvm.start()
+    unittest.TextTestRunner().run(suite())
+    jvm.stop()
@@ -16,6 +16,7 @@
 
 import unittest
 import weka.core.jvm as jvm
+import wekatests.aio
 import wekatests.associations
 import wekatests.attribute_selection
 import wekatests.classifiers
@@ -23,6 +24,9 @@ import wekatests.clusterers
 import wekatests.datagenerators
 import wekatests.experiments
 import wekatests.filters
+import wekatests.metrics
+import wekatests.parallel
+import wekatests.serve
 import wekatests.coretests.all_tests
 import wekatests.plottests.all_tests
 
@@ -40,6 +44,7 @@ def suite():
     :rtype: unittest.TestSuite
     """
     result = unittest.TestSuite()
+    result.addTests(wekatests.aio.suite())
     result.addTests(wekatests.associations.suite())
     result.addTests(wekatests.attribute_selection.suite())
     result.addTests(wekatests.classifiers.suite())
@@ -47,6 +52,9 @@ def suite():
     result.addTests(wekatests.datagenerators.suite())
     result.addTests(wekatests.experiments.suite())
     result.addTests(wekatests.filters.suite())
+    result.addTests(wekatests.metrics.suite())
+    result.addTests(wekatests.parallel.suite())
+    result.addTests(wekatests.serve.suite())
     result.addTests(wekatests.coretests.all_tests.suite())
     result.addTests(wekatests.plottests.all_tests.suite())
     return result
@@ -14,11 +14,15 @@
 # classifiers.py
 # Copyright (C) 2014-2016 Fracpete (pythonwekawrapper at gmail dot com)
 
+import os
 import unittest
+import javabridge
 import weka.core.jvm as jvm
 import weka.core.classes as classes
 import weka.core.converters as converters
+import weka.core.dataset as dataset
 import weka.classifiers as classifiers
+import weka.datagenerators as datagenerators
 import weka.filters as filters
 import wekatests.tests.weka_test as weka_test
 
@@ -179,6 +183,112 @@ class TestClassifiers(weka_test.WekaTest):
         cls.build_classifier(data)
         self.assertIsNotNone(cls.distributions_for_instances(data), msg="no distributions generated")
 
+    def test_predict_batch(self):
+        """
+        Tests the predict_batch and distributions_batch methods.
+        """
+        # 1. nominal
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        data = loader.load_file(self.datafile("anneal.arff"))
+        self.assertIsNotNone(data)
+        data.class_is_last()
+
+        cname = "weka.classifiers.trees.J48"
+        options = ["-C", "0.3"]
+        cls = classifiers.Classifier(classname=cname, options=options)
+        self.assertIsNotNone(cls, msg="Failed to instantiate: " + cname + "/" + str(options))
+        cls.build_classifier(data)
+
+        dists = cls.distributions_batch(data)
+        self.assertEqual((898, 6), dists.shape, msg="Shape of distributions differs")
+        preds = cls.predict_batch(data)
+        self.assertEqual(898, len(preds), msg="Number of classifications differs")
+        for i in range(10, 20):
+            self.assertEqual(cls.classify_instance(data.get_instance(i)), preds[i], msg="Classifications differ")
+            self.assertEqual(
+                cls.distribution_for_instance(data.get_instance(i)).tolist(), dists[i].tolist(),
+                msg="Distributions differ")
+
+        # 2. numeric
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        data = loader.load_file(self.datafile("bolts.arff"))
+        self.assertIsNotNone(data)
+        data.class_is_last()
+
+        cname = "weka.classifiers.functions.LinearRegression"
+        options = ["-R", "0.1"]
+        cls = classifiers.Classifier(classname=cname, options=options)
+        self.assertIsNotNone(cls, msg="Failed to instantiate: " + cname + "/" + str(options))
+        cls.build_classifier(data)
+
+        dists = cls.distributions_batch(data)
+        self.assertEqual((data.num_instances, 1), dists.shape, msg="Shape of distributions differs")
+        preds = cls.predict_batch(data)
+        for i in range(10):
+            self.assertAlmostEqual(cls.classify_instance(data.get_instance(i)), preds[i], places=6,
+                                   msg="Classifications differ")
+
+        # 3. classifications only get derived from distributions if classifyInstance is not overridden
+        for cname, overrides in [("weka.classifiers.trees.J48", True), ("weka.classifiers.bayes.NaiveBayes", False)]:
+            cls = classifiers.Classifier(classname=cname)
+            self.assertEqual(
+                overrides,
+                javabridge.static_call(
+                    "weka/classifiers/ClassifierHelper", "overridesClassifyInstance",
+                    "(Lweka/classifiers/Classifier;)Z", cls.jobject),
+                msg="Overriding of classifyInstance not detected: " + cname)
+
+    def test_train_incremental(self):
+        """
+        Tests the train_incremental method.
+        """
+        cname = "weka.classifiers.bayes.NaiveBayesUpdateable"
+        cls = classifiers.Classifier(classname=cname)
+        self.assertIsNotNone(cls, msg="Failed to instantiate: " + cname)
+
+        # 1. loader
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        structure = loader.load_file(self.datafile("iris.arff"), incremental=True)
+        structure.class_is_last()
+        progress = []
+        model = self.tempfile("incremental.model")
+        self.delfile(model)
+        count = cls.train_incremental(
+            loader, batch_size=40, callback=lambda c, n: progress.append(n), checkpoint=model, checkpoint_interval=2)
+        self.assertEqual(150, count, msg="Number of rows differs")
+        self.assertEqual([40, 80, 120, 150], progress, msg="Progress differs")
+        self.assertTrue(os.path.exists(model), msg="Checkpoint missing: " + model)
+        self.delfile(model)
+
+        # 2. numpy chunks
+        data = converters.load_any_file(self.datafile("iris.arff"))
+        data.class_is_last()
+        matrix = data.to_numpy()
+        chunks = [matrix[i:i + 50] for i in xrange(0, 150, 50)]
+        cls2 = classifiers.Classifier(classname=cname)
+        count = cls2.train_incremental(chunks, header=dataset.Instances.template_instances(data, 0))
+        self.assertEqual(150, count, msg="Number of rows differs")
+        self.assertEqual(cls.predict_batch(data).tolist(), cls2.predict_batch(data).tolist(), msg="Predictions differ")
+
+        # 3. dataset
+        cls3 = classifiers.Classifier(classname=cname)
+        self.assertEqual(150, cls3.train_incremental(data, batch_size=100), msg="Number of rows differs")
+        self.assertEqual(cls.predict_batch(data).tolist(), cls3.predict_batch(data).tolist(), msg="Predictions differ")
+
+        # 4. data generator
+        gname = "weka.datagenerators.classifiers.classification.Agrawal"
+        generator = datagenerators.DataGenerator(classname=gname, options=["-n", "250", "-S", "1"])
+        cls4 = classifiers.Classifier(classname=cname)
+        self.assertEqual(250, cls4.train_incremental(generator, batch_size=100), msg="Number of rows differs")
+        generator = datagenerators.DataGenerator(classname=gname, options=["-n", "250", "-S", "1"])
+        generator.dataset_format = generator.define_data_format()
+        generated = generator.generate_examples()
+        generated.class_is_last()
+        cls5 = classifiers.Classifier(classname=cname)
+        cls5.build_classifier(generated)
+        self.assertEqual(cls5.predict_batch(generated).tolist(), cls4.predict_batch(generated).tolist(),
+                         msg="Predictions differ")
+
     def test_classify_instance(self):
         """
         Tests the classify_instance method.
@@ -433,6 +543,90 @@ class TestClassifiers(weka_test.WekaTest):
         cls = classifiers.Classifier(classname="weka.classifiers.trees.J48")
         ms.classifier = cls
 
+    def test_crossvalidate_model_threads(self):
+        """
+        Tests cross-validation using multiple threads.
+        """
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        data = loader.load_file(self.datafile("anneal.arff"))
+        self.assertIsNotNone(data)
+        data.class_is_last()
+
+        cname = "weka.classifiers.trees.J48"
+        cls = classifiers.Classifier(classname=cname)
+        self.assertIsNotNone(cls, msg="Failed to instantiate: " + cname)
+
+        evl = classifiers.Evaluation(data)
+        evl.crossvalidate_model(cls, data, 10, classes.Random(1))
+        tevl = classifiers.Evaluation(data)
+        tevl.crossvalidate_model(cls, data, 10, classes.Random(1), num_threads=4)
+        self.assertEqual(evl.confusion_matrix.tolist(), tevl.confusion_matrix.tolist(), msg="confusion matrix differs")
+        self.assertEqual(evl.correct, tevl.correct, msg="correct differs")
+        self.assertAlmostEqual(evl.mean_absolute_error, tevl.mean_absolute_error, places=6, msg="mean_absolute_error differs")
+        self.assertAlmostEqual(evl.kb_information, tevl.kb_information, places=6, msg="kb_information differs")
+        self.assertAlmostEqual(
+            evl.relative_absolute_error, tevl.relative_absolute_error, places=6, msg="relative_absolute_error differs")
+        self.assertEqual(evl.class_priors.tolist(), tevl.class_priors.tolist(), msg="class_priors differ")
+        self.assertEqual(898, len(tevl.predictions), msg="number of predictions differs")
+        tevl.crossvalidate_model(cls, data, 10, classes.Random(1), num_threads=4)
+        self.assertEqual(2 * evl.num_instances, tevl.num_instances, msg="statistics not merged")
+
+    def test_scorer(self):
+        """
+        Tests the Scorer class.
+        """
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        data = loader.load_file(self.datafile("iris.arff"))
+        self.assertIsNotNone(data)
+        data.class_is_last()
+
+        # J48 implements its own classifyInstance, NaiveBayes does not
+        for cname in ["weka.classifiers.trees.J48", "weka.classifiers.bayes.NaiveBayes"]:
+            cls = classifiers.Classifier(classname=cname)
+            cls.build_classifier(data)
+            scorer = classifiers.Scorer(cls, data)
+            self.assertEqual(0, scorer.header.num_instances, msg="header should be empty")
+            values = data.to_numpy()
+            for i in [0, 60, 120]:
+                inst = data.get_instance(i)
+                classification, dist = scorer.score(values[i])
+                expected = cls.distribution_for_instance(inst).tolist()
+                self.assertEqual(cls.classify_instance(inst), classification, msg="classification differs")
+                self.assertEqual(expected, dist.tolist(), msg="distribution differs")
+                classification2, dist2 = scorer.score(values[i][:4])
+                self.assertEqual(classification, classification2, msg="classification without class differs")
+                scorer.values[:4] = values[i][:4]
+                classification3, dist3 = scorer.score()
+                self.assertEqual(expected, dist3.tolist(), msg="distribution from buffer differs")
+
+    def test_predictions_array(self):
+        """
+        Tests the predictions_array method and predictions_to_instances.
+        """
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        data = loader.load_file(self.datafile("iris.arff"))
+        self.assertIsNotNone(data)
+        data.class_is_last()
+
+        cls = classifiers.Classifier(classname="weka.classifiers.trees.J48")
+        evl = classifiers.Evaluation(data)
+        evl.crossvalidate_model(cls, data, 10, classes.Random(1))
+        actual, predicted, weight, dists = evl.predictions_array()
+        preds = evl.predictions
+        self.assertEqual(len(preds), len(actual), msg="number of predictions differs")
+        self.assertEqual((len(preds), 3), dists.shape, msg="shape of distributions differs")
+        for i in [0, 50, 149]:
+            self.assertEqual(preds[i].actual, actual[i], msg="actual differs")
+            self.assertEqual(preds[i].predicted, predicted[i], msg="predicted differs")
+            self.assertEqual(preds[i].weight, weight[i], msg="weight differs")
+            self.assertEqual(preds[i].distribution.tolist(), dists[i].tolist(), msg="distribution differs")
+
+        bulk = classifiers.predictions_to_instances(data, evl)
+        single = classifiers.predictions_to_instances(data, preds)
+        self.assertEqual(150, bulk.num_instances, msg="number of instances differs")
+        self.assertIsNone(single.equal_headers(bulk), msg="headers differ")
+        self.assertEqual(single.to_numpy().tolist(), bulk.to_numpy().tolist(), msg="values differ")
+
 
 def suite():
     """
@@ -18,8 +18,10 @@ import unittest
 import weka.core.jvm as jvm
 import wekatests.coretests.capabilities
 import wekatests.coretests.classes
+import wekatests.coretests.columnar
 import wekatests.coretests.converters
 import wekatests.coretests.dataset
+import wekatests.coretests.pool
 import wekatests.coretests.serialization
 import wekatests.coretests.stemmers
 import wekatests.coretests.stopwords
@@ -43,8 +45,10 @@ def suite():
     result = unittest.TestSuite()
     result.addTests(wekatests.coretests.capabilities.suite())
     result.addTests(wekatests.coretests.classes.suite())
+    result.addTests(wekatests.coretests.columnar.suite())
     result.addTests(wekatests.coretests.converters.suite())
     result.addTests(wekatests.coretests.dataset.suite())
+    result.addTests(wekatests.coretests.pool.suite())
     result.addTests(wekatests.coretests.serialization.suite())
     result.addTests(wekatests.coretests.stemmers.suite())
     result.addTests(wekatests.coretests.stopwords.suite())
@@ -63,6 +63,22 @@ class TestClasses(weka_test.WekaTest):
         self.assertEqual("2-5,7", rang.ranges)
         self.assertItemsEqual([1, 2, 3, 4, 6], rang.selection())
 
+    def test_method_handle(self):
+        """
+        Tests the MethodHandle class and get_method_handle.
+        """
+        handle = classes.get_method_handle("java/lang/String", "concat", "(Ljava/lang/String;)Ljava/lang/String;")
+        self.assertIs(
+            handle, classes.get_method_handle("java/lang/String", "concat", "(Ljava/lang/String;)Ljava/lang/String;"),
+            msg="Handle not cached")
+        s = javabridge.get_env().new_string("abc")
+        self.assertEqual("abcdef", handle(s, "def"), msg="Results differ")
+        self.assertEqual("abcxyz", handle(s, javabridge.get_env().new_string("xyz")), msg="Results differ")
+        handle = classes.get_method_handle("java/lang/String", "length", "()I")
+        self.assertEqual(3, handle(s), msg="Results differ")
+        handle = classes.get_method_handle("java/lang/String", "doesNotExist", "()I")
+        self.assertRaises(Exception, handle, s)
+
     def test_javaobject(self):
         """
         Tests the JavaObject class.
@@ -0,0 +1,125 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# columnar.py
+# Copyright (C) 2016 Fracpete (pythonwekawrapper at gmail dot com)
+
+import shutil
+import unittest
+import weka.core.jvm as jvm
+import weka.core.converters as converters
+import weka.core.columnar as columnar
+import wekatests.tests.weka_test as weka_test
+
+
+class TestColumnar(weka_test.WekaTest):
+
+    def test_save_and_map(self):
+        """
+        Tests saving data in the columnar format and accessing it via MappedInstances.
+        """
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        data = loader.load_file(self.datafile("anneal.arff"))
+        self.assertIsNotNone(data)
+        data.class_is_last()
+
+        outdir = self.tempfile("columnar")
+        shutil.rmtree(outdir, ignore_errors=True)
+        columnar.save_columnar(data, outdir)
+
+        mapped = columnar.MappedInstances(outdir)
+        self.assertEqual(data.num_instances, len(mapped), msg="Number of instances differs")
+        self.assertEqual(data.num_attributes, mapped.num_attributes, msg="Number of attributes differs")
+        self.assertEqual(data.class_index, mapped.class_index, msg="Class index differs")
+        self.assertEqual(str(data.column(2).tolist()), str(mapped.column(2).tolist()), msg="Column differs")
+        self.assertEqual(data.attribute(0).values, mapped.dictionary(0), msg="Labels differ")
+
+        view = mapped[100:200]
+        self.assertEqual(100, len(view), msg="Number of instances in view differs")
+        self.assertEqual(str(data.get_instance(100).values.tolist()), str(view[0].tolist()), msg="Row differs")
+
+        train = mapped.train_cv(10, 3)
+        test = mapped.test_cv(10, 3)
+        self.assertEqual(data.train_cv(10, 3).num_instances, len(train), msg="Size of train fold differs")
+        self.assertEqual(data.test_cv(10, 3).num_instances, len(test), msg="Size of test fold differs")
+
+        materialized = test.to_instances()
+        expected = data.test_cv(10, 3)
+        self.assertIsNone(expected.equal_headers(materialized), msg="Headers differ")
+        self.assertEqual(expected.class_index, materialized.class_index, msg="Class index differs")
+        self.assertEqual(str(expected.to_numpy().tolist()), str(materialized.to_numpy().tolist()), msg="Values differ")
+
+        randomized = mapped.randomize(42)
+        self.assertEqual(len(mapped), len(randomized), msg="Number of instances differs")
+        self.assertEqual(sorted(randomized.indices().tolist()), range(len(mapped)), msg="Rows differ")
+        shutil.rmtree(outdir, ignore_errors=True)
+
+    def test_view_class_index(self):
+        """
+        Tests that setting the class index of a view does not affect other views.
+        """
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        data = loader.load_file(self.datafile("iris.arff"))
+        self.assertIsNotNone(data)
+        data.class_is_last()
+
+        outdir = self.tempfile("columnar")
+        shutil.rmtree(outdir, ignore_errors=True)
+        columnar.save_columnar(data, outdir)
+
+        mapped = columnar.MappedInstances(outdir)
+        train = mapped.train_cv(10, 0)
+        test = mapped.test_cv(10, 0)
+        train.class_index = 0
+        self.assertEqual(0, train.class_index, msg="Class index of view not set")
+        self.assertEqual(4, test.class_index, msg="Class index of sibling view changed")
+        self.assertEqual(4, mapped.class_index, msg="Class index of parent changed")
+        self.assertEqual(4, test.to_instances().class_index, msg="Class index of materialized view differs")
+        shutil.rmtree(outdir, ignore_errors=True)
+
+    def test_save_from_loader(self):
+        """
+        Tests saving the data of an incremental loader batch by batch, including string attributes.
+        """
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        data = loader.load_file(self.datafile("reutersTop10Randomized_1perc_shortened.arff"))
+        self.assertIsNotNone(data)
+
+        outdir = self.tempfile("columnar")
+        shutil.rmtree(outdir, ignore_errors=True)
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        loader.load_file(self.datafile("reutersTop10Randomized_1perc_shortened.arff"), incremental=True)
+        columnar.save_columnar(loader, outdir, class_index=data.num_attributes - 1, batch_size=7)
+
+        mapped = columnar.MappedInstances(outdir)
+        self.assertEqual(data.num_instances, len(mapped), msg="Number of instances differs")
+        self.assertEqual(data.num_attributes - 1, mapped.class_index, msg="Class index differs")
+        materialized = mapped.to_instances()
+        for i in xrange(data.num_instances):
+            self.assertEqual(str(data.get_instance(i)), str(materialized.get_instance(i)), msg="Row differs: " + str(i))
+        shutil.rmtree(outdir, ignore_errors=True)
+
+
+def suite():
+    """
+    Returns the test suite.
+    :return: the test suite
+    :rtype: unittest.TestSuite
+    """
+    return unittest.TestLoader().loadTestsFromTestCase(TestColumnar)
+
+
+if __name__ == '__main__':
+    jvm.start()
+    unittest.TextTestRunner().run(suite())
+    jvm.stop()
@@ -16,6 +16,7 @@
 
 import unittest
 import os
+import weka.core
 import weka.core.jvm as jvm
 import weka.core.converters as converters
 import wekatests.tests.weka_test as weka_test
@@ -73,6 +74,106 @@ class TestConverters(weka_test.WekaTest):
             count += 1
         self.assertEqual(898, count, msg="Number of instances differs!")
 
+    def test_incremental_batches(self):
+        """
+        Tests reading batches with an incremental ArffLoader.
+        """
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        full = loader.load_file(self.datafile("anneal.arff"))
+        data = loader.load_file(self.datafile("anneal.arff"), incremental=True)
+        self.assertIsNotNone(data)
+        sizes = []
+        for batch in loader.iter_batches(batch_size=100):
+            sizes.append(batch.num_instances)
+        self.assertEqual([100] * 8 + [98], sizes, msg="Batch sizes differ!")
+
+        data = loader.load_file(self.datafile("anneal.arff"), incremental=True)
+        self.assertIsNotNone(data)
+        batches = list(loader.iter_batches(batch_size=500, as_ndarray=True))
+        self.assertEqual(2, len(batches), msg="Number of batches differs!")
+        self.assertEqual((500, full.num_attributes), batches[0].shape, msg="Shape differs!")
+        self.assertEqual((398, full.num_attributes), batches[1].shape, msg="Shape differs!")
+        expected = full.to_numpy()
+        self.assertEqual(str(expected[500].tolist()), str(batches[1][0].tolist()), msg="Values differ!")
+
+        # string attribute
+        name = "reutersTop10Randomized_1perc_shortened.arff"
+        full = loader.load_file(self.datafile(name))
+        data = loader.load_file(self.datafile(name), incremental=True)
+        self.assertIsNotNone(data)
+        values = []
+        for batch in loader.iter_batches(batch_size=10):
+            for i in xrange(batch.num_instances):
+                values.append(batch.get_instance(i).get_string_value(0))
+        expected = [full.get_instance(i).get_string_value(0) for i in xrange(full.num_instances)]
+        self.assertEqual(expected, values, msg="String values differ!")
+
+    def test_read_numeric(self):
+        """
+        Tests the read_numeric function.
+        """
+        for name in ["iris.arff", "anneal.arff"]:
+            loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+            data = loader.load_file(self.datafile(name))
+            self.assertIsNotNone(data)
+            matrix, header = converters.read_numeric(self.datafile(name), chunk_size=100)
+            self.assertEqual(0, header.num_instances, msg="Header should be empty!")
+            self.assertEqual(data.num_attributes, header.num_attributes, msg="Number of attributes differs!")
+            self.assertEqual((data.num_instances, data.num_attributes), matrix.shape, msg="Shape differs!")
+            self.assertEqual(str(data.to_numpy().tolist()), str(matrix.tolist()), msg="Values differ!")
+            header.add_ndarray(matrix)
+            self.assertEqual(data.num_instances, header.num_instances, msg="Number of instances differs!")
+
+        # quoted values, instance weights and sparse rows
+        content = {
+            "weights.arff": "@relation weights\n@attribute a numeric\n@attribute b {x,y}\n@data\n1,x,{2}\n2,y,{0.5}\n",
+            "sparse.arff": "@relation sparse\n@attribute a numeric\n@attribute b {x,y}\n@data\n{0 1,1 y}\n{}\n{1 x}\n",
+            "quoted.arff": "@relation quoted\n@attribute a numeric\n@attribute b {'x, y','?',z}\n@data\n"
+                           + "1,'x, y'\n?,'?'\n3,?\n{1 z},{3}\n",
+        }
+        for name in content:
+            outfile = self.tempfile(name)
+            with open(outfile, "w") as f:
+                f.write(content[name])
+            loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+            data = loader.load_file(outfile)
+            matrix, header = converters.read_numeric(outfile)
+            self.assertEqual(str(data.to_numpy().tolist()), str(matrix.tolist()), msg="Values differ: " + name)
+            self.assertIsNone(data.equal_headers(header), msg="Headers differ: " + name)
+            self.delfile(outfile)
+
+        # CSV: quoted values and nominal columns that look numeric in the first chunk
+        outfile = self.tempfile("quoted.csv")
+        with open(outfile, "w") as f:
+            f.write('a,b\n1,"x, y"\n2,z\n"3",?\nx,"?"\n')
+        self.assertRaises(Exception, converters.read_numeric, outfile, chunk_size=2)
+        matrix, header = converters.read_numeric(outfile, chunk_size=2, nominal=[0])
+        self.assertEqual(["1", "2", "3", "x"], header.attribute(0).values, msg="Labels differ!")
+        self.assertEqual(["x, y", "z"], header.attribute(1).values, msg="Labels differ!")
+        self.assertEqual([0.0, 1.0], matrix[:2, 1].tolist(), msg="Values differ!")
+        self.assertTrue(numpy.isnan(matrix[2:, 1]).all(), msg="Missing values expected!")
+        self.assertEqual([0.0, 1.0, 2.0, 3.0], matrix[:, 0].tolist(), msg="Values differ!")
+        self.delfile(outfile)
+
+    @unittest.skipIf(not weka.core.pyarrow_available, "pyarrow is not available")
+    def test_parquet(self):
+        """
+        Tests writing and reading Parquet files.
+        """
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        data = loader.load_file(self.datafile("bolts.arff"))
+        self.assertIsNotNone(data)
+        data.class_is_last()
+        outfile = self.tempfile("out.parquet")
+        self.delfile(outfile)
+        converters.write_parquet(data, outfile)
+        self.assertTrue(os.path.exists(outfile), "File does not exist: " + outfile)
+        data2 = converters.read_parquet(outfile)
+        self.assertEqual(data.num_instances, data2.num_instances, msg="Number of instances differs!")
+        self.assertEqual(data.class_index, data2.class_index, msg="Class index differs!")
+        self.assertEqual(data.to_numpy().tolist(), data2.to_numpy().tolist(), msg="Values differ!")
+        self.delfile(outfile)
+
     def test_arff_saver(self):
         """
         Tests the Saver class using an ArffSaver.
@@ -115,6 +216,19 @@ class TestConverters(weka_test.WekaTest):
         self.assertEqual(2, inst.num_instances, msg="# of rows differ")
         self.assertEqual(1.1, inst.get_instance(0).get_value(0), msg="value differs at 0,0")
 
+        x = numpy.array([[1.1, 0, 3.3], [4.4, 1, 6.6], [7.7, 1, 9.9]], numpy.float64)
+        missing = numpy.zeros(x.shape, dtype=bool)
+        missing[2, 0] = True
+        inst = converters.ndarray_to_instances(
+            x, "test", weights=[1.0, 2.0, 0.5], nominal={1: ["yes", "no"]}, missing=missing)
+        self.assertIsNotNone(inst, msg="Should not be None!")
+        self.assertEqual(3, inst.num_instances, msg="# of rows differ")
+        self.assertTrue(inst.attribute(1).is_nominal, msg="Attribute #1 should be nominal")
+        self.assertEqual("no", inst.get_instance(1).get_string_value(1), msg="label differs at 1,1")
+        self.assertTrue(inst.get_instance(2).is_missing(0), msg="value at 2,0 should be missing")
+        self.assertEqual(9.9, inst.get_instance(2).get_value(2), msg="value differs at 2,2")
+        self.assertEqual([1.0, 2.0, 0.5], inst.weights().tolist(), msg="weights differ")
+
 
 def suite():
     """
@@ -15,7 +15,10 @@
 # Copyright (C) 2014-2015 Fracpete (pythonwekawrapper at gmail dot com)
 
 import unittest
+import numpy
+import weka.core
 import weka.core.jvm as jvm
+import weka.core.classes as classes
 import weka.core.dataset as dataset
 import weka.core.converters as converters
 import wekatests.tests.weka_test as weka_test
@@ -93,6 +96,34 @@ class TestDataset(weka_test.WekaTest):
         self.assertAlmostEqual(3264, numstats.sum, places=3, msg="sum differs")
         self.assertAlmostEqual(180636, numstats.sumsq, places=3, msg="sumsq differs")
 
+    def test_describe(self):
+        """
+        Tests the describe method.
+        """
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        data = loader.load_file(self.datafile("anneal.arff"))
+        self.assertIsNotNone(data, msg="Failed to load data!")
+
+        desc = data.describe()
+        self.assertEqual(data.num_attributes, len(desc), msg="Number of rows differs")
+        for i in [0, 3, 4, 32]:
+            att = data.attribute(i)
+            stats = data.attribute_stats(i)
+            self.assertEqual(att.name, desc["name"][i], msg="Name differs")
+            self.assertEqual(stats.missing_count, desc["missing"][i], msg="Missing count differs: " + att.name)
+            self.assertEqual(stats.total_count - stats.missing_count, desc["count"][i], msg="Count differs: " + att.name)
+            self.assertEqual(stats.distinct_count, desc["distinct"][i], msg="Distinct count differs: " + att.name)
+            self.assertEqual(stats.unique_count, desc["unique"][i], msg="Unique count differs: " + att.name)
+            if att.is_numeric:
+                numstats = stats.numeric_stats
+                self.assertAlmostEqual(numstats.min, desc["min"][i], places=6, msg="Min differs: " + att.name)
+                self.assertAlmostEqual(numstats.max, desc["max"][i], places=6, msg="Max differs: " + att.name)
+                self.assertAlmostEqual(numstats.mean, desc["mean"][i], places=6, msg="Mean differs: " + att.name)
+                self.assertAlmostEqual(numstats.stddev, desc["stddev"][i], places=6, msg="Stddev differs: " + att.name)
+            else:
+                self.assertEqual(stats.nominal_counts.tolist(), desc["nominal_counts"][i].tolist(),
+                                 msg="Nominal counts differ: " + att.name)
+
     def test_instance(self):
         """
         Tests the Instance class.
@@ -318,6 +349,176 @@ class TestDataset(weka_test.WekaTest):
         except Exception, e:
             pass
 
+    def test_to_numpy(self):
+        """
+        Tests the bulk export of Instances to numpy.
+        """
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        data = loader.load_file(self.datafile("iris.arff"))
+        self.assertIsNotNone(data, msg="Failed to load data!")
+        data.class_is_last()
+
+        matrix = data.to_numpy()
+        self.assertEqual((150, 5), matrix.shape, msg="shape differs")
+        self.assertEqual(data.get_instance(10).values.tolist(), matrix[10].tolist(), msg="row differs")
+        self.assertEqual(data.column(2).tolist(), matrix[:, 2].tolist(), msg="column differs")
+        self.assertEqual(data.values(2).tolist(), data.column(2).tolist(), msg="values differ")
+
+        matrix = data.to_numpy(indices=[3, 1])
+        self.assertEqual((150, 2), matrix.shape, msg="shape differs")
+        self.assertEqual(data.column(1).tolist(), matrix[:, 1].tolist(), msg="column differs")
+
+        x, y, w = data.to_numpy(split=True)
+        self.assertEqual((150, 4), x.shape, msg="shape differs")
+        self.assertEqual(150, len(y), msg="number of class values differs")
+        self.assertEqual([1.0] * 150, w.tolist(), msg="weights differ")
+
+    @unittest.skipIf(not weka.core.pyarrow_available, "pyarrow is not available")
+    def test_arrow(self):
+        """
+        Tests the conversion from/to pyarrow tables.
+        """
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        data = loader.load_file(self.datafile("anneal.arff"))
+        self.assertIsNotNone(data, msg="Failed to load data!")
+        data.class_is_last()
+
+        table = data.to_arrow(weights_column="weight")
+        self.assertEqual(data.num_instances, table.num_rows, msg="Number of rows differs")
+        self.assertEqual(data.num_attributes + 1, table.num_columns, msg="Number of columns differs")
+
+        data2 = dataset.Instances.from_arrow(table)
+        self.assertIsNone(data.equal_headers(data2), msg="Headers differ")
+        self.assertEqual(data.relationname, data2.relationname, msg="Relation names differ")
+        self.assertEqual(data.class_index, data2.class_index, msg="Class index differs")
+        self.assertEqual(str(data.to_numpy().tolist()), str(data2.to_numpy().tolist()), msg="Values differ")
+        self.assertEqual(data.weights().tolist(), data2.weights().tolist(), msg="Weights differ")
+
+    @unittest.skipIf(not weka.core.pandas_available, "pandas is not available")
+    def test_dataframe(self):
+        """
+        Tests the conversion from/to pandas data frames.
+        """
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        data = loader.load_file(self.datafile("anneal.arff"))
+        self.assertIsNotNone(data, msg="Failed to load data!")
+        data.class_is_last()
+
+        df = data.to_dataframe()
+        self.assertEqual((data.num_instances, data.num_attributes), df.shape, msg="Shape differs")
+        self.assertEqual("category", str(df[data.class_attribute.name].dtype), msg="Class should be categorical")
+
+        for chunk_size in [None, 100]:
+            data2 = dataset.Instances.from_dataframe(
+                df, relation=data.relationname, class_column=data.class_attribute.name, chunk_size=chunk_size)
+            self.assertIsNone(data.equal_headers(data2), msg="Headers differ")
+            self.assertEqual(data.class_index, data2.class_index, msg="Class index differs")
+            self.assertEqual(str(data.to_numpy().tolist()), str(data2.to_numpy().tolist()), msg="Values differ")
+
+        # integer class column refers to df.columns, also with a weights column in front of it
+        df.insert(0, "weight", 2.0)
+        data2 = dataset.Instances.from_dataframe(
+            df, class_column=len(df.columns) - 1, weights_column="weight", chunk_size=100)
+        self.assertIsNone(data.equal_headers(data2), msg="Headers differ")
+        self.assertEqual(data.class_index, data2.class_index, msg="Class index differs")
+        self.assertEqual([2.0] * data.num_instances, data2.weights().tolist(), msg="Weights differ")
+
+    @unittest.skipIf(not weka.core.scipy_available, "scipy is not available")
+    def test_csr(self):
+        """
+        Tests the conversion from/to scipy sparse matrices.
+        """
+        import scipy.sparse
+        atts = [dataset.Attribute.create_numeric("x" + str(i)) for i in xrange(1000)]
+        header = dataset.Instances.create_instances("sparse", atts, 0)
+        matrix = scipy.sparse.random(50, 1000, density=0.01, format="csr", random_state=1)
+
+        data = dataset.Instances.from_csr(matrix, header, weights=[2.0] * 50)
+        self.assertEqual(50, data.num_instances, msg="Number of instances differs")
+        self.assertEqual([2.0] * 50, data.weights().tolist(), msg="Weights differ")
+        self.assertEqual(matrix.toarray().tolist(), data.to_numpy().tolist(), msg="Values differ")
+
+        matrix2 = data.to_csr()
+        self.assertEqual(matrix.shape, matrix2.shape, msg="Shape differs")
+        self.assertEqual(matrix.nnz, matrix2.nnz, msg="Number of non-zero values differs")
+        self.assertEqual(0, (matrix != matrix2).nnz, msg="Values differ")
+
+    def test_concat(self):
+        """
+        Tests combining datasets one-after-the-other.
+        """
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        data = loader.load_file(self.datafile("iris.arff"))
+        self.assertIsNotNone(data, msg="Failed to load data!")
+        data.class_is_last()
+        parts = [dataset.Instances.copy_instances(data, 0, 50),
+                 dataset.Instances.copy_instances(data, 50, 50),
+                 dataset.Instances.copy_instances(data, 100, 50)]
+
+        combined = dataset.Instances.concat(parts)
+        self.assertEqual(150, combined.num_instances, msg="Number of instances differs")
+        self.assertEqual(data.to_numpy().tolist(), combined.to_numpy().tolist(), msg="Values differ")
+        self.assertEqual(data.class_index, combined.class_index, msg="Class index differs")
+
+        combined = dataset.Instances.concat(part for part in parts)
+        self.assertEqual(150, combined.num_instances, msg="Number of instances differs")
+
+        combined = dataset.Instances.append_instances(parts[0], parts[2])
+        self.assertEqual(100, combined.num_instances, msg="Number of instances differs")
+        self.assertEqual(data.get_instance(100).values.tolist(), combined.get_instance(50).values.tolist(),
+                         msg="Values differ")
+
+    def test_take_mask_folds(self):
+        """
+        Tests the take and mask methods and the FoldView class.
+        """
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        data = loader.load_file(self.datafile("iris.arff"))
+        self.assertIsNotNone(data, msg="Failed to load data!")
+        data.class_is_last()
+        matrix = data.to_numpy()
+
+        subset = data.take(numpy.array([5, 1, 100]))
+        self.assertEqual(3, subset.num_instances, msg="Number of instances differs")
+        self.assertEqual(matrix[[5, 1, 100]].tolist(), subset.to_numpy().tolist(), msg="Values differ")
+
+        order = data.random_order(classes.Random(42))
+        randomized = dataset.Instances.copy_instances(data)
+        randomized.randomize(classes.Random(42))
+        self.assertEqual(matrix[order].tolist(), randomized.to_numpy().tolist(), msg="Order differs from randomize")
+
+        mask = matrix[:, 0] > 6.0
+        subset = data.mask(mask)
+        self.assertEqual(int(mask.sum()), subset.num_instances, msg="Number of instances differs")
+        self.assertEqual(matrix[mask].tolist(), subset.to_numpy().tolist(), msg="Values differ")
+
+        folds = dataset.FoldView(data, num_folds=10, seed=1)
+        self.assertEqual(10, len(folds), msg="Number of folds differs")
+        seen = []
+        for train, test in folds:
+            self.assertEqual(135, len(train), msg="Size of train fold differs")
+            self.assertEqual(15, len(test), msg="Size of test fold differs")
+            self.assertEqual([5, 5, 5], numpy.bincount(matrix[test, 4].astype(int)).tolist(), msg="Not stratified")
+            seen.extend(test.tolist())
+        self.assertEqual(range(150), sorted(seen), msg="Test folds should cover all rows")
+        self.assertEqual(15, folds.test(3).num_instances, msg="Number of instances differs")
+        self.assertEqual(135, folds.train(3).num_instances, msg="Number of instances differs")
+
+    def test_slots(self):
+        """
+        Tests that the row and attribute wrappers don't carry a __dict__.
+        """
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        data = loader.load_file(self.datafile("iris.arff"))
+        self.assertIsNotNone(data, msg="Failed to load data!")
+
+        inst = data.get_instance(0)
+        self.assertFalse(hasattr(inst, "__dict__"), msg="Instance should not have a __dict__")
+        self.assertRaises(AttributeError, setattr, inst, "dummy", 1)
+        att = data.attribute(0)
+        self.assertFalse(hasattr(att, "__dict__"), msg="Attribute should not have a __dict__")
+        self.assertEqual(inst.jobject, dataset.Instance(inst.jobject).jobject, msg="jobject differs")
+
 
 def suite():
     """
@@ -0,0 +1,106 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# pool.py
+# Copyright (C) 2016 Fracpete (pythonwekawrapper at gmail dot com)
+
+import unittest
+import weka.core.jvm as jvm
+import weka.core.pool as pool
+import weka.core.converters as converters
+import weka.classifiers as classifiers
+import weka.filters as filters
+import wekatests.tests.weka_test as weka_test
+import wekatests.coretests.pool_jobs as pool_jobs
+
+
+class TestPool(weka_test.WekaTest):
+
+    def test_map(self):
+        """
+        Tests the map method.
+        """
+        with pool.JVMPool(num_workers=2) as p:
+            self.assertTrue(p.is_running, msg="Pool not running")
+            self.assertEqual([x * x for x in range(10)], p.map(pool_jobs.square, range(10)), msg="Results differ")
+
+    def test_submit(self):
+        """
+        Tests the submit method and failing jobs.
+        """
+        with pool.JVMPool(num_workers=2) as p:
+            job = p.submit(pool_jobs.square, 3)
+            self.assertEqual(9, job.get(), msg="Result differs")
+            self.assertTrue(job.done(), msg="Job not finished")
+            job = p.submit(pool_jobs.fail, 3)
+            self.assertRaises(Exception, job.get)
+
+    def test_recycling(self):
+        """
+        Tests recycling of workers and back-pressure.
+        """
+        with pool.JVMPool(num_workers=1, max_queue=2, max_jobs=2) as p:
+            pids = p.map(pool_jobs.pid, range(6))
+            self.assertEqual(3, len(set(pids)), msg="Workers not recycled")
+            self.assertEqual(0, p.pending, msg="Jobs still pending")
+
+    def test_failed_start(self):
+        """
+        Tests workers that fail to start up their JVM.
+        """
+        p = pool.JVMPool(num_workers=1, max_heap_size="bogus", start_timeout=60)
+        self.assertRaises(Exception, p.start)
+        self.assertFalse(p.is_running, msg="Pool should not be running")
+
+        with pool.JVMPool(num_workers=1) as p:
+            p.config["max_heap_size"] = "bogus"
+            self.assertRaises(Exception, p.submit(pool_jobs.crash, 1).get, 60)
+            self.assertRaises(Exception, p.submit(pool_jobs.square, 2).get, 60)
+            p.config["max_heap_size"] = None
+            self.assertEqual(9, p.submit(pool_jobs.square, 3).get(60), msg="Worker not restarted")
+
+    def test_jobs(self):
+        """
+        Tests the train, predict, evaluate and filter jobs.
+        """
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        data = loader.load_file(self.datafile("iris.arff"))
+        self.assertIsNotNone(data)
+        data.class_is_last()
+
+        cls = classifiers.Classifier(classname="weka.classifiers.trees.J48")
+        flter = filters.Filter(classname="weka.filters.unsupervised.attribute.Remove", options=["-R", "1"])
+        with pool.JVMPool(num_workers=2) as p:
+            model = p.train(cls, data).get()
+            self.assertIsNotNone(model, msg="No model built")
+            dists = p.predict(model, data).get()
+            self.assertEqual((150, 3), dists.shape, msg="Shape of distributions differs")
+            evl = p.evaluate(cls, data, data).get()
+            self.assertEqual(150, evl.num_instances, msg="Number of instances differs")
+            filtered = p.filter(flter, data).get()
+            self.assertEqual(data.num_attributes - 1, filtered.num_attributes, msg="Number of attributes differs")
+
+
+def suite():
+    """
+    Returns the test suite.
+    :return: the test suite
+    :rtype: unittest.TestSuite
+    """
+    return unittest.TestLoader().loadTestsFromTestCase(TestPool)
+
+
+if __name__ == '__main__':
+    jvm.start()
+    unittest.TextTestRunner().run(suite())
+    jvm.stop()
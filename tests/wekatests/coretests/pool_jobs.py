@@ -0,0 +1,51 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# pool_jobs.py
+# Copyright (C) 2016 Fracpete (pythonwekawrapper at gmail dot com)
+
+"""
+Functions executed by the workers in the pool tests. They are defined in a module of their own, so
+they get pickled by their importable name even when the tests are run directly as __main__.
+"""
+
+import os
+import javabridge
+
+
+def square(x):
+    """
+    Squares the number inside the worker's JVM.
+    """
+    return javabridge.static_call("java/lang/Math", "multiplyExact", "(II)I", x, x)
+
+
+def pid(x):
+    """
+    Returns the process ID of the worker.
+    """
+    return os.getpid()
+
+
+def fail(x):
+    """
+    Always fails.
+    """
+    raise Exception("Failed on purpose: " + str(x))
+
+
+def crash(x):
+    """
+    Terminates the worker process without replying.
+    """
+    os._exit(1)
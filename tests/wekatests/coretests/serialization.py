@@ -69,6 +69,23 @@ class TestSerialization(weka_test.WekaTest):
             iout = javabridge.call(lout[i], "intValue", "()I")
             self.assertEqual(iin, iout, msg="Input/output differ at #" + str(i))
 
+    def test_to_from_bytes(self):
+        """
+        Tests methods to_bytes and from_bytes.
+        """
+        lin = ["A", "B", "C", "D"]
+        vin = javabridge.make_instance("java/util/Vector", "()V")
+        for element in lin:
+            javabridge.call(vin, "add", "(Ljava/lang/Object;)Z", element)
+        data = serialization.to_bytes(vin)
+        self.assertTrue(len(data) > 0, msg="No bytes generated")
+
+        vout = serialization.from_bytes(data)
+        self.assertIsNotNone(vout, msg="Failed to deserialize")
+        enm = javabridge.call(vout, "elements", "()Ljava/util/Enumeration;")
+        lout = types.enumeration_to_list(enm)
+        self.assertEqual(lin, lout, msg="Input/output differ")
+
 
 def suite():
     """
@@ -16,6 +16,7 @@
 
 import unittest
 import javabridge
+import numpy
 import weka.core.jvm as jvm
 import weka.core.types as types
 import wekatests.tests.weka_test as weka_test
@@ -44,6 +45,32 @@ class TestTypes(weka_test.WekaTest):
         lout = types.enumeration_to_list(enm)
         self.assertEqual(lin, lout, msg="Elements differ")
 
+    def test_matrix_conversions(self):
+        """
+        Tests methods ndarray_to_double_matrix, double_matrix_to_ndarray and int_matrix_to_ndarray.
+        """
+        ain = numpy.arange(12, dtype=numpy.float64).reshape((4, 3))
+        m = types.ndarray_to_double_matrix(ain)
+        aout = types.double_matrix_to_ndarray(m)
+        self.assertEqual((4, 3), aout.shape, msg="Shape differs")
+        self.assertEqual(ain.tolist(), aout.tolist(), msg="Elements differ")
+
+        # jagged
+        m = javabridge.get_env().make_object_array(2, javabridge.get_env().find_class("[D"))
+        javabridge.get_env().set_object_array_element(m, 0, javabridge.get_env().make_double_array(numpy.array([1.0])))
+        javabridge.get_env().set_object_array_element(m, 1, javabridge.get_env().make_double_array(numpy.array([2.0, 3.0])))
+        aout = types.double_matrix_to_ndarray(m)
+        self.assertEqual((2, 2), aout.shape, msg="Shape differs")
+        self.assertTrue(numpy.isnan(aout[0, 1]), msg="Row not padded")
+        self.assertEqual([2.0, 3.0], aout[1].tolist(), msg="Elements differ")
+
+        # int
+        m = javabridge.get_env().make_object_array(2, javabridge.get_env().find_class("[I"))
+        javabridge.get_env().set_object_array_element(m, 0, javabridge.get_env().make_int_array(numpy.array([1, 2, 3], dtype=numpy.int32)))
+        javabridge.get_env().set_object_array_element(m, 1, javabridge.get_env().make_int_array(numpy.array([4], dtype=numpy.int32)))
+        aout = types.int_matrix_to_ndarray(m)
+        self.assertEqual([[1, 2, 3], [4, -1, -1]], aout.tolist(), msg="Elements differ")
+
 
 def suite():
     """
@@ -0,0 +1,115 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# metrics.py
+# Copyright (C) 2016 Fracpete (pythonwekawrapper at gmail dot com)
+
+import unittest
+import numpy
+import weka.core.jvm as jvm
+import weka.core.converters as converters
+import weka.classifiers as classifiers
+import weka.metrics as metrics
+from weka.core.classes import Random
+import wekatests.tests.weka_test as weka_test
+
+
+class TestMetrics(weka_test.WekaTest):
+
+    def evaluation(self, filename, classname):
+        """
+        Cross-validates the classifier on the dataset.
+
+        :param filename: the dataset to load
+        :type filename: str
+        :param classname: the classifier to use
+        :type classname: str
+        :return: the evaluation
+        :rtype: classifiers.Evaluation
+        """
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        data = loader.load_file(self.datafile(filename))
+        self.assertIsNotNone(data)
+        data.class_is_last()
+        cls = classifiers.Classifier(classname=classname)
+        evl = classifiers.Evaluation(data)
+        evl.crossvalidate_model(cls, data, 10, Random(1))
+        return evl
+
+    def test_evaluate_nominal(self):
+        """
+        Tests the evaluate method against Evaluation for a nominal class.
+        """
+        evl = self.evaluation("anneal.arff", "weka.classifiers.trees.J48")
+        expected = evl.metrics()
+        self.assertAlmostEqual(evl.percent_correct, expected["percent_correct"], places=6)
+        self.assertEqual(evl.num_instances, expected["num_instances"], msg="number of instances differs")
+        self.assertEqual(6, len(expected["precision"]), msg="number of per-class values differs")
+
+        actual, predicted, weight, dists = evl.predictions_array()
+        computed = metrics.evaluate(actual, predicted, weights=weight, dists=dists)
+        for name in computed:
+            # depending on the Weka version, rates with a zero denominator are NaN rather than 0
+            defined = ~numpy.isnan(numpy.asarray(expected[name]))
+            numpy.testing.assert_allclose(
+                numpy.asarray(computed[name])[defined], numpy.asarray(expected[name])[defined],
+                rtol=1e-6, atol=1e-9, err_msg="metric differs: " + name)
+
+        matrix = metrics.confusion_matrix(actual, predicted, 6, weights=weight)
+        self.assertEqual(evl.confusion_matrix.tolist(), matrix.tolist(), msg="confusion matrix differs")
+
+    def test_evaluate_numeric(self):
+        """
+        Tests the evaluate method against Evaluation for a numeric class.
+        """
+        evl = self.evaluation("bolts.arff", "weka.classifiers.functions.LinearRegression")
+        expected = evl.metrics(["correlation_coefficient", "mean_absolute_error", "root_mean_squared_error"])
+        self.assertEqual(0, len(evl.metrics(["precision"])["precision"]), msg="per-class values for numeric class")
+
+        actual, predicted, weight, dists = evl.predictions_array()
+        self.assertIsNone(dists, msg="distributions for numeric class")
+        computed = metrics.evaluate(actual, predicted, weights=weight)
+        for name in expected:
+            self.assertAlmostEqual(expected[name], computed[name], places=6, msg="metric differs: " + name)
+
+    def test_curves(self):
+        """
+        Tests the ROC/PRC curves and areas.
+        """
+        actual = numpy.array([0, 0, 1, 1, 0, 1], dtype=numpy.float64)
+        probs = numpy.array([0.9, 0.8, 0.7, 0.4, 0.3, 0.1])
+        dists = numpy.column_stack([probs, 1 - probs])
+        fpr, tpr, thresholds = metrics.roc_curve(actual, dists, 0)
+        self.assertEqual(len(fpr), len(thresholds), msg="number of points differs")
+        self.assertEqual((1.0, 1.0), (fpr[0], tpr[0]), msg="first point differs")
+        self.assertEqual((0.0, 0.0), (fpr[-1], tpr[-1]), msg="last point differs")
+        self.assertAlmostEqual(7.0 / 9.0, metrics.area_under_roc(actual, dists, 0), places=6)
+        self.assertTrue(numpy.isnan(metrics.area_under_roc(numpy.zeros(6), dists, 0)), msg="area without negatives")
+        recall, precision, thresholds = metrics.prc_curve(actual, dists, 0)
+        self.assertEqual(len(recall), len(precision), msg="number of points differs")
+        self.assertGreater(metrics.area_under_prc(actual, dists, 0), 0.0)
+
+
+def suite():
+    """
+    Returns the test suite.
+    :return: the test suite
+    :rtype: unittest.TestSuite
+    """
+    return unittest.TestLoader().loadTestsFromTestCase(TestMetrics)
+
+
+if __name__ == '__main__':
+    jvm.start()
+    unittest.TextTestRunner().run(suite())
+    jvm.stop()
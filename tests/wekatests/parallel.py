@@ -0,0 +1,119 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# parallel.py
+# Copyright (C) 2016 Fracpete (pythonwekawrapper at gmail dot com)
+
+import unittest
+import weka.core.jvm as jvm
+import weka.core.converters as converters
+import weka.classifiers as classifiers
+import weka.parallel as parallel
+from weka.core.classes import Random, ListParameter
+import wekatests.tests.weka_test as weka_test
+
+
+class TestParallel(weka_test.WekaTest):
+
+    def test_crossvalidate_model(self):
+        """
+        Tests the crossvalidate_model method.
+        """
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        data = loader.load_file(self.datafile("anneal.arff"))
+        self.assertIsNotNone(data)
+        data.class_is_last()
+
+        cls = classifiers.Classifier(classname="weka.classifiers.trees.J48", options=["-C", "0.3"])
+        evl = classifiers.Evaluation(data)
+        evl.crossvalidate_model(cls, data, 10, Random(1))
+
+        pevl = parallel.crossvalidate_model(cls, data, 10, Random(1), num_workers=2)
+        self.assertEqual(evl.num_instances, pevl.num_instances, msg="Number of instances differ")
+        self.assertAlmostEqual(evl.percent_correct, pevl.percent_correct, places=6, msg="Accuracy differs")
+        self.assertEqual(evl.confusion_matrix.tolist(), pevl.confusion_matrix.tolist(), msg="Confusion matrices differ")
+
+    def test_parallel_search(self):
+        """
+        Tests the ParallelSearch class.
+        """
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        data = loader.load_file(self.datafile("diabetes.arff"))
+        self.assertIsNotNone(data)
+        data.class_is_last()
+
+        cls = classifiers.Classifier(classname="weka.classifiers.trees.J48")
+        try:
+            param = ListParameter()
+        except Exception:
+            self.skipTest("ListParameter not available, package missing?")
+        param.prop = "confidenceFactor"
+        param.values = ["0.05", "0.1", "0.25", "0.5"]
+
+        # threads
+        search = parallel.ParallelSearch([param], classifier=cls, num_folds=5, num_threads=2)
+        best, results = search.search(data)
+        self.assertIsNotNone(best, msg="No best classifier")
+        self.assertEqual(4, len(results), msg="Number of setups differs")
+        self.assertEqual([5, 5, 5, 5], results["folds"].tolist(), msg="Number of folds differ")
+        self.assertEqual(max(results["percent_correct"]), results["percent_correct"][results["setup"] == best.to_commandline()][0])
+
+        # early abandon
+        search = parallel.ParallelSearch(
+            [param], classifier=cls, num_folds=5, num_threads=2, abandon_folds=2, abandon_margin=0.0)
+        best, results = search.search(data)
+        self.assertTrue(any(results["abandoned"]), msg="No setups abandoned")
+        self.assertEqual(2, min(results["folds"]), msg="Abandoned setups should be evaluated on 2 folds")
+
+    def test_parallel_search_classifiers(self):
+        """
+        Tests the ParallelSearch class with a list of classifier setups and non-finite metric values.
+        """
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        data = loader.load_file(self.datafile("diabetes.arff"))
+        self.assertIsNotNone(data)
+        data.class_is_last()
+
+        setups = [classifiers.Classifier(classname="weka.classifiers.trees.J48", options=["-C", c])
+                  for c in ["0.05", "0.1", "0.25", "0.5"]]
+        search = parallel.ParallelSearch(setups, num_folds=5, num_threads=2)
+        best, results = search.search(data)
+        self.assertEqual(4, len(results), msg="Number of setups differs")
+        self.assertEqual([5, 5, 5, 5], results["folds"].tolist(), msg="Number of folds differ")
+        self.assertEqual(
+            max(results["percent_correct"]), results["percent_correct"][results["setup"] == best.to_commandline()][0],
+            msg="Best setup not selected")
+
+        # ZeroR's weighted F-measure is not finite (or 0), it must not get selected
+        setups = [classifiers.Classifier(classname="weka.classifiers.rules.ZeroR"),
+                  classifiers.Classifier(classname="weka.classifiers.trees.J48")]
+        for abandon_folds in [None, 2]:
+            search = parallel.ParallelSearch(
+                setups, metric="weighted_f_measure", num_folds=5, num_threads=2, abandon_folds=abandon_folds)
+            best, results = search.search(data)
+            self.assertEqual("weka.classifiers.trees.J48", best.classname, msg="Best setup differs")
+
+
+def suite():
+    """
+    Returns the test suite.
+    :return: the test suite
+    :rtype: unittest.TestSuite
+    """
+    return unittest.TestLoader().loadTestsFromTestCase(TestParallel)
+
+
+if __name__ == '__main__':
+    jvm.start()
+    unittest.TextTestRunner().run(suite())
+    jvm.stop()
@@ -0,0 +1,133 @@
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# serve.py
+# Copyright (C) 2016 Fracpete (pythonwekawrapper at gmail dot com)
+
+import os
+import socket
+import threading
+import unittest
+import numpy
+import weka.core.jvm as jvm
+import weka.core.converters as converters
+import weka.core.serialization as serialization
+import weka.core.dataset as dataset
+import weka.classifiers as classifiers
+import weka.serve as serve
+import wekatests.tests.weka_test as weka_test
+
+
+class TestServe(weka_test.WekaTest):
+
+    def test_server(self):
+        """
+        Tests the PredictionServer and Client classes.
+        """
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        data = loader.load_file(self.datafile("iris.arff"))
+        self.assertIsNotNone(data)
+        data.class_is_last()
+
+        cls = classifiers.Classifier(classname="weka.classifiers.trees.J48")
+        cls.build_classifier(data)
+        modelfile = self.tempfile("serve.model")
+        self.delfile(modelfile)
+        serialization.write_all(modelfile, [cls, dataset.Instances.template_instances(data)])
+        models = {"iris": serve.load_model(modelfile)}
+        self.delfile(modelfile)
+
+        values = data.to_numpy()
+        expected = cls.distributions_batch(data)
+        addresses = [("127.0.0.1", 0)]
+        if hasattr(socket, "AF_UNIX"):
+            addresses.append(self.tempfile("serve.sock"))
+        for address in addresses:
+            server = serve.PredictionServer(models, address, max_delay=0.01)
+            server.start()
+            try:
+                results = {}
+
+                def request(i):
+                    with serve.Client(server.address) as client:
+                        results[i] = client.predict("iris", values[i * 30:(i + 1) * 30, :4])
+
+                threads = [threading.Thread(target=request, args=(i,)) for i in xrange(5)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                self.assertEqual(
+                    expected.tolist(), numpy.vstack([results[i] for i in xrange(5)]).tolist(),
+                    msg="distributions differ")
+
+                with serve.Client(server.address) as client:
+                    self.assertEqual(expected[0].tolist(), client.predict("iris", values[0])[0].tolist())
+                    self.assertRaises(Exception, client.predict, "unknown", values[0])
+                    stats = client.stats()["iris"]
+                    self.assertEqual(6, stats["requests"], msg="number of requests differs")
+                    self.assertEqual(151, stats["rows"], msg="number of rows differs")
+                    self.assertLessEqual(stats["batches"], 6, msg="number of batches too large")
+            finally:
+                server.shutdown()
+
+    def test_limits(self):
+        """
+        Tests rejecting oversized requests and the shutdown hook.
+        """
+        loader = converters.Loader(classname="weka.core.converters.ArffLoader")
+        data = loader.load_file(self.datafile("iris.arff"))
+        self.assertIsNotNone(data)
+        data.class_is_last()
+
+        cls = classifiers.Classifier(classname="weka.classifiers.trees.J48")
+        cls.build_classifier(data)
+        models = {"iris": (cls, dataset.Instances.template_instances(data))}
+        values = data.to_numpy()
+        server = serve.PredictionServer(models, ("127.0.0.1", 0), max_request_bytes=1000)
+        server.start()
+        try:
+            self.assertIn(server.shutdown, jvm.shutdown_hooks, msg="shutdown hook not registered")
+            with serve.Client(server.address) as client:
+                self.assertEqual(10, len(client.predict("iris", values[0:10, :4])), msg="number of rows differs")
+                self.assertRaises(Exception, client.predict, "iris", values[:, :4])
+        finally:
+            server.shutdown()
+        self.assertNotIn(server.shutdown, jvm.shutdown_hooks, msg="shutdown hook not removed")
+
+    @unittest.skipIf(not hasattr(socket, "AF_UNIX"), "Unix domain sockets are not available")
+    def test_existing_file(self):
+        """
+        Tests that files other than sockets don't get replaced by the server.
+        """
+        address = self.tempfile("serve.txt")
+        with open(address, "w") as f:
+            f.write("data")
+        self.assertRaises(Exception, serve.PredictionServer, {}, address)
+        self.assertTrue(os.path.isfile(address), msg="file got removed")
+        self.delfile(address)
+
+
+def suite():
+    """
+    Returns the test suite.
+    :return: the test suite
+    :rtype: unittest.TestSuite
+    """
+    return unittest.TestLoader().loadTestsFromTestCase(TestServe)
+
+
+if __name__ == '__main__':
+    jvm.start()
+    unittest.TextTestRunner().run(suite())
+    jvm.stop()